@@ -6,12 +6,21 @@ self_name=$(basename "$0")
 
 # Note that builtins.open should NOT be mocked as it can interfere with coverage.py,
 # see https://github.com/coveragepy/coveragepy/issues/2083#issuecomment-3521840036
+# `StatusMacheteClient._compute_status_prompt` is mocked to make `status --prompt` run out of time without real-time waits,
+# and `StatusMacheteClient._spawn_detached_status_prompt` so that tests don't leave detached git-machete processes behind.
+# `StatusMacheteClient._wait_for_next_status_watch_poll` is mocked to change the repository between the polls of `status --watch`.
 whitelisted_methods="\
 builtins.input
 git_machete.client.go_interactive.GoInteractiveMacheteClient._get_stdin_fd
 git_machete.client.go_interactive.GoInteractiveMacheteClient._read_stdin
+git_machete.client.status.StatusMacheteClient._compute_status_prompt
+git_machete.client.status.StatusMacheteClient._spawn_detached_status_prompt
+git_machete.client.status.StatusMacheteClient._wait_for_next_status_watch_poll
 git_machete.code_hosting.OrganizationAndRepository.from_url
 git_machete.git.Git.fetch_remote
+git_machete.git.Git.get_git_version
+git_machete.git.MAX_COMMITS_FOR_BATCHED_COMMIT_LISTING
+git_machete.git.MAX_MERGE_BASE_CACHE_ENTRIES
 git_machete.github.GitHubApi.MAX_PULLS_PER_PAGE_COUNT
 git_machete.github.GitHubToken.for_domain
 git_machete.gitlab.GitLabApi.MAX_PULLS_PER_PAGE_COUNT
@@ -54,6 +54,7 @@ _git_machete() {
   local gitlab_subcommands="anno-mrs checkout-mrs create-mr restack-mr retarget-mr update-mr-descriptions"
   local locations="current $directions"
   local opt_color_args="always auto never"
+  local opt_format_args="text json"
   local opt_return_to_args="HERE NEAREST-REMAINING STAY"
   local opt_squash_merge_detection_args="exact none simple"
   local opt_start_from_args="HERE ROOT FIRST-ROOT"
@@ -77,7 +78,7 @@ _git_machete() {
   local rename_opts="-b --branch= --repoint-tracking"
   local slide_out_opts="-d --down-fork-point= --delete -M --merge -n --no-edit-merge --no-interactive-rebase --no-rebase --removed-from-remote"
   local squash_opts="-f --fork-point="
-  local status_opts="--color= -L --list-commits-with-hashes -l --list-commits --no-detect-squash-merges --squash-merge-detection="
+  local status_opts="--color= --format= -L --list-commits-with-hashes -l --list-commits --no-detect-squash-merges --prompt --squash-merge-detection= --watch"
   local traverse_opts="-F --fetch -H --sync-github-prs -L --sync-gitlab-mrs -l --list-commits -M --merge -n --no-detect-squash-merges --no-edit-merge --no-interactive-rebase --no-push --no-push-untracked --push --push-untracked --return-to= --squash-merge-detection= --start-from= --stop-after= -w --whole -W -y --yes"
   local update_opts="-f --fork-point= -M --merge -n --no-edit-merge --no-interactive-rebase"
 
@@ -87,6 +88,7 @@ _git_machete() {
     --by=*|--checked-out-since=*) COMPREPLY=('');;
     --color=*) __gitcomp "$opt_color_args" "" "${cur##--color=}" ;;
     --down-fork-point=*|--fork-point=*|--override-to=*) __gitcomp "$(__git_refs)" "" "${cur##--*=}" ;;
+    --format=*) __gitcomp "$opt_format_args" "" "${cur##--format=}" ;;
     --return-to=*) __gitcomp "$opt_return_to_args" "" "${cur##--return-to=}" ;;
     --roots=*) __gitcomp "$(__git_heads)" "" "${cur##--roots=}" ;;
     --squash-merge-detection=*) __gitcomp "$opt_squash_merge_detection_args" "" "${cur##--squash-merge-detection=}" ;;
@@ -231,10 +231,13 @@ complete -c git-machete -n "__fish_seen_subcommand_from squash" -x -l fork-point
 # git machete status
 complete -c git-machete -n "not __fish_seen_subcommand_from $__machete_commands" -f -a status -d 'Display formatted tree of branch dependencies, including info on their sync with upstream branch and with remote'
 complete -c git-machete -n "__fish_seen_subcommand_from status s"                                                                    -x -l color                    -a "auto always never" -d 'Colorize the output (default: auto)'
+complete -c git-machete -n "__fish_seen_subcommand_from status s"                                                                    -x -l format                   -a "text json"         -d 'Format of the output (default: text)'
 complete -c git-machete -n "__fish_seen_subcommand_from status s; and not __fish_seen_subcommand_from --list-commits -l"             -f -l list-commits             -s l                   -d 'Additionally list the commits introduced on each branch'
 complete -c git-machete -n "__fish_seen_subcommand_from status s; and not __fish_seen_subcommand_from --list-commits-with-hashes -L" -f -l list-commits-with-hashes -s L                   -d 'Additionally list the short hashes and messages of commits introduced on each branch'
 complete -c git-machete -n "__fish_seen_subcommand_from status s; and not __fish_seen_subcommand_from --no-detect-squash-merges"     -f -l no-detect-squash-merges                         -d 'Only consider "strict" (fast-forward or 2-parent) merges, rather than rebase/squash merges, when detecting if a branch is merged into its upstream (parent)'
+complete -c git-machete -n "__fish_seen_subcommand_from status s; and not __fish_seen_subcommand_from --prompt"                      -f -l prompt                                          -d 'Only print the edge leading to the current branch and its sync to remote, for use in shell prompts'
 complete -c git-machete -n "__fish_seen_subcommand_from status s"                                                                    -x -l squash-merge-detection   -a 'none simple exact' -d 'Mode of detection of squash merges; argument can be "none", "simple" (default) or "exact"'
+complete -c git-machete -n "__fish_seen_subcommand_from status s; and not __fish_seen_subcommand_from --watch"                       -f -l watch                                           -d 'Keep redrawing the status whenever the branches or the branch layout file change'
 
 # git machete traverse
 complete -c git-machete -n "not __fish_seen_subcommand_from $__machete_commands" -f -a traverse -d 'Walk through the tree of branch dependencies and rebase, merge, slide out, push and/or pull each branch one by one'
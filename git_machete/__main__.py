@@ -0,0 +1,5 @@
+"""Entry point for `python -m git_machete`, used to re-invoke git-machete with the same interpreter (see `status --prompt`)."""
+
+from git_machete import cli
+
+cli.main()
@@ -20,7 +20,7 @@ from git_machete.client.reapply import ReapplyMacheteClient
 from git_machete.client.rename import RenameMacheteClient
 from git_machete.client.slide_out import SlideOutMacheteClient
 from git_machete.client.squash import SquashMacheteClient
-from git_machete.client.status import StatusMacheteClient
+from git_machete.client.status import StatusFormat, StatusMacheteClient
 from git_machete.client.traverse import TraverseMacheteClient, TraverseReturnTo
 from git_machete.client.update import UpdateMacheteClient
 from git_machete.client.with_code_hosting import MacheteClientWithCodeHosting
@@ -82,6 +82,8 @@ def _populate_cli_options(
             cli_opts.opt_fetch = True
         elif key == "fork-point":
             cli_opts.opt_fork_point = AnyRevision.of(value) if value else None
+        elif key == "format":
+            cli_opts.opt_format = value
         elif key == "ignore-if-missing":
             cli_opts.opt_ignore_if_missing = True
         elif key == "inferred":
@@ -118,6 +120,8 @@ def _populate_cli_options(
             cli_opts.opt_override_to_inferred = True
         elif key == "override-to-parent":
             cli_opts.opt_override_to_parent = True
+        elif key == "prompt":
+            cli_opts.opt_prompt = True
         elif key == "push":
             cli_opts.opt_push_tracked = True
             cli_opts.opt_push_untracked = True
@@ -158,6 +162,8 @@ def _populate_cli_options(
             cli_opts.opt_start_from = "first-root"
             cli_opts.opt_n = True
             cli_opts.opt_return_to = "nearest-remaining"
+        elif key == "watch":
+            cli_opts.opt_watch = True
         elif key == "whole":
             cli_opts.opt_start_from = "first-root"
             cli_opts.opt_n = True
@@ -476,14 +482,31 @@ def launch_internal(orig_args: List[str]) -> None:
         elif cmd == "squash":
             SquashMacheteClient().squash(opt_fork_point=cli_opts.opt_fork_point)
         elif cmd in {"status", alias_by_command["status"]}:
-            status_client = StatusMacheteClient(
-                interactively_slide_out_invalid_branches=terminal.is_stdout_a_tty())
-            status_client.expect_at_least_one_managed_branch()
-            status_client.status(
-                warn_when_branch_in_sync_but_fork_point_off=True,
-                opt_list_commits=cli_opts.opt_list_commits,
-                opt_list_commits_with_hashes=cli_opts.opt_list_commits_with_hashes,
-                opt_squash_merge_detection=cli_opts.opt_squash_merge_detection)
+            if cli_opts.opt_prompt:
+                # Invalid branches are neither slid out nor warned about, and an empty layout isn't an error:
+                # whatever is there, the prompt must stay quiet (and quick).
+                StatusMacheteClient(verify_branches=False).prompt_status(opt_squash_merge_detection=cli_opts.opt_squash_merge_detection)
+            else:
+                opt_format = StatusFormat.from_string(cli_opts.opt_format, "`--format` flag")
+                status_client = StatusMacheteClient(
+                    interactively_slide_out_invalid_branches=terminal.is_stdout_a_tty())
+                status_client.expect_at_least_one_managed_branch()
+                if cli_opts.opt_watch:
+                    status_client.watch_status(
+                        opt_list_commits=cli_opts.opt_list_commits,
+                        opt_list_commits_with_hashes=cli_opts.opt_list_commits_with_hashes,
+                        opt_squash_merge_detection=cli_opts.opt_squash_merge_detection)
+                elif opt_format == StatusFormat.JSON:
+                    status_client.status_json(
+                        opt_list_commits=cli_opts.opt_list_commits,
+                        opt_list_commits_with_hashes=cli_opts.opt_list_commits_with_hashes,
+                        opt_squash_merge_detection=cli_opts.opt_squash_merge_detection)
+                else:
+                    status_client.status(
+                        warn_when_branch_in_sync_but_fork_point_off=True,
+                        opt_list_commits=cli_opts.opt_list_commits,
+                        opt_list_commits_with_hashes=cli_opts.opt_list_commits_with_hashes,
+                        opt_squash_merge_detection=cli_opts.opt_squash_merge_detection)
         elif cmd in {"traverse", alias_by_command["traverse"]}:
             opt_return_to = TraverseReturnTo.from_string(cli_opts.opt_return_to, "`--return-to` flag")
 
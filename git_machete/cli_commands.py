@@ -461,10 +461,30 @@ COMMANDS: Tuple[CommandSpec, ...] = (
         aliases=("s",),
         options=(
             OptSpec(long="color", takes_value=True),
+            OptSpec(long="format", takes_value=True),
             OptSpec(short="l", long="list-commits"),
             OptSpec(short="L", long="list-commits-with-hashes"),
             OptSpec(long="no-detect-squash-merges"),
+            OptSpec(long="prompt"),
             OptSpec(long="squash-merge-detection", takes_value=True),
+            OptSpec(long="watch"),
+        ),
+        mutex_groups=(
+            MutexGroup(
+                ("format", "prompt"),
+                "Option `--format` cannot be specified together with `--prompt`."),
+            MutexGroup(
+                ("format", "watch"),
+                "Option `--format` cannot be specified together with `--watch`."),
+            MutexGroup(
+                ("prompt", "list-commits"),
+                "Option `--prompt` cannot be specified together with `-l/--list-commits`."),
+            MutexGroup(
+                ("prompt", "list-commits-with-hashes"),
+                "Option `--prompt` cannot be specified together with `-L/--list-commits-with-hashes`."),
+            MutexGroup(
+                ("prompt", "watch"),
+                "Option `--prompt` cannot be specified together with `--watch`."),
         ),
     ),
     CommandSpec(
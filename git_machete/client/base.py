@@ -1,14 +1,18 @@
+import hashlib
 import os
 import shlex
 import sys
 import textwrap
+from contextlib import closing, contextmanager
 from enum import Enum, auto
-from typing import Callable, Dict, Iterator, List, NoReturn, Optional, Sequence, Tuple, TypeVar
+from typing import Callable, Dict, Generator, Iterable, Iterator, List, NoReturn, Optional, Sequence, Tuple, TypeVar
 
 from git_machete.client import branch_layout
+from git_machete.client.fork_point_cache import CachedForkPoint, ForkPointCache
+from git_machete.client.reflog_index import ReflogIndex
 from git_machete.client.state import MacheteState, ManagedBranchName
 from git_machete.config import MacheteConfig, SquashMergeDetection
-from git_machete.constants import INITIAL_COMMIT_COUNT_FOR_LOG, TOTAL_COMMIT_COUNT_FOR_LOG
+from git_machete.constants import TOTAL_COMMIT_COUNT_FOR_LOG
 from git_machete.git import (HEAD, AnyBranchName, AnyRevision, BranchPair, ForkPointOverrideData, FullCommitHash, Git, LocalBranchShortName,
                              RemoteBranchShortName, SyncToRemoteStatus)
 from git_machete.utils import fs
@@ -18,6 +22,7 @@ from git_machete.utils.debug_log import debug
 from git_machete.utils.exceptions import MacheteException, UnexpectedMacheteException
 from git_machete.utils.markup import input_fmt, pretty_choices, print_fmt, warn
 from git_machete.utils.paths import AbsPath, Path
+from git_machete.utils.reflog_file import ReflogFileEntry
 
 _BranchT = TypeVar("_BranchT", bound=LocalBranchShortName)
 
@@ -38,6 +43,8 @@ class MacheteClient:
         self._git: Git = Git()
         self._config: MacheteConfig = MacheteConfig(self._git)
         self._git.owner = self
+        if self._config.in_process_ancestry():
+            self._git.enable_in_process_ancestry()
 
         self._branch_layout_file_path: AbsPath = self.__get_git_machete_branch_layout_file_path()
         # Cwd-relative rendition of the layout path, captured at init time for use in user-facing messages
@@ -87,6 +94,12 @@ class MacheteClient:
         self.__indent: Optional[str] = None
         self.__has_trailing_blank_line: Optional[bool] = None
         self.__branch_pairs_by_hash_in_reflog: Optional[Dict[FullCommitHash, List[BranchPair]]] = None
+        self.__reflog_index: Optional[ReflogIndex] = None
+        self.__fork_point_cache: Optional[ForkPointCache] = None
+        self.__are_fork_point_cache_writes_batched: bool = False
+        self.__all_reflogs_state_digest_cached: Optional[str] = None
+        self.__first_match_of_log_to_filtered_reflogs_cached: \
+            Dict[LocalBranchShortName, Tuple[FullCommitHash, Optional[Tuple[FullCommitHash, List[BranchPair]]]]] = {}
 
     # === Branch listing ===
 
@@ -102,7 +115,7 @@ class MacheteClient:
 
     def is_managed(self, *, opt_branch: Optional[LocalBranchShortName]) -> bool:
         branch = opt_branch or self._git.get_current_branch_or_none()
-        return branch is not None and branch in self.managed_branches
+        return branch is not None and self._state.is_managed(branch)
 
     # === Branch existence assertions ===
 
@@ -193,7 +206,7 @@ class MacheteClient:
     # === Branch navigation ===
 
     def root_branch_for(self, branch: LocalBranchShortName, if_unmanaged: PickRoot) -> LocalBranchShortName:
-        if branch not in self.managed_branches:
+        if not self._state.is_managed(branch):
             roots = self._state.roots
             if roots:
                 if if_unmanaged == PickRoot.FIRST:
@@ -218,7 +231,7 @@ class MacheteClient:
                                branch: LocalBranchShortName,
                                prompt_if_inferred_msg: Optional[str],
                                prompt_if_inferred_yes_opt_msg: Optional[str]) -> LocalBranchShortName:
-        if branch in self.managed_branches:
+        if self._state.is_managed(branch):
             managed_parent = self.parent_of(branch)
             if managed_parent:
                 return managed_parent
@@ -251,8 +264,11 @@ class MacheteClient:
         self,
         branch: LocalBranchShortName,
         *,
-        use_overrides: bool
+        use_overrides: bool,
+        use_cache: bool = True
     ) -> Tuple[FullCommitHash, List[BranchPair]]:
+        """Unless `use_cache` is `False`, the inferred fork point is taken from the persistent `ForkPointCache`, if possible.
+        Overrides are always evaluated anew, though, if only for the warning about an override that no longer applies."""
         parent = self.parent_of(branch)
         parent_hash = self._git.get_commit_hash_by_revision(parent) if parent else None
 
@@ -279,9 +295,32 @@ class MacheteClient:
                     debug(f"fork point of {branch} is overridden to {overridden_fork_point}; skipping inference")
                     return overridden_fork_point, []
 
-        try:
-            computed_fork_point, inferring_branch_pairs = next(self.__match_log_to_filtered_reflogs(branch))
-        except StopIteration:
+        if not use_cache:
+            return self.__infer_fork_point_and_inferring_branch_pairs(branch, parent=parent, parent_hash=parent_hash)
+        cached = self.__get_cached_fork_point(branch, parent=parent, parent_hash=parent_hash)
+        if cached:
+            debug(f"fork point of {branch} taken from cache: {cached.fork_point}")
+            return FullCommitHash.of(cached.fork_point), \
+                [BranchPair(LocalBranchShortName.of(lb), AnyBranchName.of(lb_or_rb)) for lb, lb_or_rb in cached.inferring_branch_pairs]
+        fork_point, inferring_branch_pairs = \
+            self.__infer_fork_point_and_inferring_branch_pairs(branch, parent=parent, parent_hash=parent_hash)
+        key_digest = self.__get_fork_point_cache_key_digest(
+            branch, parent=parent, parent_hash=parent_hash, inferring_branches=[lb for lb, _ in inferring_branch_pairs])
+        self.__get_fork_point_cache().put(branch=branch, key_digest=key_digest, fork_point=fork_point,
+                                          inferring_branch_pairs=[(lb, lb_or_rb) for lb, lb_or_rb in inferring_branch_pairs])
+        if not self.__are_fork_point_cache_writes_batched:
+            self.__get_fork_point_cache().save()
+        return fork_point, inferring_branch_pairs
+
+    def __infer_fork_point_and_inferring_branch_pairs(
+        self,
+        branch: LocalBranchShortName,
+        *,
+        parent: Optional[ManagedBranchName],
+        parent_hash: Optional[FullCommitHash]
+    ) -> Tuple[FullCommitHash, List[BranchPair]]:
+        first_match = self.__get_first_match_of_log_to_filtered_reflogs(branch)
+        if first_match is None:
             if parent and parent_hash:
                 if self._git.is_ancestor_or_equal(parent.full_name(), branch.full_name()):
                     debug(
@@ -298,6 +337,7 @@ class MacheteClient:
             raise MacheteException(f"Fork point not found for branch <b>{branch}</b>; "
                                    f"use `git machete fork-point {branch} --override-to...`")
         else:
+            computed_fork_point, inferring_branch_pairs = first_match
             debug(f"commit {computed_fork_point} is the most recent point in history of {branch} to occur on "
                   "filtered reflog of any other branch or its remote counterpart "
                   f"(specifically: {' and '.join(map(get_second, inferring_branch_pairs))})")
@@ -340,6 +380,84 @@ class MacheteClient:
                 debug(f"effective fork point of {branch} is {improved_fork_point}")
                 return improved_fork_point, improved_inferring_branch_pairs
 
+    def __get_fork_point_cache(self) -> ForkPointCache:
+        if self.__fork_point_cache is None:
+            self.__fork_point_cache = ForkPointCache(self._git.get_main_worktree_git_subpath("machete-fork-point-cache"),
+                                                     existing_branches=self._git.get_local_branches())
+        return self.__fork_point_cache
+
+    @contextmanager
+    def _batching_fork_point_cache_writes(self) -> Iterator[None]:
+        """For inferring the fork points of many branches at once: rather than upon each inference,
+        the persistent `ForkPointCache` is only written once the block exits."""
+        self.__are_fork_point_cache_writes_batched = True
+        try:
+            yield
+        finally:
+            self.__are_fork_point_cache_writes_batched = False
+            if self.__fork_point_cache is not None:
+                self.__fork_point_cache.save()
+
+    def __get_fork_point_cache_key_digest(
+        self,
+        branch: LocalBranchShortName,
+        *,
+        parent: Optional[ManagedBranchName],
+        parent_hash: Optional[FullCommitHash],
+        inferring_branches: Iterable[LocalBranchShortName]
+    ) -> str:
+        """The outcome of the inference is determined by the tips of the branch and its parent, and by the reflogs of the other branches.
+        The tips of the parent and of the inferring branches, along with their remote counterparts, are taken into account one by one.
+        The reflogs, though, are only summed up as a whole (see `__get_all_reflogs_state_digest`), since a new matching entry
+        in the reflog of any branch (say, after a rebase or a reset of a sibling) might as well change the fork point.
+        That's the trade-off that keeps the cache correct: it's only hit as long as no reflog at all has changed since the inference.
+        Whenever a reflog can be read directly from a file, checking it takes neither reading nor filtering its entries.
+        `fork-point --explain` doesn't use the cache at all, though.
+        """
+        key = [branch, self._git.get_commit_hash_by_revision(branch) or "", parent or "", parent_hash or ""]
+        for lb in sorted({*([parent] if parent else []), *inferring_branches}):
+            remote_branch = self._git.get_combined_counterpart_for_fetching_of_branch(lb)
+            for relevant_branch in [lb, remote_branch] if remote_branch else [lb]:
+                key += [relevant_branch, self._git.get_commit_hash_by_revision(relevant_branch) or ""]
+        key.append(self.__get_all_reflogs_state_digest())
+        return hashlib.sha1("\t".join(key).encode("utf-8")).hexdigest()
+
+    def __get_all_reflogs_state_digest(self) -> str:
+        """Covers the reflogs of all local branches and their remote counterparts (the ones `__get_branch_pairs_by_hash_in_reflog` scans).
+        Whenever a reflog can be read directly from a file, only its size and modification time are taken into account."""
+        if self.__all_reflogs_state_digest_cached is None:
+            states: List[str] = []
+            for lb in self._git.get_local_branches():
+                remote_branch = self._git.get_combined_counterpart_for_fetching_of_branch(lb)
+                for branch in [lb, remote_branch] if remote_branch else [lb]:
+                    reflog_path = self._git.get_reflog_file_path_or_none(branch.full_name())
+                    if reflog_path is None:
+                        entries = "\n".join(f"{entry.hash} {entry.reflog_subject}" for entry in self._git.get_reflog(branch.full_name()))
+                        states += [branch, hashlib.sha1(entries.encode("utf-8")).hexdigest()]
+                    elif os.path.isfile(reflog_path):
+                        stat = os.stat(reflog_path)
+                        states += [branch, f"{stat.st_size} {stat.st_mtime_ns}"]
+                    else:
+                        states += [branch, ""]
+            self.__all_reflogs_state_digest_cached = hashlib.sha1("\t".join(states).encode("utf-8")).hexdigest()
+        return self.__all_reflogs_state_digest_cached
+
+    def __get_cached_fork_point(
+            self, branch: LocalBranchShortName, *, parent: Optional[ManagedBranchName], parent_hash: Optional[FullCommitHash]
+    ) -> Optional[CachedForkPoint]:
+        cached = self.__get_fork_point_cache().get(branch=branch)
+        if cached is None:
+            return None
+        key_digest = self.__get_fork_point_cache_key_digest(
+            branch, parent=parent, parent_hash=parent_hash,
+            inferring_branches=[LocalBranchShortName.of(lb) for lb, _ in cached.inferring_branch_pairs])
+        return cached if cached.key_digest == key_digest else None
+
+    def __is_fork_point_cached(self, branch: LocalBranchShortName) -> bool:
+        parent = self.parent_of(branch)
+        parent_hash = self._git.get_commit_hash_by_revision(parent) if parent else None
+        return self.__get_cached_fork_point(branch, parent=parent, parent_hash=parent_hash) is not None
+
     def fork_point(self, branch: LocalBranchShortName, *, use_overrides: bool) -> FullCommitHash:
         hash, inferring_branch_pairs = self.fork_point_and_inferring_branch_pairs(branch, use_overrides=use_overrides)
         return FullCommitHash.of(hash)
@@ -359,7 +477,13 @@ class MacheteClient:
                 f"Fork point <b>{fork_point}</b> is not ancestor of or the tip "
                 f"of the <b>{branch}</b> branch.")
 
-    def filtered_reflog(self, branch: AnyBranchName) -> List[FullCommitHash]:
+    @staticmethod
+    def __filter_reflog_entries(
+        branch: AnyBranchName,
+        entries: Iterable[Tuple[str, str]],
+        *,
+        creation_hash: Optional[str]
+    ) -> List[FullCommitHash]:
         def is_excluded_reflog_subject(entry_hash: str, reflog_subject: str) -> bool:
             is_excluded = (reflog_subject.startswith("branch: Created from") or
                            reflog_subject == f"branch: Reset to {branch}" or
@@ -378,35 +502,53 @@ class MacheteClient:
                 debug("skipping reflog entry")
             return is_excluded
 
+        return [FullCommitHash.of(entry_hash) for (entry_hash, reflog_subject) in entries if
+                entry_hash != creation_hash and not is_excluded_reflog_subject(entry_hash, reflog_subject)]
+
+    def filtered_reflog(self, branch: AnyBranchName) -> List[FullCommitHash]:
         branch_reflog = self._git.get_reflog(branch.full_name())
         if not branch_reflog:
             return []
 
         earliest_hash, earliest_gs = branch_reflog[-1]  # Note that the reflog is returned from latest to earliest entries.
-        hashes_to_exclude = set()
+        creation_hash = None
         if earliest_gs.startswith("branch: Created from"):
             debug(f"skipping any reflog entry with the hash equal to the hash of the earliest (branch creation) entry: {earliest_hash}")
-            hashes_to_exclude.add(earliest_hash)
+            creation_hash = earliest_hash
 
-        result = [entry_hash for (entry_hash, reflog_subject) in branch_reflog if
-                  entry_hash not in hashes_to_exclude and not is_excluded_reflog_subject(entry_hash, reflog_subject)]
+        result = self.__filter_reflog_entries(branch, branch_reflog, creation_hash=creation_hash)
         reflog = (", ".join(result) or "<empty>")
         debug("computed filtered reflog (= reflog without branch creation "
               f"and branch reset events irrelevant for fork point/parent inference): {reflog}")
         return result
 
-    def __match_log_to_filtered_reflogs(self, branch: LocalBranchShortName) -> Iterator[Tuple[FullCommitHash, List[BranchPair]]]:
+    def __get_indexed_filtered_reflog(self, branch: AnyBranchName) -> List[FullCommitHash]:
+        """Same as `filtered_reflog`, but (whenever the reflog can be read directly from a file) backed by the persistent `ReflogIndex`,
+        so that only the reflog entries appended since the last run need to be read and filtered."""
+        reflog_path = self._git.get_reflog_file_path_or_none(branch.full_name())
+        if reflog_path is None:
+            return self.filtered_reflog(branch)
+        if self.__reflog_index is None:
+            self.__reflog_index = ReflogIndex(self._git.get_main_worktree_git_subpath("machete-reflog-index"))
+
+        def filter_entries(entries: List[ReflogFileEntry], creation_hash: str) -> List[FullCommitHash]:
+            return self.__filter_reflog_entries(
+                branch, ((entry.hash, entry.subject) for entry in entries), creation_hash=creation_hash or None)
 
+        return [FullCommitHash.of(hash) for hash in
+                self.__reflog_index.get_filtered_reflog(ref=branch.full_name(), reflog_path=reflog_path, filter_entries=filter_entries)]
+
+    def __get_branch_pairs_by_hash_in_reflog(self) -> Dict[FullCommitHash, List[BranchPair]]:
         if self.__branch_pairs_by_hash_in_reflog is None:
             def generate_entries() -> Iterator[Tuple[FullCommitHash, BranchPair]]:
                 for lb in self._git.get_local_branches():
                     lb_hashes = set()
-                    for commit_hash in self.filtered_reflog(lb):
+                    for commit_hash in self.__get_indexed_filtered_reflog(lb):
                         lb_hashes.add(commit_hash)
                         yield FullCommitHash.of(commit_hash), BranchPair(lb, lb)
                     remote_branch = self._git.get_combined_counterpart_for_fetching_of_branch(lb)
                     if remote_branch:
-                        for commit_hash in self.filtered_reflog(remote_branch):
+                        for commit_hash in self.__get_indexed_filtered_reflog(remote_branch):
                             if commit_hash not in lb_hashes:
                                 yield FullCommitHash.of(commit_hash), BranchPair(lb, remote_branch)
 
@@ -436,18 +578,30 @@ class MacheteClient:
 
             branches = "\n".join(log_result())
             debug(f"branches containing the given hash in their filtered reflog: \n{branches}\n")
+            if self.__reflog_index is not None:
+                self.__reflog_index.save()
+        return self.__branch_pairs_by_hash_in_reflog
 
+    def __match_log_to_filtered_reflogs(
+            self, branch: LocalBranchShortName) -> Generator[Tuple[FullCommitHash, List[BranchPair]], None, None]:
+        branch_pairs_by_hash_in_reflog = self.__get_branch_pairs_by_hash_in_reflog()
         branch_full_hash = self._git.get_commit_hash_by_revision(branch)
         if not branch_full_hash:
             return
+        log_hashes = self._git.spoonfeed_log_hashes(branch_full_hash, total_count=TOTAL_COMMIT_COUNT_FOR_LOG)
+        yield from self.__match_hashes_to_filtered_reflogs(branch, log_hashes, branch_pairs_by_hash_in_reflog)
 
-        for hash in self._git.spoonfeed_log_hashes(branch_full_hash,
-                                                   initial_count=INITIAL_COMMIT_COUNT_FOR_LOG,
-                                                   total_count=TOTAL_COMMIT_COUNT_FOR_LOG):
-            if hash in self.__branch_pairs_by_hash_in_reflog:
+    @staticmethod
+    def __match_hashes_to_filtered_reflogs(
+        branch: LocalBranchShortName,
+        log_hashes: Iterator[FullCommitHash],
+        branch_pairs_by_hash_in_reflog: Dict[FullCommitHash, List[BranchPair]]
+    ) -> Generator[Tuple[FullCommitHash, List[BranchPair]], None, None]:
+        for hash in log_hashes:
+            if hash in branch_pairs_by_hash_in_reflog:
                 # The entries must be sorted by lb_or_rb to make sure the parent inference is deterministic
                 # (and does not depend on the order in which `generate_entries` iterated through the local branches).
-                branch_pairs: List[BranchPair] = self.__branch_pairs_by_hash_in_reflog[hash]
+                branch_pairs: List[BranchPair] = branch_pairs_by_hash_in_reflog[hash]
 
                 def lb_is_not_b(lb: str, _lb_or_rb: str) -> bool:
                     return lb != branch
@@ -461,6 +615,36 @@ class MacheteClient:
             else:
                 debug(f"commit {hash} not found in any filtered reflog")
 
+    def __get_first_match_of_log_to_filtered_reflogs(
+            self, branch: LocalBranchShortName) -> Optional[Tuple[FullCommitHash, List[BranchPair]]]:
+        if branch in self.__first_match_of_log_to_filtered_reflogs_cached:
+            tip_hash, first_match = self.__first_match_of_log_to_filtered_reflogs_cached[branch]
+            if tip_hash == self._git.get_commit_hash_by_revision(branch):
+                return first_match
+        with closing(self.__match_log_to_filtered_reflogs(branch)) as matches:
+            return next(matches, None)
+
+    def _warm_up_fork_points(self, branches: Sequence[LocalBranchShortName]) -> None:
+        """`fork_point_and_inferring_branch_pairs` for each of many branches would walk the history of each branch separately,
+        even though for a stack of branches, these histories are largely the same.
+        This walks all of them in one go, and leaves the first match of each history against the filtered reflogs in a cache
+        for `fork_point_and_inferring_branch_pairs` to pick up. The cache is keyed by the tip of each branch, just in case.
+        """
+        tip_hash_by_branch: Dict[LocalBranchShortName, FullCommitHash] = {}
+        for branch in branches:
+            # An overridden (or already cached) fork point makes the inference unnecessary.
+            tip_hash = self._git.get_commit_hash_by_revision(branch)
+            if tip_hash and not self._get_overridden_fork_point(branch) and not self.__is_fork_point_cached(branch):
+                tip_hash_by_branch[branch] = tip_hash
+        if not tip_hash_by_branch:
+            return
+        branch_pairs_by_hash_in_reflog = self.__get_branch_pairs_by_hash_in_reflog()
+        with self._git.spoonfeeding_log_hashes_of_many(list(tip_hash_by_branch.values()),
+                                                       total_count=TOTAL_COMMIT_COUNT_FOR_LOG) as log_hashes_of_many:
+            for (branch, tip_hash), log_hashes in zip(tip_hash_by_branch.items(), log_hashes_of_many):
+                with closing(self.__match_hashes_to_filtered_reflogs(branch, log_hashes, branch_pairs_by_hash_in_reflog)) as matches:
+                    self.__first_match_of_log_to_filtered_reflogs_cached[branch] = (tip_hash, next(matches, None))
+
     def _infer_parent(self,
                       branch: LocalBranchShortName,
                       condition: Callable[[LocalBranchShortName], bool] = lambda parent: True,
@@ -544,6 +728,34 @@ class MacheteClient:
         else:  # pragma: no cover
             raise UnexpectedMacheteException(f"Invalid squash merged detection mode: {opt_squash_merge_detection}.")
 
+    def _warm_up_squash_merge_detection(
+            self,
+            *,
+            branches: Sequence[AnyBranchName],
+            parent: AnyBranchName,
+            opt_squash_merge_detection: SquashMergeDetection
+    ) -> None:
+        """`is_merged_to` for each of many branches with a common parent would walk (largely the same) history of the parent
+        once per branch. This walks it once for all of them, and leaves the answers in the caches of `Git` for `is_merged_to` to pick up.
+        These caches are keyed by commit hashes, so that they remain valid even if some branches get rebased etc. in the meantime.
+        """
+        if opt_squash_merge_detection == SquashMergeDetection.NONE:
+            return
+        # Same as in `is_merged_to`: squash merge detection doesn't kick in for branches that are ancestors of the parent.
+        candidates = [b for b in branches if not self._git.is_ancestor_or_equal(b.full_name(), parent.full_name())]
+        is_equivalent_tree_reachable = self._git.are_equivalent_trees_reachable(equivalent_to=candidates, reachable_from=parent)
+        if opt_squash_merge_detection == SquashMergeDetection.EXACT:
+            self._git.are_equivalent_patches_reachable(
+                equivalent_to=[c for c, is_reachable in zip(candidates, is_equivalent_tree_reachable) if not is_reachable],
+                reachable_from=parent)
+
+    def _warm_up_squash_merge_detection_to_parents(self, *, opt_squash_merge_detection: SquashMergeDetection) -> None:
+        for parent in self.managed_branches:
+            children = self.children_of(parent)
+            if children:
+                self._warm_up_squash_merge_detection(
+                    branches=children, parent=parent, opt_squash_merge_detection=opt_squash_merge_detection)
+
     def _is_merged_to_parent(
             self, branch: LocalBranchShortName, *, opt_squash_merge_detection: SquashMergeDetection) -> bool:
         parent = self.parent_of(branch)
@@ -564,7 +776,7 @@ class MacheteClient:
             switch_head_if_new_branch: bool
             ) -> None:
         branch = opt_branch or self._git.get_current_branch()
-        if branch in self.managed_branches:
+        if self._state.is_managed(branch):
             raise MacheteException(f"Branch <b>{branch}</b> already exists in the tree of branch dependencies")
 
         # `onto` is tracked as a `ManagedBranchName` from this point on so that the final `add_as_child(parent=...)` call type-checks;
@@ -597,7 +809,7 @@ class MacheteClient:
                     if not onto:
                         current_branch = self._git.get_current_branch_or_none()
                         if self._state.roots:
-                            if current_branch and current_branch in self.managed_branches:
+                            if current_branch and self._state.is_managed(current_branch):
                                 onto = ManagedBranchName(current_branch)
                         else:
                             if current_branch:
@@ -621,7 +833,7 @@ class MacheteClient:
             if not onto:
                 parent = self._infer_parent(
                     branch,
-                    condition=lambda x: x in self.managed_branches,
+                    condition=self._state.is_managed,
                     reject_reason_message="this candidate is not a managed branch")
                 if not parent:
                     raise MacheteException(
@@ -636,7 +848,7 @@ class MacheteClient:
                     opt_yes_msg = (f"Adding <b>{branch}</b> onto the inferred upstream"
                                    f" (parent) branch <b>{parent}</b>")
                     if self.ask_if(msg, opt_yes_msg, opt_yes=opt_yes, verbose=verbose) in ('y', 'yes'):
-                        # `_infer_parent` was filtered by `x in self.managed_branches`
+                        # `_infer_parent` was filtered by `self._state.is_managed`
                         # above, so we can safely narrow here.
                         onto = ManagedBranchName(parent)
                     else:
@@ -692,6 +904,8 @@ class MacheteClient:
                 print_fmt(f"Deleting branch <b>{branch}</b>...")
                 self._git.delete_branch(branch, force=True)
         else:
+            self._warm_up_squash_merge_detection(
+                branches=branches_to_delete, parent=AnyBranchName('HEAD'), opt_squash_merge_detection=opt_squash_merge_detection)
             for branch in branches_to_delete:
                 if self.is_merged_to(branch=branch, parent=AnyBranchName('HEAD'), opt_squash_merge_detection=opt_squash_merge_detection):
                     remote_branch = self._git.get_strict_counterpart_for_fetching_of_branch(branch)
@@ -897,4 +1111,6 @@ class MacheteClient:
     # === Cache management ===
 
     def flush_caches(self) -> None:
+        self.__all_reflogs_state_digest_cached = None
         self.__branch_pairs_by_hash_in_reflog = None
+        self.__first_match_of_log_to_filtered_reflogs_cached = {}
@@ -86,18 +86,20 @@ def parse(path: AbsPath, *, display_path: Optional[Path] = None) -> Tuple[Machet
 
 
 def render(state: MacheteState, indent: str) -> List[str]:
-    """Return lines representing *state*, ready to join with newlines."""
-    def render_dfs(branch: LocalBranchShortName, depth: int) -> List[str]:
-        anno = state.get_annotation(branch)
-        annotation = (" " + anno.unformatted_full_text) if anno is not None else ""
-        result: List[str] = [depth * indent + branch + annotation]
-        for child in (state.get_children(branch) or []):
-            result += render_dfs(child, depth + 1)
-        return result
+    """Return lines representing *state*, ready to join with newlines.
 
+    The tree is walked with an explicit stack rather than recursively,
+    so that deep stacks of branches neither hit the recursion limit nor get their lines copied over at each level.
+    """
     lines: List[str] = []
-    for root in state.roots:
-        lines += render_dfs(root, depth=0)
+    # Pushed in reverse, so that the branches are popped in the order of the file.
+    stack: List[Tuple[LocalBranchShortName, int]] = [(root, 0) for root in reversed(state.roots)]
+    while stack:
+        branch, depth = stack.pop()
+        anno = state.get_annotation(branch)
+        annotation = (" " + anno.unformatted_full_text) if anno is not None else ""
+        lines.append(depth * indent + branch + annotation)
+        stack += [(child, depth + 1) for child in reversed(state.get_children(branch) or [])]
     return lines
 
 
@@ -128,16 +128,14 @@ class DiscoverMacheteClient(StatusMacheteClient):
             # after removing the outer layer of childless merged branches.
             # This is rare enough, however, that we can pretty much ignore this corner case.
 
-        # Order managed_branches by DFS from roots (same order as in .git/machete file)
+        # Order managed_branches by DFS from roots (same order as in .git/machete file),
+        # with an explicit stack rather than recursively, so that deep stacks of branches don't hit the recursion limit.
         dfs_branches: List[LocalBranchShortName] = []
-
-        def collect_branches_dfs(parent: LocalBranchShortName) -> None:
-            dfs_branches.append(parent)
-            for child in self._state.get_children(parent) or []:
-                collect_branches_dfs(child)
-
-        for root in self._state.roots:
-            collect_branches_dfs(root)
+        stack: List[ManagedBranchName] = self._state.roots[::-1]
+        while stack:
+            branch = stack.pop()
+            dfs_branches.append(branch)
+            stack += reversed(self._state.get_children(branch) or [])
         self._state.set_managed(dfs_branches)
 
         print_fmt("<b>Discovered tree of branch dependencies:</b>\n")
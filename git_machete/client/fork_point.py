@@ -12,7 +12,8 @@ class ForkPointMacheteClient(MacheteClient):
                          use_overrides: bool, explain: bool) -> None:
         branch = self._resolve_branch(opt_branch=opt_branch)
         if explain:
-            fork_point, pairs = self.fork_point_and_inferring_branch_pairs(branch=branch, use_overrides=use_overrides)
+            # The explanation is where the inference itself is of interest, so let's not take its outcome from cache.
+            fork_point, pairs = self.fork_point_and_inferring_branch_pairs(branch=branch, use_overrides=use_overrides, use_cache=False)
             print(fork_point)
             if pairs:
                 # Same wording as the `-> fork point ???` annotation rendered by `status -l` on yellow edges.
@@ -0,0 +1,70 @@
+"""Inferred fork points persisted in `<git-dir>/machete-fork-point-cache`, so that they don't need to be inferred again
+(walking the history of the branch, checking ancestry etc.) as long as none of the inputs of the inference has changed.
+
+The inputs are summed up by the caller into a single key digest; only the most recent result is kept for each branch.
+Since which inputs are relevant depends on the result itself (see `MacheteClient.fork_point_and_inferring_branch_pairs`),
+the key digest of the cached entry is checked by the caller as well.
+The file (see `VersionedFile`) has one line per branch after the header:
+`<branch> TAB <key digest> TAB <fork point> TAB <inferring branch pairs, space-separated, each as local:local-or-remote>`.
+Fork points put into the cache (possibly from multiple threads) are only written to the file upon `save`.
+"""
+
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from git_machete.utils.debug_log import debug
+from git_machete.utils.paths import AbsPath
+from git_machete.utils.versioned_file import VersionedFile
+
+_HEADER = "git-machete fork-point cache v1\n"
+
+
+class CachedForkPoint(NamedTuple):
+    key_digest: str
+    fork_point: str
+    inferring_branch_pairs: List[Tuple[str, str]]
+
+
+class ForkPointCache:
+
+    def __init__(self, path: AbsPath, *, existing_branches: Iterable[str]) -> None:
+        self.__file: VersionedFile = VersionedFile(path, header=_HEADER)
+        self.__existing_branches: Set[str] = set(existing_branches)
+        self.__cached_fork_points: Dict[str, CachedForkPoint] = self.__load()
+        self.__is_dirty: bool = False
+        self.__lock = threading.Lock()
+
+    def __load(self) -> Dict[str, CachedForkPoint]:
+        result: Dict[str, CachedForkPoint] = {}
+        for line in self.__file.read_lines() or []:
+            fields = line.split("\t")
+            if len(fields) != 4 or any(":" not in pair for pair in fields[3].split()):
+                debug(f"{self.__file.path}: ignoring malformed line `{line}`")
+                continue
+            branch, key_digest, fork_point, pairs = fields
+            # Entries for the branches deleted in the meantime are dropped upon the next write.
+            if branch in self.__existing_branches:
+                result[branch] = CachedForkPoint(
+                    key_digest=key_digest, fork_point=fork_point,
+                    inferring_branch_pairs=[(lb, lb_or_rb) for lb, _, lb_or_rb in (pair.partition(":") for pair in pairs.split())])
+        return result
+
+    def get(self, *, branch: str) -> Optional[CachedForkPoint]:
+        """The most recent result for the branch, whether its key digest is still up to date or not."""
+        return self.__cached_fork_points.get(branch)
+
+    def put(self, *, branch: str, key_digest: str, fork_point: str, inferring_branch_pairs: List[Tuple[str, str]]) -> None:
+        cached = CachedForkPoint(key_digest=key_digest, fork_point=fork_point, inferring_branch_pairs=inferring_branch_pairs)
+        with self.__lock:
+            if self.__cached_fork_points.get(branch) != cached:
+                self.__cached_fork_points[branch] = cached
+                self.__is_dirty = True
+
+    def save(self) -> None:
+        with self.__lock:
+            if not self.__is_dirty:
+                return
+            self.__file.write_lines(
+                f"{b}\t{c.key_digest}\t{c.fork_point}\t{' '.join(f'{lb}:{lb_or_rb}' for lb, lb_or_rb in c.inferring_branch_pairs)}\n"
+                for b, c in self.__cached_fork_points.items())
+            self.__is_dirty = False
@@ -0,0 +1,79 @@
+"""Filtered reflogs (see `MacheteClient.filtered_reflog`) persisted in `<git-dir>/machete-reflog-index`, along with the state
+of each reflog file they were computed from, so that only the entries appended to a reflog since the last run need to be filtered.
+
+The file (see `VersionedFile`) has one line per reflog after the header:
+`<ref> TAB <size> TAB <first-line-digest> TAB <last-line-digest> TAB <branch-creation-hash or empty> TAB <filtered hashes>`,
+with the filtered hashes newest first, space-separated.
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Sequence, Set
+
+from git_machete.utils.debug_log import debug
+from git_machete.utils.paths import AbsPath
+from git_machete.utils.reflog_file import ReflogFileEntry, ReflogFileState, read_reflog_appended_since
+from git_machete.utils.versioned_file import VersionedFile
+
+_HEADER = "git-machete reflog index v2\n"
+
+
+class _IndexedReflog(NamedTuple):
+    state: ReflogFileState
+    # Hash of the earliest entry, provided that the entry corresponds to branch creation; empty otherwise.
+    creation_hash: str
+    filtered_hashes: List[str]
+
+
+class ReflogIndex:
+
+    def __init__(self, path: AbsPath) -> None:
+        self.__file: VersionedFile = VersionedFile(path, header=_HEADER)
+        self.__indexed_reflogs: Dict[str, _IndexedReflog] = self.__load()
+        self.__used_refs: Set[str] = set()
+        self.__is_dirty: bool = False
+
+    def __load(self) -> Dict[str, _IndexedReflog]:
+        result: Dict[str, _IndexedReflog] = {}
+        for line in self.__file.read_lines() or []:
+            fields = line.split("\t")
+            if len(fields) != 6 or not fields[1].isdigit():
+                debug(f"{self.__file.path}: ignoring malformed line `{line}`")
+                continue
+            ref, size, first_line_digest, last_line_digest, creation_hash, filtered_hashes = fields
+            state = ReflogFileState(size=int(size), first_line_digest=first_line_digest, last_line_digest=last_line_digest)
+            result[ref] = _IndexedReflog(state=state, creation_hash=creation_hash, filtered_hashes=filtered_hashes.split())
+        return result
+
+    def get_filtered_reflog(
+        self,
+        *,
+        ref: str,
+        reflog_path: str,
+        filter_entries: Callable[[List[ReflogFileEntry], str], Sequence[str]]
+    ) -> List[str]:
+        """`filter_entries` is given the (newest first) entries to filter and the branch creation hash (see `_IndexedReflog`)."""
+        self.__used_refs.add(ref)
+        indexed_reflog = self.__indexed_reflogs.get(ref)
+        entries, state, is_appended = read_reflog_appended_since(reflog_path, indexed_reflog.state if indexed_reflog else None)
+        if indexed_reflog and is_appended:
+            if not entries:
+                return indexed_reflog.filtered_hashes
+            debug(f"{len(entries)} new entries in reflog of {ref}")
+            creation_hash = indexed_reflog.creation_hash
+            filtered_hashes = list(filter_entries(entries, creation_hash)) + indexed_reflog.filtered_hashes
+        else:
+            debug(f"indexing the entire reflog of {ref}")
+            creation_hash = entries[-1].hash if entries and entries[-1].subject.startswith("branch: Created from") else ""
+            filtered_hashes = list(filter_entries(entries, creation_hash))
+        self.__indexed_reflogs[ref] = _IndexedReflog(state=state, creation_hash=creation_hash, filtered_hashes=filtered_hashes)
+        self.__is_dirty = True
+        return filtered_hashes
+
+    def save(self) -> None:
+        """Only the reflogs used since the index has been loaded are kept, so that the index doesn't accumulate deleted branches."""
+        if not self.__is_dirty and self.__used_refs == set(self.__indexed_reflogs):
+            return
+        self.__file.write_lines(
+            f"{ref}\t{reflog.state.size}\t{reflog.state.first_line_digest}\t{reflog.state.last_line_digest}\t"
+            f"{reflog.creation_hash}\t{' '.join(reflog.filtered_hashes)}\n"
+            for ref, reflog in self.__indexed_reflogs.items() if ref in self.__used_refs)
+        self.__is_dirty = False
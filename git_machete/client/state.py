@@ -1,8 +1,7 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from git_machete.annotation import Annotation
 from git_machete.git import LocalBranchShortName
-from git_machete.utils.collections import flat_map
 
 
 class ManagedBranchName(LocalBranchShortName):
@@ -19,6 +18,89 @@ class ManagedBranchName(LocalBranchShortName):
     """
 
 
+class _BranchNode:
+    __slots__ = ("branch", "prev", "next")
+
+    def __init__(self, branch: ManagedBranchName) -> None:
+        self.branch: ManagedBranchName = branch
+        self.prev: Optional[_BranchNode] = None
+        self.next: Optional[_BranchNode] = None
+
+
+class _BranchList:
+    """Ordered list of distinct branches - a doubly linked list of nodes, indexed by branch.
+
+    Checking whether a branch is in the list, removing it, and replacing it in place (with any number of branches)
+    take time independent of the length of the list.
+    The plain-list form, needed by all readers, is materialized lazily and reused until the next mutation.
+    """
+
+    __slots__ = ("_node_of", "_head", "_tail", "_as_list")
+
+    def __init__(self, branches: Iterable[ManagedBranchName] = ()) -> None:
+        self._node_of: Dict[ManagedBranchName, _BranchNode] = {}
+        self._head: Optional[_BranchNode] = None
+        self._tail: Optional[_BranchNode] = None
+        self._as_list: Optional[List[ManagedBranchName]] = None
+        for branch in branches:
+            self.append(branch)
+
+    def __contains__(self, branch: object) -> bool:
+        return branch in self._node_of
+
+    def to_list(self) -> List[ManagedBranchName]:
+        """Returns a copy."""
+        if self._as_list is None:
+            self._as_list = []
+            node = self._head
+            while node is not None:
+                self._as_list.append(node.branch)
+                node = node.next
+        return list(self._as_list)
+
+    def append(self, branch: ManagedBranchName) -> None:
+        self.__insert_before(None, branch)
+
+    def prepend(self, branch: ManagedBranchName) -> None:
+        self.__insert_before(self._head, branch)
+
+    def remove(self, branch: ManagedBranchName) -> None:
+        """Raises `KeyError` if `branch` is not in the list."""
+        node = self._node_of.pop(branch)
+        if node.prev is not None:
+            node.prev.next = node.next
+        else:
+            self._head = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        else:
+            self._tail = node.prev
+        self._as_list = None
+
+    def replace(self, branch: ManagedBranchName, replacements: List[ManagedBranchName]) -> None:
+        """Puts `replacements` in place of `branch`. Raises `KeyError` if `branch` is not in the list."""
+        node = self._node_of[branch]
+        for replacement in replacements:
+            self.__insert_before(node, replacement)
+        self.remove(branch)
+
+    def __insert_before(self, next_node: Optional[_BranchNode], branch: ManagedBranchName) -> None:
+        assert branch not in self._node_of, f"{branch} is already in the list"
+        node = _BranchNode(branch)
+        node.next = next_node
+        node.prev = next_node.prev if next_node is not None else self._tail
+        if node.prev is not None:
+            node.prev.next = node
+        else:
+            self._head = node
+        if next_node is not None:
+            next_node.prev = node
+        else:
+            self._tail = node
+        self._node_of[branch] = node
+        self._as_list = None
+
+
 class MacheteState:
     """
     In-memory representation of the branch layout (.git/machete file).
@@ -32,13 +114,16 @@ class MacheteState:
 
     All five fields are private. Callers may read them freely through the properties and accessor methods below,
     but every structural change must go through the mutation methods so that the invariants above are never violated.
+
+    The lists are kept as `_BranchList`s, so that each mutation only takes time proportional to the number of branches it rewires
+    (e.g. the children of a spliced-out branch) rather than to the number of all managed branches.
     """
 
     def __init__(self) -> None:
-        self._managed_branches: List[ManagedBranchName] = []
-        self._roots: List[ManagedBranchName] = []
+        self._managed_branches: _BranchList = _BranchList()
+        self._roots: _BranchList = _BranchList()
         self._parent_of: Dict[ManagedBranchName, ManagedBranchName] = {}
-        self._children_of: Dict[ManagedBranchName, List[ManagedBranchName]] = {}
+        self._children_of: Dict[ManagedBranchName, _BranchList] = {}
         self._annotations: Dict[ManagedBranchName, Annotation] = {}
 
     # ── Read-only accessors ─────────────────────────────────────────────────
@@ -46,12 +131,12 @@ class MacheteState:
     @property
     def managed_branches(self) -> List[ManagedBranchName]:
         """DFS-ordered flat list of all managed branches. Returns a copy."""
-        return list(self._managed_branches)
+        return self._managed_branches.to_list()
 
     @property
     def roots(self) -> List[ManagedBranchName]:
         """Root branches (those with no parent). Returns a copy."""
-        return list(self._roots)
+        return self._roots.to_list()
 
     def is_managed(self, branch: LocalBranchShortName) -> bool:
         return branch in self._managed_branches
@@ -71,7 +156,7 @@ class MacheteState:
     def get_children(self, branch: LocalBranchShortName) -> Optional[List[ManagedBranchName]]:
         """Returns a copy of the children list, or None if branch has no children entry."""
         children = self._children_of.get(ManagedBranchName(branch))
-        return list(children) if children is not None else None
+        return children.to_list() if children is not None else None
 
     def get_annotation(self, branch: LocalBranchShortName) -> Optional[Annotation]:
         return self._annotations.get(ManagedBranchName(branch))
@@ -97,10 +182,7 @@ class MacheteState:
         self._managed_branches.append(managed)
         if parent is not None:
             self._parent_of[managed] = parent
-            if parent in self._children_of:
-                self._children_of[parent].append(managed)
-            else:
-                self._children_of[parent] = [managed]
+            self._children_of.setdefault(parent, _BranchList()).append(managed)
         else:
             self._roots.append(managed)
         if annotation is not None:
@@ -109,8 +191,8 @@ class MacheteState:
     def bootstrap_as_single_managed(self, branch: LocalBranchShortName) -> None:
         """Bootstrap an empty layout with branch as the sole root and managed branch."""
         managed = ManagedBranchName(branch)
-        self._roots = [managed]
-        self._managed_branches = [managed]
+        self._roots = _BranchList([managed])
+        self._managed_branches = _BranchList([managed])
 
     def add_as_root(self, branch: LocalBranchShortName) -> None:
         """Add branch as a new root, appending it to managed_branches."""
@@ -128,8 +210,11 @@ class MacheteState:
         """Add branch as a child of parent, appending it to managed_branches."""
         managed = ManagedBranchName(branch)
         self._parent_of[managed] = parent
-        existing = self._children_of.get(parent, [])
-        self._children_of[parent] = ([managed] + existing) if as_first_child else (existing + [managed])
+        children = self._children_of.setdefault(parent, _BranchList())
+        if as_first_child:
+            children.prepend(managed)
+        else:
+            children.append(managed)
         self._managed_branches.append(managed)
 
     # ── Removing / rewiring branches ────────────────────────────────────────
@@ -139,21 +224,17 @@ class MacheteState:
 
         If branch is a root, its children become new roots in its place. Removes branch from managed_branches and deletes its annotation.
         """
-        children = list(self._children_of.get(branch) or [])
+        children = self._children_of[branch].to_list() if branch in self._children_of else []
         parent = self._parent_of.get(branch)
 
         if parent is not None:
             for child in children:
                 self._parent_of[child] = parent
-            self._children_of[parent] = flat_map(
-                lambda b: children if b == branch else [b],
-                self._children_of.get(parent) or [],
-            )
+            self._children_of[parent].replace(branch, children)
         else:
             for child in children:
                 self._parent_of.pop(child, None)
-            root_index = self._roots.index(branch)
-            self._roots = self._roots[:root_index] + children + self._roots[root_index + 1:]
+            self._roots.replace(branch, children)
 
         self._parent_of.pop(branch, None)
         self._children_of.pop(branch, None)
@@ -169,9 +250,7 @@ class MacheteState:
         self._annotations.pop(branch, None)
         if branch in self._parent_of:
             parent = self._parent_of.pop(branch)
-            self._children_of[parent] = [
-                b for b in (self._children_of.get(parent) or []) if b != branch
-            ]
+            self._children_of[parent].remove(branch)
         else:
             self._roots.remove(branch)
 
@@ -183,10 +262,11 @@ class MacheteState:
         Clears managed_branches, parent/children mappings, and sets roots to initial_roots.
         Annotations are preserved so they can be selectively updated afterwards.
         """
-        self._roots = [ManagedBranchName(b) for b in initial_roots]
+        # Any root given more than once is only kept in the first place.
+        self._roots = _BranchList(dict.fromkeys(ManagedBranchName(b) for b in initial_roots))
         self._parent_of = {}
         self._children_of = {}
-        self._managed_branches = []
+        self._managed_branches = _BranchList()
 
     def wire_as_child(
         self, *, parent: LocalBranchShortName, child: LocalBranchShortName
@@ -198,10 +278,7 @@ class MacheteState:
         managed_parent = ManagedBranchName(parent)
         managed_child = ManagedBranchName(child)
         self._parent_of[managed_child] = managed_parent
-        if managed_parent in self._children_of:
-            self._children_of[managed_parent].append(managed_child)
-        else:
-            self._children_of[managed_parent] = [managed_child]
+        self._children_of.setdefault(managed_parent, _BranchList()).append(managed_child)
 
     def wire_as_root(self, branch: LocalBranchShortName) -> None:
         """Append branch to roots without touching managed_branches.
@@ -216,13 +293,11 @@ class MacheteState:
         Intended for pruning during tree building before managed_branches is set.
         """
         parent = self._parent_of.pop(branch)
-        self._children_of[parent] = [
-            b for b in self._children_of.get(parent, []) if b != branch
-        ]
+        self._children_of[parent].remove(branch)
 
     def set_managed(self, branches: List[LocalBranchShortName]) -> None:
         """Overwrite managed_branches with the given DFS-ordered list."""
-        self._managed_branches = [ManagedBranchName(b) for b in branches]
+        self._managed_branches = _BranchList(ManagedBranchName(b) for b in branches)
 
     # ── Rename ──────────────────────────────────────────────────────────────
 
@@ -234,28 +309,21 @@ class MacheteState:
     ) -> None:
         """Rename a branch across all state fields."""
         new_managed = ManagedBranchName(new_name)
-        idx = self._managed_branches.index(old_name)
-        self._managed_branches[idx] = new_managed
+        self._managed_branches.replace(old_name, [new_managed])
 
         if old_name in self._roots:
-            ridx = self._roots.index(old_name)
-            self._roots[ridx] = new_managed
+            self._roots.replace(old_name, [new_managed])
 
         if old_name in self._parent_of:
             parent = self._parent_of.pop(old_name)
             self._parent_of[new_managed] = parent
-
-        for k in list(self._parent_of):
-            if self._parent_of[k] == old_name:
-                self._parent_of[k] = new_managed
+            self._children_of[parent].replace(old_name, [new_managed])
 
         if old_name in self._children_of:
             children = self._children_of.pop(old_name)
             self._children_of[new_managed] = children
-
-        for children_list in self._children_of.values():
-            if old_name in children_list:
-                children_list[children_list.index(old_name)] = new_managed
+            for child in children.to_list():
+                self._parent_of[child] = new_managed
 
         if old_name in self._annotations:
             self._annotations[new_managed] = self._annotations.pop(old_name)
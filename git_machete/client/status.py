@@ -1,23 +1,41 @@
 """Status command: display branch tree and sync state."""
 
+import hashlib
 import io
+import itertools
+import json
 import os
+import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
-from typing import Dict, List, NamedTuple, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, TypeVar, Union
 
+from git_machete import __version__
 from git_machete.annotation import Annotation
 from git_machete.client.base import MacheteClient
 from git_machete.client.state import ManagedBranchName
+from git_machete.client.status_hook_cache import StatusHookCache
+from git_machete.client.status_prompt_cache import StatusPromptCache
+from git_machete.client.status_snapshot_cache import CachedBranchStatus, StatusSnapshotCache
 from git_machete.config import SquashMergeDetection
-from git_machete.git import BranchPair, FullCommitHash, GitLogEntry, LocalBranchShortName, SyncToRemoteStatus
-from git_machete.utils import markup
+from git_machete.constants import STATUS_WATCH_POLL_INTERVAL_SECONDS
+from git_machete.git import AnyBranchName, AnyRevision, BranchPair, FullCommitHash, GitLogEntry, LocalBranchShortName, SyncToRemoteStatus
+from git_machete.utils import markup, terminal
 from git_machete.utils._subproc import PopenResult
 from git_machete.utils.cmd import popen_cmd
 from git_machete.utils.debug_log import debug
-from git_machete.utils.exceptions import MacheteException
-from git_machete.utils.markup import escape_markup, print_fmt, warn
+from git_machete.utils.exceptions import MacheteException, ParsableEnum
+from git_machete.utils.markup import escape_markup, print_fmt, strip_markup, warn
 from git_machete.utils.paths import Path, strip_longest_common_path_prefix
+from git_machete.utils.terminal import BasicTerminalAnsiOutputCodes, FullTerminalAnsiOutputCodes, is_terminal_fully_fledged
+
+_T = TypeVar("_T")
+
+# Set for the detached process that carries on with `status --prompt` once the time is up.
+_STATUS_PROMPT_DETACHED_ENV_VAR = "GIT_MACHETE_STATUS_PROMPT_DETACHED"
 
 
 class SyncToParentStatus(Enum):
@@ -27,6 +45,37 @@ class SyncToParentStatus(Enum):
     MERGED_TO_PARENT = auto()
 
 
+_EDGE_COLOR_TAG: Dict[SyncToParentStatus, str] = {
+    SyncToParentStatus.IN_SYNC: "green",
+    SyncToParentStatus.IN_SYNC_BUT_FORK_POINT_OFF: "yellow",
+    SyncToParentStatus.OUT_OF_SYNC: "red",
+    SyncToParentStatus.MERGED_TO_PARENT: "dim"
+}
+_EDGE_JUNCTION_CHAR: Dict[SyncToParentStatus, str] = {
+    SyncToParentStatus.IN_SYNC: "o",
+    SyncToParentStatus.IN_SYNC_BUT_FORK_POINT_OFF: "?",
+    SyncToParentStatus.OUT_OF_SYNC: "x",
+    SyncToParentStatus.MERGED_TO_PARENT: "m"
+}
+
+
+def _format_sync_to_remote_status(status: SyncToRemoteStatus, remote: Optional[str]) -> str:
+    return {
+        SyncToRemoteStatus.NO_REMOTES: "",
+        SyncToRemoteStatus.UNTRACKED: "<orange> (untracked)</orange>",
+        SyncToRemoteStatus.IN_SYNC_WITH_REMOTE: "",
+        SyncToRemoteStatus.BEHIND_REMOTE: f"<red> (behind <b>{remote}</b>)</red>",
+        SyncToRemoteStatus.AHEAD_OF_REMOTE: f"<red> (ahead of <b>{remote}</b>)</red>",
+        SyncToRemoteStatus.DIVERGED_FROM_AND_OLDER_THAN_REMOTE: f"<red> (diverged from & older than <b>{remote}</b>)</red>",
+        SyncToRemoteStatus.DIVERGED_FROM_AND_NEWER_THAN_REMOTE: f"<red> (diverged from <b>{remote}</b>)</red>",
+    }[status]
+
+
+class StatusFormat(ParsableEnum):
+    TEXT = auto()
+    JSON = auto()
+
+
 class StatusFlags(NamedTuple):
     """Options and display flags for status output."""
 
@@ -48,6 +97,13 @@ class StatusOngoingOperation(NamedTuple):
     is_revert_in_progress: bool
 
 
+class StatusTiming(NamedTuple):
+    """How long an evaluation took, and how many git processes it spawned."""
+
+    seconds: float
+    git_processes: int
+
+
 class StatusBranch(NamedTuple):
     """Per-branch data for status output (tree structure, sync state, commits, annotations)."""
 
@@ -55,10 +111,15 @@ class StatusBranch(NamedTuple):
     children: List[ManagedBranchName]
     sync_to_parent_status: SyncToParentStatus
     commits: List[Tuple[GitLogEntry, str]]
-    sync_status: str
+    sync_to_remote_status: SyncToRemoteStatus
+    # The remote that `sync_to_remote_status` refers to, if any.
+    remote: Optional[str]
     hook_output: str
     annotation: Optional[Annotation]
     worktree_label: Optional[str]
+    # `None` when the sync statuses are taken from the snapshot, or when there's no `machete-status-branch` hook, respectively.
+    sync_timing: Optional[StatusTiming]
+    hook_timing: Optional[StatusTiming]
 
 
 class StatusData(NamedTuple):
@@ -71,6 +132,17 @@ class StatusData(NamedTuple):
     branches_in_display_order: List[ManagedBranchName]
     roots: List[ManagedBranchName]
     ongoing_operation: StatusOngoingOperation
+    # The parts of evaluating sync statuses that are shared by all branches (like the inference of fork points), keyed by name;
+    # empty when the sync statuses are taken from the snapshot.
+    shared_sync_timing_by_phase: Dict[str, StatusTiming]
+
+
+class _BranchSyncStatuses(NamedTuple):
+    sync_to_parent_status: Dict[LocalBranchShortName, SyncToParentStatus]
+    commits_by_branch: Dict[LocalBranchShortName, List[Tuple[GitLogEntry, str]]]
+    sync_to_remote_status_by_branch: Dict[LocalBranchShortName, Tuple[SyncToRemoteStatus, Optional[str]]]
+    sync_timing_by_branch: Dict[LocalBranchShortName, StatusTiming]
+    shared_sync_timing_by_phase: Dict[str, StatusTiming]
 
 
 class StatusFormatOutput(NamedTuple):
@@ -94,121 +166,143 @@ class StatusMacheteClient(MacheteClient):
         When selected_branch is set, that branch's name (not annotation/sync status) is wrapped in reverse video.
         line_for_branch maps each branch to the 0-based line index in result where it appears."""
 
-        edge_color_tag: Dict[SyncToParentStatus, str] = {
-            SyncToParentStatus.IN_SYNC: "green",
-            SyncToParentStatus.IN_SYNC_BUT_FORK_POINT_OFF: "yellow",
-            SyncToParentStatus.OUT_OF_SYNC: "red",
-            SyncToParentStatus.MERGED_TO_PARENT: "dim"
-        }
-        edge_junction_char: Dict[SyncToParentStatus, str] = {
-            SyncToParentStatus.IN_SYNC: "o",
-            SyncToParentStatus.IN_SYNC_BUT_FORK_POINT_OFF: "?",
-            SyncToParentStatus.OUT_OF_SYNC: "x",
-            SyncToParentStatus.MERGED_TO_PARENT: "m"
-        }
         out = io.StringIO()
-        space = data.flags.maybe_space_before_branch_name
         line_for_branch: Dict[LocalBranchShortName, int] = {}
         line_index = 0
 
-        next_sibling_of_ancestor_by_branch: Dict[LocalBranchShortName, List[Optional[LocalBranchShortName]]] = {}
+        branches_with_next_sibling_of_ancestor = StatusMacheteClient._iterate_next_sibling_of_ancestor(
+            data.branches_in_display_order,
+            parent_of=lambda branch: data.branches[branch].parent,
+            children_of=lambda branch: data.branches[branch].children)
 
-        def prefix_dfs(parent: LocalBranchShortName, accumulated_path: List[Optional[LocalBranchShortName]]) -> None:
-            next_sibling_of_ancestor_by_branch[parent] = accumulated_path
-            children = data.branches[parent].children
-            if children:
-                shifted_children: List[Optional[LocalBranchShortName]] = children[1:]  # type: ignore[assignment]
-                for (v, nv) in zip(children, shifted_children + [None]):
-                    prefix_dfs(v, accumulated_path + [nv])
+        for branch, next_sibling_of_ancestor in branches_with_next_sibling_of_ancestor:
+            lines = StatusMacheteClient._format_status_lines_of_branch(
+                data, branch, next_sibling_of_ancestor, selected_branch=selected_branch)
+            out.write(lines)
+            line_index += lines.count("\n")
+            # The line with the branch name is always the last one.
+            line_for_branch[branch] = line_index - 1
 
-        for root in data.roots:
-            prefix_dfs(root, accumulated_path=[])
+        return StatusFormatOutput(result=out.getvalue(), line_for_branch=line_for_branch)
 
-        def write_line_prefix(
-            for_branch: LocalBranchShortName,
-            next_sibling_of_ancestor: List[Optional[LocalBranchShortName]],
-            suffix: str,
-        ) -> None:
+    @staticmethod
+    def _iterate_next_sibling_of_ancestor(
+            branches_in_display_order: List[ManagedBranchName],
+            *,
+            parent_of: Callable[[ManagedBranchName], Optional[LocalBranchShortName]],
+            children_of: Callable[[LocalBranchShortName], List[ManagedBranchName]]
+    ) -> Iterator[Tuple[ManagedBranchName, List[Optional[LocalBranchShortName]]]]:
+        """For each branch in display order, the next sibling (or `None`) of each of its non-root ancestors
+        and of the branch itself, top-down.
+        The very same list is yielded each time, updated in place as the walk moves from one branch to another,
+        so it's only valid until the next branch is yielded - that way, memory doesn't grow with the depth of the tree times its size."""
+        next_sibling_by_branch: Dict[LocalBranchShortName, Optional[LocalBranchShortName]] = {}
+        for branch in branches_in_display_order:
+            children = children_of(branch)
+            next_sibling_by_branch.update(zip(children, [*children[1:], None]))
 
-            out.write("  " + space)
-            for sibling in next_sibling_of_ancestor[:-1]:
-                if not sibling:
-                    out.write("  " + space)
-                else:
-                    tag = edge_color_tag[data.branches[sibling].sync_to_parent_status]
-                    out.write(f"<{tag}><vbar/> {space}</{tag}>")
-            tag = edge_color_tag[data.branches[for_branch].sync_to_parent_status]
-            out.write(f"<{tag}>{suffix}</{tag}>")
+        # Both stacks run from a root down to the most recently yielded branch; roots don't have an entry in the latter one.
+        ancestors: List[LocalBranchShortName] = []
+        next_sibling_of_ancestor: List[Optional[LocalBranchShortName]] = []
+        for branch in branches_in_display_order:
+            parent = parent_of(branch)
+            while ancestors and ancestors[-1] != parent:
+                ancestors.pop()
+            del next_sibling_of_ancestor[max(len(ancestors) - 1, 0):]
+            if parent is not None:
+                next_sibling_of_ancestor.append(next_sibling_by_branch[branch])
+            ancestors.append(branch)
+            yield branch, next_sibling_of_ancestor
 
-        for branch in data.branches_in_display_order:
-            b = data.branches[branch]
-            next_sibling_of_ancestor = next_sibling_of_ancestor_by_branch[branch]
-            if b.parent is not None:
-                write_line_prefix(branch, next_sibling_of_ancestor, "<vbar/>")
+    @staticmethod
+    def _format_status_lines_of_branch(
+        data: StatusData,
+        branch: LocalBranchShortName,
+        next_sibling_of_ancestor: List[Optional[LocalBranchShortName]],
+        *,
+        selected_branch: Optional[LocalBranchShortName] = None,
+    ) -> str:
+        """The lines of status output that belong to the given branch (edge and commits leading to it, then the branch itself).
+        Apart from the branch itself, only the entries of `data.branches` for `next_sibling_of_ancestor` are accessed."""
+
+        out = io.StringIO()
+        space = data.flags.maybe_space_before_branch_name
+
+        def get_edge_of_ancestor(sibling: Optional[LocalBranchShortName]) -> str:
+            if not sibling:
+                return "  " + space
+            tag = _EDGE_COLOR_TAG[data.branches[sibling].sync_to_parent_status]
+            return f"<{tag}><vbar/> {space}</{tag}>"
+
+        # Shared by all the lines of the branch, so only built once (it's as long as the branch is deep in the tree).
+        edges_of_ancestors = "  " + space + "".join(map(get_edge_of_ancestor, next_sibling_of_ancestor[:-1]))
+        edge_tag = _EDGE_COLOR_TAG[data.branches[branch].sync_to_parent_status]
+
+        def write_line_prefix(suffix: str) -> None:
+            out.write(f"{edges_of_ancestors}<{edge_tag}>{suffix}</{edge_tag}>")
+
+        b = data.branches[branch]
+        if b.parent is not None:
+            write_line_prefix("<vbar/>")
+            out.write("\n")
+            for commit, fp_suffix in b.commits:
+                write_line_prefix("<vbar/>")
+                subj = escape_markup(commit.subject)
+                out.write(
+                    f' {f"<dim>{commit.short_hash}</dim>  " if data.flags.opt_list_commits_with_hashes else ""}'
+                    f'<dim>{subj}</dim>{fp_suffix}\n'
+                )
+            junc_char = _EDGE_JUNCTION_CHAR[b.sync_to_parent_status]
+            next_sibling_of_branch: Optional[LocalBranchShortName] = next_sibling_of_ancestor[-1]
+            if next_sibling_of_branch and data.branches[next_sibling_of_branch].sync_to_parent_status == b.sync_to_parent_status:
+                unicode_junc = "├─"
+            else:
+                unicode_junc = "└─"
+            junction = f"<ifansi>{unicode_junc}<else>{junc_char}-</ifansi>"
+            write_line_prefix(junction + space)
+        else:
+            if branch != data.roots[0]:
                 out.write("\n")
-                line_index += 1
-                for commit, fp_suffix in b.commits:
-                    write_line_prefix(branch, next_sibling_of_ancestor, "<vbar/>")
-                    subj = escape_markup(commit.subject)
-                    out.write(
-                        f' {f"<dim>{commit.short_hash}</dim>  " if data.flags.opt_list_commits_with_hashes else ""}'
-                        f'<dim>{subj}</dim>{fp_suffix}\n'
-                    )
-                    line_index += 1
-                junc_char = edge_junction_char[b.sync_to_parent_status]
-                next_sibling_of_branch: Optional[LocalBranchShortName] = next_sibling_of_ancestor[-1]
-                if next_sibling_of_branch and data.branches[next_sibling_of_branch].sync_to_parent_status == b.sync_to_parent_status:
-                    unicode_junc = "├─"
-                else:
-                    unicode_junc = "└─"
-                junction = f"<ifansi>{unicode_junc}<else>{junc_char}-</ifansi>"
-                write_line_prefix(branch, next_sibling_of_ancestor, junction + space)
+            out.write("  " + space)
+
+        op = data.ongoing_operation
+        if branch in (op.currently_checked_out_branch, op.currently_rebased_branch, op.currently_bisected_branch):
+            if branch == op.currently_rebased_branch:
+                prefix = "REBASING "
+            elif branch == op.currently_bisected_branch:
+                prefix = "BISECTING "
+            elif op.is_am_in_progress:
+                prefix = "GIT AM IN PROGRESS "
+            elif op.is_cherry_pick_in_progress:
+                prefix = "CHERRY-PICKING "
+            elif op.is_merge_in_progress:
+                prefix = "MERGING "
+            elif op.is_revert_in_progress:
+                prefix = "REVERTING "
             else:
-                if branch != data.roots[0]:
-                    out.write("\n")
-                    line_index += 1
-                out.write("  " + space)
-
-            line_for_branch[branch] = line_index
-            op = data.ongoing_operation
-            if branch in (op.currently_checked_out_branch, op.currently_rebased_branch, op.currently_bisected_branch):
-                if branch == op.currently_rebased_branch:
-                    prefix = "REBASING "
-                elif branch == op.currently_bisected_branch:
-                    prefix = "BISECTING "
-                elif op.is_am_in_progress:
-                    prefix = "GIT AM IN PROGRESS "
-                elif op.is_cherry_pick_in_progress:
-                    prefix = "CHERRY-PICKING "
-                elif op.is_merge_in_progress:
-                    prefix = "MERGING "
-                elif op.is_revert_in_progress:
-                    prefix = "REVERTING "
-                else:
-                    prefix = ""
-                if prefix:
-                    current = f"<b><red>{prefix}</red></b><b><u>{branch}</u><ifansi><else> *</ifansi></b>"
-                else:
-                    current = f"<b><u>{branch}</u><ifansi><else> *</ifansi></b>"
+                prefix = ""
+            if prefix:
+                current = f"<b><red>{prefix}</red></b><b><u>{branch}</u><ifansi><else> *</ifansi></b>"
             else:
-                current = f"<b>{branch}</b>"
-
-            anno = ''
-            if b.annotation is not None and b.annotation.formatted_full_text:
-                anno = '  ' + b.annotation.formatted_full_text
+                current = f"<b><u>{branch}</u><ifansi><else> *</ifansi></b>"
+        else:
+            current = f"<b>{branch}</b>"
 
-            worktree_part = ''
-            if b.worktree_label is not None:
-                worktree_part = f" <green>[{escape_markup(b.worktree_label)}]</green>"
+        anno = ''
+        if b.annotation is not None and b.annotation.formatted_full_text:
+            anno = '  ' + b.annotation.formatted_full_text
 
-            if selected_branch is not None and branch == selected_branch:
-                current_part = f"<reverse>{current}</reverse>"
-            else:
-                current_part = current
-            out.write(f"{current_part}{anno}{worktree_part}{b.sync_status}{b.hook_output}\n")
-            line_index += 1
+        worktree_part = ''
+        if b.worktree_label is not None:
+            worktree_part = f" <green>[{escape_markup(b.worktree_label)}]</green>"
 
-        return StatusFormatOutput(result=out.getvalue(), line_for_branch=line_for_branch)
+        if selected_branch is not None and branch == selected_branch:
+            current_part = f"<reverse>{current}</reverse>"
+        else:
+            current_part = current
+        sync_status = _format_sync_to_remote_status(b.sync_to_remote_status, b.remote)
+        out.write(f"{current_part}{anno}{worktree_part}{sync_status}{b.hook_output}\n")
+        return out.getvalue()
 
     @staticmethod
     def _status_warning_message(data: StatusData) -> Optional[str]:
@@ -269,7 +363,134 @@ class StatusMacheteClient(MacheteClient):
 
     def compute_status_data(self, *, flags: StatusFlags) -> StatusData:
         managed_branches: List[ManagedBranchName] = self._state.managed_branches  # already returns a copy
+        return self.__assemble_status_data(flags, managed_branches, self.__get_branch_sync_statuses(flags, managed_branches))
+
+    def __assemble_status_data(
+            self, flags: StatusFlags, managed_branches: List[ManagedBranchName], sync_statuses: _BranchSyncStatuses) -> StatusData:
+        ongoing_operation = self.__get_status_ongoing_operation()
+
+        hook_path = self._git.get_hook_path("machete-status-branch")
+        hook_executable = self._git.check_hook_executable(hook_path)
+
+        hook_output_by_branch: Dict[LocalBranchShortName, Tuple[str, StatusTiming]] = \
+            self.__run_status_branch_hooks(hook_path, managed_branches) if hook_executable else {}
+
+        worktree_label_by_branch = self._compute_worktree_label_by_branch()
+
+        branches: Dict[LocalBranchShortName, StatusBranch] = {}
+        for branch in managed_branches:
+            sync_to_remote_status, remote = sync_statuses.sync_to_remote_status_by_branch[branch]
+            hook_output, hook_timing = hook_output_by_branch.get(branch, ("", None))
+            branches[branch] = StatusBranch(
+                parent=self._state.get_parent(branch),
+                children=self.children_of(branch) or [],
+                sync_to_parent_status=sync_statuses.sync_to_parent_status.get(branch, SyncToParentStatus.IN_SYNC),
+                commits=sync_statuses.commits_by_branch.get(branch, []),
+                sync_to_remote_status=sync_to_remote_status,
+                remote=remote,
+                hook_output=hook_output,
+                annotation=self._state.get_annotation(branch),
+                worktree_label=worktree_label_by_branch.get(branch),
+                sync_timing=sync_statuses.sync_timing_by_branch.get(branch),
+                hook_timing=hook_timing,
+            )
+
+        return StatusData(
+            flags=flags,
+            branches=branches,
+            branches_in_display_order=managed_branches,
+            roots=self._state.roots,  # property returns a copy
+            ongoing_operation=ongoing_operation,
+            shared_sync_timing_by_phase=sync_statuses.shared_sync_timing_by_phase,
+        )
+
+    def __get_status_ongoing_operation(self) -> StatusOngoingOperation:
+        return StatusOngoingOperation(
+            currently_bisected_branch=self._git.get_currently_bisected_branch_or_none(),
+            currently_rebased_branch=self._git.get_currently_rebased_branch_or_none(),
+            currently_checked_out_branch=self._git.get_currently_checked_out_branch_or_none(),
+            is_am_in_progress=self._git.is_am_in_progress(),
+            is_cherry_pick_in_progress=self._git.is_cherry_pick_in_progress(),
+            is_merge_in_progress=self._git.is_merge_in_progress(),
+            is_revert_in_progress=self._git.is_revert_in_progress(),
+        )
+
+    def __stream_status_data(self, flags: StatusFlags) -> StatusData:
+        """Prints the status line by line, each branch as soon as its own statuses and the statuses of the branches
+        that its edge prefix depends on (the next siblings of its ancestors) are known, rather than once all branches are evaluated.
+        Returns the complete data in the end, same as `compute_status_data`.
+
+        Branches are evaluated in such an order (children of each branch right after one another, before descending any further)
+        that the next siblings of the ancestors of each branch are evaluated before the branch itself.
+        `machete-status-branch` hooks, which don't depend on the sync statuses, are run alongside (see `machete.status.hookWorkers`)."""
+        managed_branches: List[ManagedBranchName] = self._state.managed_branches  # already returns a copy
+        data = StatusData(
+            flags=flags,
+            branches={},  # filled as the branches get evaluated
+            branches_in_display_order=managed_branches,
+            roots=self._state.roots,  # property returns a copy
+            ongoing_operation=self.__get_status_ongoing_operation(),
+            shared_sync_timing_by_phase={},  # filled once all branches are evaluated
+        )
+        branches_with_next_sibling_of_ancestor = self._iterate_next_sibling_of_ancestor(
+            managed_branches, parent_of=self._state.get_parent, children_of=lambda branch: self.children_of(branch) or [])
+        # The next branch to print (`None` once all are printed), along with the next siblings of its ancestors.
+        next_to_print = next(branches_with_next_sibling_of_ancestor, None)
+        worktree_label_by_branch = self._compute_worktree_label_by_branch()
+
+        hook_path = self._git.get_hook_path("machete-status-branch")
+        hook_cache: Optional[StatusHookCache] = None
+        hook_outputs: Iterator[Tuple[str, Optional[StatusTiming]]] = itertools.repeat(("", None))
+        if self._git.check_hook_executable(hook_path):
+            run_hook, hook_cache = self.__get_status_branch_hook_runner(hook_path)
+            hook_outputs = self.__evaluate_for_each_branch_lazily(
+                self.__timed(run_hook), managed_branches, workers=self._config.status_hook_workers(), thread_name_prefix="git-machete-hook")
+
+        evaluation_order: List[ManagedBranchName] = list(data.roots)
+        for branch in managed_branches:
+            evaluation_order += self.children_of(branch) or []
+
+        def on_branch_evaluated(branch: ManagedBranchName, sync_statuses: _BranchSyncStatuses) -> None:
+            nonlocal next_to_print
+            sync_to_remote_status, remote = sync_statuses.sync_to_remote_status_by_branch[branch]
+            data.branches[branch] = StatusBranch(
+                parent=self._state.get_parent(branch),
+                children=self.children_of(branch) or [],
+                sync_to_parent_status=sync_statuses.sync_to_parent_status.get(branch, SyncToParentStatus.IN_SYNC),
+                commits=[],
+                sync_to_remote_status=sync_to_remote_status,
+                remote=remote,
+                hook_output="",  # filled in just before printing, in display order
+                annotation=self._state.get_annotation(branch),
+                worktree_label=worktree_label_by_branch.get(branch),
+                sync_timing=sync_statuses.sync_timing_by_branch[branch],
+                hook_timing=None,
+            )
+            while next_to_print is not None:
+                next_branch, next_sibling_of_ancestor = next_to_print
+                if any(b not in data.branches for b in [next_branch, *next_sibling_of_ancestor] if b is not None):
+                    return
+                hook_output, hook_timing = next(hook_outputs)
+                data.branches[next_branch] = data.branches[next_branch]._replace(hook_output=hook_output, hook_timing=hook_timing)
+                print_fmt(self._format_status_lines_of_branch(data, next_branch, next_sibling_of_ancestor), newline=False)
+                next_to_print = next(branches_with_next_sibling_of_ancestor, None)
+
+        sync_statuses = self.__compute_branch_sync_statuses(flags, evaluation_order, on_branch_evaluated=on_branch_evaluated)
+        data.shared_sync_timing_by_phase.update(sync_statuses.shared_sync_timing_by_phase)
+        if hook_cache:
+            hook_cache.save()
+        return data
 
+    def __compute_branch_sync_statuses(
+            self,
+            flags: StatusFlags,
+            managed_branches: List[ManagedBranchName],
+            *,
+            on_branch_evaluated: Optional[Callable[[ManagedBranchName, _BranchSyncStatuses], None]] = None
+    ) -> _BranchSyncStatuses:
+        """`on_branch_evaluated` is called (on the calling thread) for each branch, in the order of `managed_branches`,
+        as soon as its sync-to-parent and sync-to-remote statuses are known - without waiting for the remaining branches.
+        The statuses passed along are only complete up to that branch, and don't include the listed commits yet."""
         sync_to_parent_status: Dict[LocalBranchShortName, SyncToParentStatus] = {}
         fork_point_hash_cached: Dict[LocalBranchShortName, Optional[FullCommitHash]] = {}
         fork_point_branches_cached: Dict[LocalBranchShortName, List[BranchPair]] = {}
@@ -283,68 +504,99 @@ class StatusMacheteClient(MacheteClient):
                     fork_point_hash_cached[for_branch], fork_point_branches_cached[for_branch] = None, []
             return fork_point_hash_cached[for_branch]
 
-        for branch in managed_branches:
+        def compute_sync_to_parent_status(branch: LocalBranchShortName) -> Optional[SyncToParentStatus]:
             parent_branch = self._state.get_parent(branch)
             if parent_branch is None:
-                continue
+                return None
             if self.is_merged_to(
                     branch=branch,
                     parent=parent_branch,
                     opt_squash_merge_detection=flags.opt_squash_merge_detection):
-                sync_to_parent_status[branch] = SyncToParentStatus.MERGED_TO_PARENT
+                return SyncToParentStatus.MERGED_TO_PARENT
             elif not self._git.is_ancestor_or_equal(parent_branch.full_name(), branch.full_name()):
-                sync_to_parent_status[branch] = SyncToParentStatus.OUT_OF_SYNC
+                return SyncToParentStatus.OUT_OF_SYNC
             elif self._get_overridden_fork_point(branch):
-                sync_to_parent_status[branch] = SyncToParentStatus.IN_SYNC
+                return SyncToParentStatus.IN_SYNC
             else:
                 fp = fork_point_hash(branch)
                 # `fork_point_hash` only returns None when `fork_point_and_inferring_branch_pairs` raises
                 # `MacheteException`, which in turn requires reflog inference to fail AND one of:
                 # parent is missing, parent commit is unresolvable, or parent is not an ancestor of branch
                 # with no common merge-base (unrelated histories). All of these are ruled out by reaching
-                # this branch: parent exists (the early `continue` above) and parent is an ancestor of branch
+                # this branch: parent exists (the early `return` above) and parent is an ancestor of branch
                 # (the preceding `elif` would have classified it as OUT_OF_SYNC otherwise).
                 assert fp is not None
                 if self._git.get_commit_hash_by_revision(parent_branch) == fp:
-                    sync_to_parent_status[branch] = SyncToParentStatus.IN_SYNC
+                    return SyncToParentStatus.IN_SYNC
                 elif self._is_fork_point_inferred_by_parent_remote_counterpart(
                         parent_branch=parent_branch,
                         inferring_branches=fork_point_branches_cached[branch]):
-                    sync_to_parent_status[branch] = SyncToParentStatus.IN_SYNC
+                    return SyncToParentStatus.IN_SYNC
                 else:
-                    sync_to_parent_status[branch] = SyncToParentStatus.IN_SYNC_BUT_FORK_POINT_OFF
+                    return SyncToParentStatus.IN_SYNC_BUT_FORK_POINT_OFF
 
-        currently_bisected_branch = self._git.get_currently_bisected_branch_or_none()
-        currently_rebased_branch = self._git.get_currently_rebased_branch_or_none()
-        currently_checked_out_branch = self._git.get_currently_checked_out_branch_or_none()
+        def compute_sync_statuses(
+                branch: LocalBranchShortName) -> Tuple[Optional[SyncToParentStatus], Tuple[SyncToRemoteStatus, Optional[str]]]:
+            return compute_sync_to_parent_status(branch), self._git.get_combined_remote_sync_status(branch)
 
-        hook_path = self._git.get_hook_path("machete-status-branch")
-        hook_executable = self._git.check_hook_executable(hook_path)
+        with self._batching_fork_point_cache_writes():
+            # The warm-ups populate the caches shared by all branches, so that what remains to be evaluated for each branch
+            # is independent of the other branches (and can be fanned out over threads, see `__evaluate_for_each_branch_lazily`).
+            shared_sync_timing_by_phase: Dict[str, StatusTiming] = {}
+            stop_timing = self.__start_timing()
+            self._warm_up_squash_merge_detection_to_parents(opt_squash_merge_detection=flags.opt_squash_merge_detection)
+            shared_sync_timing_by_phase["squash_merge_detection"] = stop_timing()
+            stop_timing = self.__start_timing()
+            self._warm_up_fork_points([branch for branch in managed_branches if self._state.has_parent(branch)])
+            shared_sync_timing_by_phase["fork_points"] = stop_timing()
+            commits_by_branch: Dict[LocalBranchShortName, List[Tuple[GitLogEntry, str]]] = {}
+            statuses = _BranchSyncStatuses(
+                sync_to_parent_status=sync_to_parent_status,
+                commits_by_branch=commits_by_branch,
+                sync_to_remote_status_by_branch={},
+                sync_timing_by_branch={},
+                shared_sync_timing_by_phase=shared_sync_timing_by_phase)
+            for branch, ((branch_sync_to_parent_status, sync_to_remote_status), timing) in \
+                    zip(managed_branches, self.__evaluate_for_each_branch_lazily(
+                        self.__timed(compute_sync_statuses), managed_branches,
+                        workers=self._config.status_workers(), thread_name_prefix="git-machete-status")):
+                if branch_sync_to_parent_status is not None:
+                    sync_to_parent_status[branch] = branch_sync_to_parent_status
+                statuses.sync_to_remote_status_by_branch[branch] = sync_to_remote_status
+                statuses.sync_timing_by_branch[branch] = timing
+                if on_branch_evaluated is not None:
+                    on_branch_evaluated(branch, statuses)
 
-        commits_by_branch: Dict[LocalBranchShortName, List[Tuple[GitLogEntry, str]]] = {}
-        if flags.opt_list_commits:
-            for branch in managed_branches:
-                if not self._state.has_parent(branch):
-                    continue
-                fork_point = fork_point_hash(branch)
-                if not fork_point:
-                    commits: List[Tuple[GitLogEntry, str]] = []
-                elif sync_to_parent_status[branch] == SyncToParentStatus.MERGED_TO_PARENT:
-                    commits = []
-                elif sync_to_parent_status[branch] == SyncToParentStatus.OUT_OF_SYNC:
-                    # For red edges the branch has diverged from its parent: there is no clean linear
-                    # `parent..branch` range. List only the commits unique to the branch
-                    # (`fork_point..branch`, exclusive). The fork point itself is not shown, so no
-                    # `-> fork point` marker is needed.
-                    raw_commits = self._git.get_commits_between(fork_point, branch.full_name())
-                    commits = [(commit, '') for commit in raw_commits]
-                else:
-                    parent = self._state.get_parent(branch)
-                    assert parent is not None
-                    raw_commits = self._git.get_commits_between(parent.full_name(), branch.full_name())
+            if flags.opt_list_commits:
+                stop_timing = self.__start_timing()
+                # Commit ranges of all branches are listed at once (see `Git.get_commits_between_many`), and only then formatted.
+                commit_range_by_branch: Dict[ManagedBranchName, Tuple[AnyRevision, AnyRevision]] = {}
+                for branch in managed_branches:
+                    if not self._state.has_parent(branch):
+                        continue
+                    fork_point = fork_point_hash(branch)
+                    if not fork_point or sync_to_parent_status[branch] == SyncToParentStatus.MERGED_TO_PARENT:
+                        commits_by_branch[branch] = []
+                    elif sync_to_parent_status[branch] == SyncToParentStatus.OUT_OF_SYNC:
+                        # For red edges the branch has diverged from its parent: there is no clean linear
+                        # `parent..branch` range. List only the commits unique to the branch
+                        # (`fork_point..branch`, exclusive). The fork point itself is not shown, so no
+                        # `-> fork point` marker is needed.
+                        commit_range_by_branch[branch] = (fork_point, branch.full_name())
+                    else:
+                        parent = self._state.get_parent(branch)
+                        assert parent is not None
+                        commit_range_by_branch[branch] = (parent.full_name(), branch.full_name())
+
+                for branch, raw_commits in zip(commit_range_by_branch,
+                                               self._git.get_commits_between_many(list(commit_range_by_branch.values()))):
+                    if sync_to_parent_status[branch] == SyncToParentStatus.OUT_OF_SYNC:
+                        commits_by_branch[branch] = [(commit, '') for commit in raw_commits]
+                        continue
+                    fork_point = fork_point_hash(branch)
                     is_fork_point_off = \
                         sync_to_parent_status[branch] == SyncToParentStatus.IN_SYNC_BUT_FORK_POINT_OFF
-                    commits = []
+                    commits: List[Tuple[GitLogEntry, str]] = []
                     for commit in raw_commits:
                         if commit.hash != fork_point:
                             fp_suffix = ''
@@ -369,65 +621,149 @@ class StatusMacheteClient(MacheteClient):
                                 # (a fallback-to-parent fork point equals the parent hash, so it never appears in `parent..branch`).
                                 fp_suffix = f' {marker}: overridden'
                         commits.append((commit, fp_suffix))
-                commits_by_branch[branch] = commits
+                    commits_by_branch[branch] = commits
+                shared_sync_timing_by_phase["list_commits"] = stop_timing()
 
-        sync_status_by_branch: Dict[LocalBranchShortName, str] = {}
-        hook_output_by_branch: Dict[LocalBranchShortName, str] = {}
-        for branch in managed_branches:
-            s, remote = self._git.get_combined_remote_sync_status(branch)
-            sync_status_by_branch[branch] = {
-                SyncToRemoteStatus.NO_REMOTES: "",
-                SyncToRemoteStatus.UNTRACKED: "<orange> (untracked)</orange>",
-                SyncToRemoteStatus.IN_SYNC_WITH_REMOTE: "",
-                SyncToRemoteStatus.BEHIND_REMOTE: f"<red> (behind <b>{remote}</b>)</red>",
-                SyncToRemoteStatus.AHEAD_OF_REMOTE: f"<red> (ahead of <b>{remote}</b>)</red>",
-                SyncToRemoteStatus.DIVERGED_FROM_AND_OLDER_THAN_REMOTE: f"<red> (diverged from & older than <b>{remote}</b>)</red>",
-                SyncToRemoteStatus.DIVERGED_FROM_AND_NEWER_THAN_REMOTE: f"<red> (diverged from <b>{remote}</b>)</red>",
-            }[SyncToRemoteStatus(s)]
-
-            hook_output = ""
-            if hook_executable:
-                debug(f"running machete-status-branch hook ({hook_path}) for branch {branch}")
-                hook_env = dict(os.environ, ASCII_ONLY=str(not markup.use_ansi_escapes_in_stdout).lower())
-                status_code, stdout, stderr = self._popen_hook(
-                    hook_path, branch, cwd=self._git.get_current_worktree_root_dir(), env=hook_env)
-                if status_code == 0 and not stdout.isspace():
-                    hook_output = "  " + escape_markup(stdout.replace('\n', ' ').rstrip())
-                else:
-                    debug(f"machete-status-branch hook ({hook_path}) for branch {branch} "
-                          f"returned {status_code}; stdout: '{stdout}'; stderr: '{stderr}'")
-            hook_output_by_branch[branch] = hook_output
+        return statuses
 
-        worktree_label_by_branch = self._compute_worktree_label_by_branch()
+    def __get_branch_sync_statuses(
+            self, flags: StatusFlags, managed_branches: List[ManagedBranchName]) -> _BranchSyncStatuses:
+        """With `machete.status.snapshotCache` enabled, the statuses computed by the most recent `status`
+        are reused as long as none of their inputs has changed (see `__get_status_snapshot_key_digest`)."""
+        key_digest = self.__get_status_snapshot_key_digest(flags, managed_branches) if self._config.status_snapshot_cache() else None
+        if key_digest is None:
+            return self.__compute_branch_sync_statuses(flags, managed_branches)
+        cache = StatusSnapshotCache(self._git.get_main_worktree_git_subpath("machete-status-snapshot"))
+        cached_statuses = cache.get(key_digest=key_digest)
+        if cached_statuses is not None:
+            debug("sync statuses taken from status snapshot")
+            return _BranchSyncStatuses(
+                sync_to_parent_status={LocalBranchShortName.of(b): SyncToParentStatus[status.sync_to_parent_status]
+                                       for b, status in cached_statuses.items() if status.sync_to_parent_status},
+                commits_by_branch={LocalBranchShortName.of(b): status.commits for b, status in cached_statuses.items()},
+                sync_to_remote_status_by_branch={
+                    LocalBranchShortName.of(b): (SyncToRemoteStatus[status.sync_to_remote_status], status.remote or None)
+                    for b, status in cached_statuses.items()},
+                sync_timing_by_branch={},
+                shared_sync_timing_by_phase={})
+        statuses = self.__compute_branch_sync_statuses(flags, managed_branches)
+        cache.put(key_digest=key_digest, statuses={
+            branch: CachedBranchStatus(
+                sync_to_parent_status=statuses.sync_to_parent_status[branch].name if branch in statuses.sync_to_parent_status else "",
+                sync_to_remote_status=statuses.sync_to_remote_status_by_branch[branch][0].name,
+                remote=statuses.sync_to_remote_status_by_branch[branch][1] or "",
+                commits=statuses.commits_by_branch.get(branch, []))
+            for branch in managed_branches})
+        return statuses
 
-        branches: Dict[LocalBranchShortName, StatusBranch] = {}
-        for branch in managed_branches:
-            branches[branch] = StatusBranch(
-                parent=self._state.get_parent(branch),
-                children=self.children_of(branch) or [],
-                sync_to_parent_status=sync_to_parent_status.get(branch, SyncToParentStatus.IN_SYNC),
-                commits=commits_by_branch.get(branch, []),
-                sync_status=sync_status_by_branch[branch],
-                hook_output=hook_output_by_branch[branch],
-                annotation=self._state.get_annotation(branch),
-                worktree_label=worktree_label_by_branch.get(branch),
-            )
+    def __get_status_snapshot_key_digest(self, flags: StatusFlags, managed_branches: List[ManagedBranchName]) -> Optional[str]:
+        """Sums up everything that the sync statuses (and the listed commits) depend on:
+        the tree of branches, all branches (local and remote) along with the sizes of their reflogs (for fork point inference),
+        and the entire git config (upstreams, fork point overrides and so on).
+        `None` if the reflogs can't be cheaply checked (with the reftable ref backend)."""
+        key = [__version__, str(flags.opt_list_commits), str(flags.opt_list_commits_with_hashes), flags.opt_squash_merge_detection.name]
+        key += [f"{branch} {self._state.get_parent(branch) or ''}" for branch in managed_branches]
+        for branch in [b.full_name() for b in self._git.get_local_branches()] + [b.full_name() for b in self._git.get_remote_branches()]:
+            reflog_path = self._git.get_reflog_file_path_or_none(branch)
+            if reflog_path is None:
+                return None
+            reflog_size = os.path.getsize(reflog_path) if os.path.isfile(reflog_path) else -1
+            key.append(f"{branch} {self._git.get_commit_hash_by_revision(branch)} {reflog_size}")
+        key += [f"{k}={v}" for k, v in sorted(self._git.get_all_config_attrs().items())]
+        return hashlib.sha1("\n".join(key).encode("utf-8")).hexdigest()
 
-        return StatusData(
-            flags=flags,
-            branches=branches,
-            branches_in_display_order=managed_branches,
-            roots=self._state.roots,  # property returns a copy
-            ongoing_operation=StatusOngoingOperation(
-                currently_bisected_branch=currently_bisected_branch,
-                currently_rebased_branch=currently_rebased_branch,
-                currently_checked_out_branch=currently_checked_out_branch,
-                is_am_in_progress=self._git.is_am_in_progress(),
-                is_cherry_pick_in_progress=self._git.is_cherry_pick_in_progress(),
-                is_merge_in_progress=self._git.is_merge_in_progress(),
-                is_revert_in_progress=self._git.is_revert_in_progress(),
-            ),
-        )
+    def __evaluate_for_each_branch(
+            self, evaluate: Callable[[LocalBranchShortName], _T], branches: Sequence[LocalBranchShortName], *,
+            workers: int, thread_name_prefix: str) -> List[_T]:
+        return list(self.__evaluate_for_each_branch_lazily(evaluate, branches, workers=workers, thread_name_prefix=thread_name_prefix))
+
+    @staticmethod
+    def __evaluate_for_each_branch_lazily(
+            evaluate: Callable[[LocalBranchShortName], _T], branches: Sequence[LocalBranchShortName], *,
+            workers: int, thread_name_prefix: str) -> Iterator[_T]:
+        """With more than 1 worker, the evaluations are fanned out over a pool of threads.
+        Most of the time of each evaluation is spent waiting for subprocesses (git or hooks), which doesn't hold the GIL.
+        Either way, the results are yielded in the order of `branches`, each one as soon as it's ready."""
+        workers = min(workers, len(branches))
+        if workers <= 1:
+            yield from (evaluate(branch) for branch in branches)
+            return
+        debug(f"evaluating {len(branches)} branches with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix) as executor:
+            yield from executor.map(evaluate, branches)
+
+    def __start_timing(self) -> Callable[[], StatusTiming]:
+        """Returns a function giving the timing since the call. Unlike `__timed`, counts the git processes spawned by all threads,
+        since the parts shared by all branches are done before (or after) evaluating the branches on their own."""
+        start_seconds = time.perf_counter()
+        start_git_processes = self._git.get_git_process_count()
+
+        def stop_timing() -> StatusTiming:
+            return StatusTiming(
+                seconds=time.perf_counter() - start_seconds,
+                git_processes=self._git.get_git_process_count() - start_git_processes)
+        return stop_timing
+
+    def __timed(self, evaluate: Callable[[LocalBranchShortName], _T]) -> Callable[[LocalBranchShortName], Tuple[_T, StatusTiming]]:
+        """Git processes are counted on the thread that runs the evaluation, so that the ones spawned alongside
+        for other branches (with `machete.status.workers`) aren't included.
+        Whatever is cached by the git client on the way is only counted for the branch that happened to need it first."""
+        def timed_evaluate(branch: LocalBranchShortName) -> Tuple[_T, StatusTiming]:
+            start_seconds = time.perf_counter()
+            start_git_processes = self._git.get_git_process_count(of_current_thread=True)
+            result = evaluate(branch)
+            return result, StatusTiming(
+                seconds=time.perf_counter() - start_seconds,
+                git_processes=self._git.get_git_process_count(of_current_thread=True) - start_git_processes)
+        return timed_evaluate
+
+    def __run_status_branch_hooks(
+            self, hook_path: Path, branches: Sequence[LocalBranchShortName]) -> Dict[LocalBranchShortName, Tuple[str, StatusTiming]]:
+        """The hooks are run over a pool of `machete.status.hookWorkers` threads (separate from `machete.status.workers`),
+        each one for at most `machete.status.hookTimeout` seconds.
+        With `machete.status.hookCacheTtl` set, their outputs are reused across runs."""
+        run_hook, cache = self.__get_status_branch_hook_runner(hook_path)
+        hook_outputs = self.__evaluate_for_each_branch(
+            self.__timed(run_hook), branches, workers=self._config.status_hook_workers(), thread_name_prefix="git-machete-hook")
+        if cache:
+            cache.save()
+        return dict(zip(branches, hook_outputs))
+
+    def __get_status_branch_hook_runner(self, hook_path: Path) -> Tuple[Callable[[LocalBranchShortName], str], Optional[StatusHookCache]]:
+        ascii_only = str(not markup.use_ansi_escapes_in_stdout).lower()
+        hook_env = dict(os.environ, ASCII_ONLY=ascii_only)
+        cwd = self._git.get_current_worktree_root_dir()
+        timeout = self._config.status_hook_timeout()
+        cache_ttl = self._config.status_hook_cache_ttl()
+        cache = StatusHookCache(self._git.get_main_worktree_git_subpath("machete-status-hook-cache"),
+                                existing_branches=self._git.get_local_branches(), ttl_seconds=cache_ttl,
+                                now=int(time.time())) if cache_ttl else None
+        hook_mtime = os.stat(hook_path).st_mtime_ns
+
+        def run_hook(branch: LocalBranchShortName) -> str:
+            # The output might depend on whether ANSI escapes are allowed, and on the worktree the hook is run in.
+            key = [self._git.get_commit_hash_by_revision(branch) or "", str(hook_mtime), ascii_only, cwd]
+            key_digest = hashlib.sha1("\t".join(key).encode("utf-8")).hexdigest()
+            cached_output = cache.get(branch=branch, key_digest=key_digest) if cache else None
+            if cached_output is not None:
+                debug(f"output of machete-status-branch hook for branch {branch} taken from cache")
+                return "  " + escape_markup(cached_output)
+            debug(f"running machete-status-branch hook ({hook_path}) for branch {branch}")
+            try:
+                status_code, stdout, stderr = self._popen_hook(hook_path, branch, cwd=cwd, env=hook_env, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                debug(f"machete-status-branch hook ({hook_path}) for branch {branch} timed out after {timeout} seconds")
+                return ""
+            if status_code == 0 and not stdout.isspace():
+                output = stdout.replace('\n', ' ').rstrip()
+                if cache:
+                    cache.put(branch=branch, key_digest=key_digest, output=output)
+                return "  " + escape_markup(output)
+            debug(f"machete-status-branch hook ({hook_path}) for branch {branch} "
+                  f"returned {status_code}; stdout: '{stdout}'; stderr: '{stderr}'")
+            return ""
+
+        return run_hook, cache
 
     def status(
             self,
@@ -437,24 +773,346 @@ class StatusMacheteClient(MacheteClient):
             opt_list_commits_with_hashes: bool,
             opt_squash_merge_detection: Optional[SquashMergeDetection]
     ) -> None:
+        flags = self.__get_status_flags(
+            opt_list_commits=opt_list_commits,
+            opt_list_commits_with_hashes=opt_list_commits_with_hashes,
+            opt_squash_merge_detection=opt_squash_merge_detection)
+        if flags.opt_list_commits or self._config.status_snapshot_cache():
+            # Commits of all branches are listed at once (see `Git.get_commits_between_many`),
+            # and the snapshot is only stored (or reused) for all branches together, so there's nothing to stream.
+            data = self.compute_status_data(flags=flags)
+            print_fmt(self.format_status_output(data).result, newline=False)
+        else:
+            data = self.__stream_status_data(flags)
+        # The warning is only printed below the tree anyway, so it doesn't hold up the streaming.
+        if warn_when_branch_in_sync_but_fork_point_off:
+            warning_msg = self._status_warning_message(data)
+            if warning_msg is not None:
+                print("", file=sys.stderr)
+                warn(warning_msg)
+
+    def status_json(
+            self,
+            *,
+            opt_list_commits: bool,
+            opt_list_commits_with_hashes: bool,
+            opt_squash_merge_detection: Optional[SquashMergeDetection]
+    ) -> None:
+        """Prints the status as a single JSON document (see `format_status_json`), with no warnings."""
+        flags = self.__get_status_flags(
+            opt_list_commits=opt_list_commits,
+            opt_list_commits_with_hashes=opt_list_commits_with_hashes,
+            opt_squash_merge_detection=opt_squash_merge_detection)
+        stop_timing = self.__start_timing()
+        data = self.compute_status_data(flags=flags)
+        timing = stop_timing()
+        # Deliberately not `print_fmt`, since the output is no markup (and must stay intact regardless of `--color`).
+        print(self.format_status_json(data, timing=timing))
+
+    @staticmethod
+    def format_status_json(data: StatusData, *, timing: StatusTiming) -> str:
+        """Branches are listed in the same order as in `status`, with all texts stripped of styling.
+        `timing` covers the entire computation; the timing of each branch only covers the evaluation of its own sync statuses
+        (and its `machete-status-branch` hook), while the work shared by all branches, like the inference of fork points,
+        is timed separately in `timing.shared`."""
+
+        def timing_to_json(branch_timing: Optional[StatusTiming]) -> Optional[Dict[str, Any]]:
+            if branch_timing is None:
+                return None
+            return {"seconds": round(branch_timing.seconds, 6), "git_processes": branch_timing.git_processes}
+
+        branches: List[Dict[str, Any]] = []
+        for branch in data.branches_in_display_order:
+            b = data.branches[branch]
+            commits: Optional[List[Dict[str, Any]]] = None
+            if data.flags.opt_list_commits:
+                commits = [{
+                    "hash": commit.hash,
+                    "short_hash": commit.short_hash,
+                    "subject": commit.subject,
+                    "fork_point": strip_markup(fp_suffix).strip() or None,
+                } for commit, fp_suffix in b.commits]
+            annotation = b.annotation.unformatted_full_text if b.annotation is not None else ""
+            branches.append({
+                "name": branch,
+                "parent": b.parent,
+                "children": b.children,
+                "sync_to_parent_status": b.sync_to_parent_status.name.lower() if b.parent is not None else None,
+                "sync_to_remote_status": b.sync_to_remote_status.name.lower(),
+                "remote": b.remote,
+                "commits": commits,
+                "annotation": annotation or None,
+                "worktree": b.worktree_label,
+                "hook_output": strip_markup(b.hook_output).strip() or None,
+                "timing": {"sync_statuses": timing_to_json(b.sync_timing), "hook": timing_to_json(b.hook_timing)},
+            })
+        return json.dumps({
+            "roots": data.roots,
+            "branches": branches,
+            "ongoing_operation": data.ongoing_operation._asdict(),
+            "timing": {
+                "seconds": round(timing.seconds, 6),
+                "git_processes": timing.git_processes,
+                "shared": {phase: timing_to_json(phase_timing) for phase, phase_timing in data.shared_sync_timing_by_phase.items()},
+            },
+        }, indent=2)
+
+    def prompt_status(self, *, opt_squash_merge_detection: Optional[SquashMergeDetection]) -> None:
+        """Prints a single line for embedding into a shell prompt: the edge leading to the current branch
+        (same characters and colors as in `status`) and the sync of the branch to its remote counterpart.
+        Prints nothing if the current branch isn't managed (or `HEAD` is detached).
+
+        The fork point isn't inferred, since that would require reading the reflogs of all branches - hence no yellow edges.
+        Unless taken from the cache, the line is computed within `machete.status.promptTimeout` seconds;
+        once the time is up, the most recent line for the branch is printed instead (marked as outdated), if any,
+        and the computation is carried on by a detached git-machete process, so that the next prompt can be taken from the cache."""
+        branch = self._git.get_currently_checked_out_branch_or_none()
+        if branch is None or not self._state.is_managed(branch):
+            return
+        # CLI flag > `machete.squashMergeDetection` config key > built-in `SIMPLE` default - see `CommandLineOptions`.
+        if opt_squash_merge_detection is None:
+            opt_squash_merge_detection = self._config.squash_merge_detection()
+        parent = self._state.get_parent(branch)
+        key = [__version__, opt_squash_merge_detection.name]
+        for b in (branch, parent, self._git.get_combined_counterpart_for_fetching_of_branch(branch)):
+            key.append(f"{b} {self._git.get_commit_hash_by_revision(b)}" if b else "")
+        key_digest = hashlib.sha1("\n".join(key).encode("utf-8")).hexdigest()
+        cache = StatusPromptCache(self._git.get_main_worktree_git_subpath("machete-status-prompt-cache"),
+                                  existing_branches=self._git.get_local_branches())
+        cached = cache.get(branch=branch)
+        if cached is not None and cached.key_digest == key_digest:
+            debug(f"status prompt of {branch} taken from cache")
+            print_fmt(cached.output)
+            return
+        if os.environ.get(_STATUS_PROMPT_DETACHED_ENV_VAR):
+            # No one waits for the output anymore, just for the cache to get filled.
+            with cache.computing_lock() as is_locked:
+                if is_locked:
+                    cache.put(branch=branch, key_digest=key_digest, output=self._compute_status_prompt(
+                        branch, parent=parent, opt_squash_merge_detection=opt_squash_merge_detection))
+                else:
+                    debug("another detached process is already computing the status prompt")
+            return
+
+        outcome: List[Union[str, Exception]] = []
+
+        def compute() -> None:
+            try:
+                outcome.append(self._compute_status_prompt(branch, parent=parent, opt_squash_merge_detection=opt_squash_merge_detection))
+            except Exception as e:  # re-raised on the calling thread
+                outcome.append(e)
+
+        # A daemon thread doesn't hold up the exit of git-machete once the time is up.
+        # It's then abandoned halfway through, hence it must not write to any persistent cache on its own.
+        self._git.defer_persistent_cache_writes()
+        thread = threading.Thread(target=compute, name="git-machete-status-prompt", daemon=True)
+        thread.start()
+        thread.join(timeout=self._config.status_prompt_timeout())
+        if outcome:
+            self._git.write_deferred_persistent_caches()
+            if isinstance(outcome[0], Exception):
+                raise outcome[0]
+            cache.put(branch=branch, key_digest=key_digest, output=outcome[0])
+            print_fmt(outcome[0])
+            return
+        if cached is not None:
+            debug(f"status prompt of {branch} timed out, falling back to the most recent one")
+            print_fmt(f"{cached.output}<dim> (outdated)</dim>")
+        else:
+            debug(f"status prompt of {branch} timed out")
+            print_fmt(f"<b>{branch}</b><dim> (unknown)</dim>")
+        with cache.computing_lock() as is_locked:
+            is_already_computing = not is_locked
+        if is_already_computing:
+            debug("a detached process is already computing the status prompt")
+        else:
+            self._spawn_detached_status_prompt(opt_squash_merge_detection)
+
+    @staticmethod
+    def _spawn_detached_status_prompt(squash_merge_detection: SquashMergeDetection) -> None:  # pragma: no cover; always mocked in tests
+        """Carries on with `status --prompt` in a separate git-machete process, run with the same interpreter,
+        which only fills the cache (see `_STATUS_PROMPT_DETACHED_ENV_VAR`)."""
+        env = dict(os.environ)
+        env[_STATUS_PROMPT_DETACHED_ENV_VAR] = "1"
+        args = [sys.executable, "-m", "git_machete",
+                "status", "--prompt", f"--squash-merge-detection={squash_merge_detection.name.lower()}"]
+        debug(f"spawning a detached {' '.join(args)}")
+        try:
+            if sys.platform == "win32":  # pragma: no cover; we don't collect coverage on Windows due to poor performance
+                subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+                                 creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP)
+            else:
+                # A session of its own, so that the process isn't affected by the signals sent to the shell's foreground process group.
+                subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+                                 start_new_session=True)
+        except OSError as e:  # pragma: no cover; the cache is just an optimization
+            debug(f"cannot spawn a detached git-machete process: {e}")
+
+    def _compute_status_prompt(
+            self,
+            branch: LocalBranchShortName,
+            *,
+            parent: Optional[LocalBranchShortName],
+            opt_squash_merge_detection: SquashMergeDetection
+    ) -> str:
+        edge = ""
+        if parent is not None:
+            if self.is_merged_to(branch=branch, parent=parent, opt_squash_merge_detection=opt_squash_merge_detection):
+                sync_to_parent_status = SyncToParentStatus.MERGED_TO_PARENT
+            elif not self._git.is_ancestor_or_equal(parent.full_name(), branch.full_name()):
+                sync_to_parent_status = SyncToParentStatus.OUT_OF_SYNC
+            else:
+                sync_to_parent_status = SyncToParentStatus.IN_SYNC
+            tag = _EDGE_COLOR_TAG[sync_to_parent_status]
+            edge = f"<{tag}>{_EDGE_JUNCTION_CHAR[sync_to_parent_status]}-</{tag}>"
+        # Only this branch is compared against its remote counterpart, rather than all branches at once.
+        sync_to_remote_status, remote = self._git.get_combined_remote_sync_status(branch, compare_all_upstreams_at_once=False)
+        return f"{edge}<b>{branch}</b>{_format_sync_to_remote_status(sync_to_remote_status, remote)}"
+
+    def watch_status(
+            self,
+            *,
+            opt_list_commits: bool,
+            opt_list_commits_with_hashes: bool,
+            opt_squash_merge_detection: Optional[SquashMergeDetection]
+    ) -> None:
+        """Redraws the status whenever any of the refs, reflogs, `HEAD`, the ongoing git operation or the branch layout file changes,
+        until interrupted with Ctrl+C. The changes are detected by polling the files (no extra dependencies, works on every platform).
+        Sync statuses are only re-evaluated for the branches whose tip, parent tip, remote counterpart or fork point has changed;
+        everything is re-evaluated when the tree of branches, the set of local branches or git config has changed."""
+        flags = self.__get_status_flags(
+            opt_list_commits=opt_list_commits,
+            opt_list_commits_with_hashes=opt_list_commits_with_hashes,
+            opt_squash_merge_detection=opt_squash_merge_detection)
+        is_tty = terminal.is_stdout_a_tty()
+        ansi_output_codes = FullTerminalAnsiOutputCodes if is_terminal_fully_fledged() else BasicTerminalAnsiOutputCodes
+        files_signature: Optional[List[Tuple[str, int, int, int]]] = None
+        global_key: Optional[List[str]] = None
+        inputs_by_branch: Dict[ManagedBranchName, List[str]] = {}
+        sync_statuses: Optional[_BranchSyncStatuses] = None
+        num_lines_drawn = 0
+        try:
+            while True:
+                # Taken before re-evaluating anything, so that the changes made in the meantime are picked up upon the next poll.
+                new_files_signature = self.__get_watched_files_signature()
+                if new_files_signature != files_signature:
+                    if files_signature is not None:
+                        debug("watched files changed, re-evaluating status")
+                        self.flush_caches()
+                        self._git.flush_caches()
+                        # Unlike in a one-off `status`, invalid branches are only skipped rather than slid out of the file,
+                        # since they might be just about to be (re)created, and the file is better left for the user to edit.
+                        self.read_branch_layout_file(verify_branches=False)
+                        local_branches = self._git.get_local_branches()
+                        for branch in self._state.managed_branches:
+                            if branch not in local_branches:
+                                self._state.splice_out(branch)
+                    managed_branches: List[ManagedBranchName] = self._state.managed_branches
+                    new_global_key = self.__get_status_watch_global_key(managed_branches)
+                    with self._batching_fork_point_cache_writes():
+                        self._warm_up_fork_points([branch for branch in managed_branches if self._state.has_parent(branch)])
+                        new_inputs_by_branch = {branch: self.__get_status_watch_branch_inputs(branch) for branch in managed_branches}
+                    if sync_statuses is None or new_global_key != global_key:
+                        sync_statuses = self.__get_branch_sync_statuses(flags, managed_branches)
+                    else:
+                        changed_branches = [b for b in managed_branches if new_inputs_by_branch[b] != inputs_by_branch.get(b)]
+                        if changed_branches:
+                            debug(f"re-evaluating sync statuses of {', '.join(changed_branches)}")
+                            sync_statuses = self.__merge_branch_sync_statuses(
+                                previous=sync_statuses, updated=self.__compute_branch_sync_statuses(flags, changed_branches))
+                    files_signature, global_key, inputs_by_branch = new_files_signature, new_global_key, new_inputs_by_branch
+
+                    output = self.format_status_output(self.__assemble_status_data(flags, managed_branches, sync_statuses)).result
+                    if is_tty and num_lines_drawn > 0:
+                        sys.stdout.write(ansi_output_codes.cursor_up(num_lines_drawn) + ansi_output_codes.CLEAR_TO_END)
+                    elif num_lines_drawn > 0:
+                        print()
+                    print_fmt(output, newline=False)
+                    sys.stdout.flush()
+                    num_lines_drawn = output.count("\n")
+                self._wait_for_next_status_watch_poll()
+        except KeyboardInterrupt:
+            # Ctrl+C is the regular way of leaving the watch mode, rather than an abort.
+            pass
+
+    def _wait_for_next_status_watch_poll(self) -> None:  # pragma: no cover; always mocked in tests
+        # Waiting on an event that nothing sets, just for the timeout to elapse (still interruptible with Ctrl+C).
+        threading.Event().wait(timeout=STATUS_WATCH_POLL_INTERVAL_SECONDS)
+
+    def __get_status_flags(
+            self,
+            *,
+            opt_list_commits: bool,
+            opt_list_commits_with_hashes: bool,
+            opt_squash_merge_detection: Optional[SquashMergeDetection]
+    ) -> StatusFlags:
         # CLI flag > `machete.squashMergeDetection` config key > built-in `SIMPLE` default - see `CommandLineOptions`.
         if opt_squash_merge_detection is None:
             opt_squash_merge_detection = self._config.squash_merge_detection()
         maybe_space_before_branch_name = ' ' if self._config.status_extra_space_before_branch_name() else ''
-        flags = StatusFlags(
+        return StatusFlags(
             maybe_space_before_branch_name=maybe_space_before_branch_name,
             opt_list_commits=opt_list_commits,
             opt_list_commits_with_hashes=opt_list_commits_with_hashes,
             opt_squash_merge_detection=opt_squash_merge_detection,
         )
-        data = self.compute_status_data(flags=flags)
-        format_out = self.format_status_output(data)
-        print_fmt(format_out.result, newline=False)
-        if warn_when_branch_in_sync_but_fork_point_off:
-            warning_msg = self._status_warning_message(data)
-            if warning_msg is not None:
-                print("", file=sys.stderr)
-                warn(warning_msg)
+
+    def __get_watched_files_signature(self) -> List[Tuple[str, int, int, int]]:
+        """Path, modification time, size and inode of each file that the status depends on.
+        Git updates refs by renaming a lock file over them, so the inode changes even if neither mtime nor size does.
+        git-machete's own cache files (`<git-dir>/machete-*`) are deliberately not included,
+        so that writing them doesn't trigger a redraw."""
+        main_git_dir = self._git.get_main_worktree_git_dir()
+        current_git_dir = self._git.get_current_worktree_git_dir()
+        paths: List[str] = [self._branch_layout_file_path, os.path.join(main_git_dir, "config"), os.path.join(main_git_dir, "packed-refs")]
+        paths += [os.path.join(current_git_dir, name) for name in (
+            "HEAD", "BISECT_START", "CHERRY_PICK_HEAD", "MERGE_HEAD", "REVERT_HEAD", "rebase-apply", "rebase-merge")]
+        for subdir in ("logs", "reftable", "refs"):
+            for dir_path, _, file_names in os.walk(os.path.join(main_git_dir, subdir)):
+                paths += sorted(os.path.join(dir_path, file_name) for file_name in file_names)
+        signature: List[Tuple[str, int, int, int]] = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return signature
+
+    def __get_status_watch_global_key(self, managed_branches: List[ManagedBranchName]) -> List[str]:
+        key = [f"{branch} {self._state.get_parent(branch) or ''}" for branch in managed_branches]
+        key += self._git.get_local_branches()
+        key += [f"{k}={v}" for k, v in sorted(self._git.get_all_config_attrs().items())]
+        return key
+
+    def __get_status_watch_branch_inputs(self, branch: LocalBranchShortName) -> List[str]:
+        """The branch itself, its parent and the remote counterparts of both, and the fork point of the branch.
+        The latter might change due to the reflog of any other branch, so it's inferred anew each time
+        (which mostly means just taking it from `ForkPointCache`)."""
+        parent = self._state.get_parent(branch)
+        relevant_branches: List[Optional[AnyBranchName]] = [
+            branch, self._git.get_combined_counterpart_for_fetching_of_branch(branch),
+            parent, self._git.get_combined_counterpart_for_fetching_of_branch(parent) if parent else None]
+        inputs = [f"{b} {self._git.get_commit_hash_by_revision(b)}" if b else "" for b in relevant_branches]
+        if parent:
+            try:
+                fork_point, inferring_branch_pairs = self.fork_point_and_inferring_branch_pairs(branch, use_overrides=True)
+                inputs += [fork_point, " ".join(f"{lb}:{lb_or_rb}" for lb, lb_or_rb in inferring_branch_pairs)]
+            except MacheteException:
+                inputs += ["", ""]
+        return inputs
+
+    @staticmethod
+    def __merge_branch_sync_statuses(*, previous: _BranchSyncStatuses, updated: _BranchSyncStatuses) -> _BranchSyncStatuses:
+        sync_to_parent_status = {
+            b: s for b, s in previous.sync_to_parent_status.items() if b not in updated.sync_to_remote_status_by_branch}
+        sync_to_parent_status.update(updated.sync_to_parent_status)
+        return _BranchSyncStatuses(
+            sync_to_parent_status=sync_to_parent_status,
+            commits_by_branch={**previous.commits_by_branch, **updated.commits_by_branch},
+            sync_to_remote_status_by_branch={**previous.sync_to_remote_status_by_branch, **updated.sync_to_remote_status_by_branch},
+            sync_timing_by_branch={**previous.sync_timing_by_branch, **updated.sync_timing_by_branch},
+            shared_sync_timing_by_phase=updated.shared_sync_timing_by_phase)
 
     def _compute_worktree_label_by_branch(self) -> Dict[LocalBranchShortName, str]:
         """For each managed branch checked out in a worktree, derive a short label naming that worktree
@@ -515,8 +1173,8 @@ class StatusMacheteClient(MacheteClient):
         return labels
 
     @staticmethod
-    def _popen_hook(*args: str, cwd: Path, env: Dict[str, str]) -> PopenResult:
+    def _popen_hook(*args: str, cwd: Path, env: Dict[str, str], timeout: Optional[float] = None) -> PopenResult:
         if sys.platform == "win32":
-            return popen_cmd("sh", *args, cwd=cwd, env=env)
+            return popen_cmd("sh", *args, cwd=cwd, env=env, timeout=timeout)
         else:
-            return popen_cmd(*args, cwd=cwd, env=env)
+            return popen_cmd(*args, cwd=cwd, env=env, timeout=timeout)
@@ -0,0 +1,72 @@
+"""Outputs of the `machete-status-branch` hook persisted in `<git-dir>/machete-status-hook-cache`, so that a slow hook
+(for example, one that queries the state of CI) doesn't need to be run for every branch on every `status`.
+
+An output is reused for as long as the branch points to the same commit, the hook file hasn't been modified,
+and the output isn't older than the configured time-to-live (`machete.status.hookCacheTtl`).
+The file (see `VersionedFile`) has one line per branch after the header:
+`<branch> TAB <key digest> TAB <unix timestamp of running the hook> TAB <output as a JSON string>`.
+The output is JSON-encoded, since it might contain any characters - including carriage returns, which would end the line otherwise.
+"""
+
+import json
+import threading
+from typing import Dict, Iterable, NamedTuple, Optional, Set
+
+from git_machete.utils.debug_log import debug
+from git_machete.utils.paths import AbsPath
+from git_machete.utils.versioned_file import VersionedFile
+
+_HEADER = "git-machete status hook cache v2\n"
+
+
+class _CachedHookOutput(NamedTuple):
+    key_digest: str
+    timestamp: int
+    output: str
+
+
+class StatusHookCache:
+
+    def __init__(self, path: AbsPath, *, existing_branches: Iterable[str], ttl_seconds: int, now: int) -> None:
+        self.__file: VersionedFile = VersionedFile(path, header=_HEADER)
+        self.__existing_branches: Set[str] = set(existing_branches)
+        self.__ttl_seconds: int = ttl_seconds
+        self.__now: int = now
+        self.__cached_outputs: Dict[str, _CachedHookOutput] = self.__load()
+        self.__is_dirty: bool = False
+        self.__lock = threading.Lock()
+
+    def __load(self) -> Dict[str, _CachedHookOutput]:
+        result: Dict[str, _CachedHookOutput] = {}
+        for line in self.__file.read_lines() or []:
+            fields = line.split("\t")
+            if len(fields) != 4 or not fields[2].isdigit():
+                debug(f"{self.__file.path}: ignoring malformed line `{line}`")
+                continue
+            branch, key_digest, timestamp, encoded_output = fields
+            try:
+                output = json.loads(encoded_output)
+            except ValueError:
+                debug(f"{self.__file.path}: ignoring malformed line `{line}`")
+                continue
+            # Expired entries (and the entries for the branches deleted in the meantime) are dropped upon the next write.
+            if branch in self.__existing_branches and self.__now - int(timestamp) < self.__ttl_seconds:
+                result[branch] = _CachedHookOutput(key_digest=key_digest, timestamp=int(timestamp), output=output)
+        return result
+
+    def get(self, *, branch: str, key_digest: str) -> Optional[str]:
+        cached = self.__cached_outputs.get(branch)
+        return cached.output if cached is not None and cached.key_digest == key_digest else None
+
+    def put(self, *, branch: str, key_digest: str, output: str) -> None:
+        with self.__lock:
+            self.__cached_outputs[branch] = _CachedHookOutput(key_digest=key_digest, timestamp=self.__now, output=output)
+            self.__is_dirty = True
+
+    def save(self) -> None:
+        with self.__lock:
+            if not self.__is_dirty:
+                return
+            self.__file.write_lines(
+                f"{b}\t{c.key_digest}\t{c.timestamp}\t{json.dumps(c.output)}\n" for b, c in self.__cached_outputs.items())
+            self.__is_dirty = False
@@ -0,0 +1,59 @@
+"""The most recent output of `status --prompt` for each branch, persisted in `<git-dir>/machete-status-prompt-cache`,
+so that the prompt doesn't need to be computed again as long as none of its inputs has changed,
+and so that there's still something to show once computing it takes longer than `machete.status.promptTimeout`.
+
+The inputs are summed up by the caller into a single key digest; only the most recent output is kept for each branch.
+The file (see `VersionedFile`) has one line per branch after the header: `<branch> TAB <key digest> TAB <output markup>`.
+"""
+
+from typing import ContextManager, Dict, Iterable, NamedTuple, Optional, Set
+
+from git_machete.utils.debug_log import debug
+from git_machete.utils.paths import AbsPath
+from git_machete.utils.record_file import exclusive_lock
+from git_machete.utils.versioned_file import VersionedFile
+
+_HEADER = "git-machete status prompt cache v1\n"
+
+
+class CachedPrompt(NamedTuple):
+    key_digest: str
+    output: str
+
+
+class StatusPromptCache:
+
+    def __init__(self, path: AbsPath, *, existing_branches: Iterable[str]) -> None:
+        self.__file: VersionedFile = VersionedFile(path, header=_HEADER)
+        self.__existing_branches: Set[str] = set(existing_branches)
+        self.__cached_prompts: Dict[str, CachedPrompt] = self.__load()
+
+    def __load(self) -> Dict[str, CachedPrompt]:
+        result: Dict[str, CachedPrompt] = {}
+        for line in self.__file.read_lines() or []:
+            fields = line.split("\t", 2)
+            if len(fields) != 3:
+                debug(f"{self.__file.path}: ignoring malformed line `{line}`")
+                continue
+            branch, key_digest, output = fields
+            # Entries for the branches deleted in the meantime are dropped upon the next write.
+            if branch in self.__existing_branches:
+                result[branch] = CachedPrompt(key_digest=key_digest, output=output)
+        return result
+
+    def get(self, *, branch: str) -> Optional[CachedPrompt]:
+        """The most recent output for the branch, whether its key digest is still up to date or not."""
+        return self.__cached_prompts.get(branch)
+
+    def computing_lock(self) -> ContextManager[bool]:
+        """Held by the process that carries on with a prompt once the time is up (see `StatusMacheteClient.prompt_status`),
+        so that there's at most one such process at a time. Yields whether the lock is held, never waiting for it."""
+        return exclusive_lock(self.__file.path + ".lock", blocking=False)
+
+    def put(self, *, branch: str, key_digest: str, output: str) -> None:
+        cached = CachedPrompt(key_digest=key_digest, output=output)
+        if self.__cached_prompts.get(branch) == cached:
+            return
+        self.__cached_prompts[branch] = cached
+        debug(f"status prompt of {branch} changed")
+        self.__file.write_lines(f"{b}\t{c.key_digest}\t{c.output}\n" for b, c in self.__cached_prompts.items())
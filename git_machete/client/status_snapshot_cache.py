@@ -0,0 +1,67 @@
+"""The most recently computed sync statuses of managed branches (and commits listed by `status --list-commits`), persisted
+in `<git-dir>/machete-status-snapshot`, so that `status` doesn't need to touch the history at all as long as nothing has changed.
+
+Whether anything has changed is summed up by the caller into a single key digest (see `StatusMacheteClient`);
+only the snapshot for the most recent key is kept.
+The file (see `VersionedFile`) has the key digest line after the header, and then for each branch:
+`B TAB <branch> TAB <name of sync-to-parent status, or empty for roots> TAB <name of sync-to-remote status> TAB <remote, or empty>`,
+followed by one line per listed commit of that branch:
+`C TAB <hash> TAB <short hash> TAB <fork point marker markup> TAB <subject>`.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from git_machete.git import FullCommitHash, GitLogEntry, ShortCommitHash
+from git_machete.utils.debug_log import debug
+from git_machete.utils.paths import AbsPath
+from git_machete.utils.versioned_file import VersionedFile
+
+_HEADER = "git-machete status snapshot v2\n"
+
+
+class CachedBranchStatus(NamedTuple):
+    # Name of a `SyncToParentStatus` member; empty for the branches with no parent.
+    sync_to_parent_status: str
+    # Name of a `SyncToRemoteStatus` member.
+    sync_to_remote_status: str
+    # Empty when the status doesn't refer to any remote.
+    remote: str
+    commits: List[Tuple[GitLogEntry, str]]
+
+
+class StatusSnapshotCache:
+
+    def __init__(self, path: AbsPath) -> None:
+        self.__file: VersionedFile = VersionedFile(path, header=_HEADER)
+
+    def get(self, *, key_digest: str) -> Optional[Dict[str, CachedBranchStatus]]:
+        lines = self.__file.read_lines()
+        if lines is None:
+            return None
+        if not lines or lines[0] != key_digest:
+            debug(f"{self.__file.path}: snapshot is stale")
+            return None
+        result: Dict[str, CachedBranchStatus] = {}
+        branch: Optional[str] = None
+        for line in lines[1:]:
+            # Commit subjects might contain any characters other than newlines (including tabs), hence `maxsplit`.
+            fields = line.split("\t", 4)
+            if fields[0] == "B" and len(fields) == 5:
+                branch = fields[1]
+                result[branch] = CachedBranchStatus(
+                    sync_to_parent_status=fields[2], sync_to_remote_status=fields[3], remote=fields[4], commits=[])
+            elif fields[0] == "C" and len(fields) == 5 and branch is not None:
+                commit = GitLogEntry(hash=FullCommitHash(fields[1]), short_hash=ShortCommitHash(fields[2]), subject=fields[4])
+                result[branch].commits.append((commit, fields[3]))
+            else:
+                # A partially valid snapshot is no good, since some branches would be missing from it.
+                debug(f"{self.__file.path}: malformed line `{line}`, discarding")
+                return None
+        return result
+
+    def put(self, *, key_digest: str, statuses: Dict[str, CachedBranchStatus]) -> None:
+        lines = [f"{key_digest}\n"]
+        for branch, status in statuses.items():
+            lines.append(f"B\t{branch}\t{status.sync_to_parent_status}\t{status.sync_to_remote_status}\t{status.remote}\n")
+            lines += [f"C\t{commit.hash}\t{commit.short_hash}\t{fp_suffix}\t{commit.subject}\n" for commit, fp_suffix in status.commits]
+        self.__file.write_lines(lines)
@@ -219,6 +219,7 @@ class TraverseMacheteClient(MacheteClientWithCodeHosting):
             else:
                 raise UnexpectedMacheteException(f"Unexpected value for opt_start_from: {start_from}")
 
+            self._warm_up_squash_merge_detection_to_parents(opt_squash_merge_detection=opt_squash_merge_detection)
             branch: LocalBranchShortName
             for branch in itertools.dropwhile(lambda x: x != current_branch, self.managed_branches.copy()):
                 parent = self.parent_of(branch)
@@ -133,7 +133,7 @@ class MacheteClientWithCodeHosting(StatusMacheteClient):
         self._mark_trailing_blank_line()
 
         current_branch = self._git.get_current_branch()
-        if current_branch not in self.managed_branches:
+        if not self._state.is_managed(current_branch):
             self.add(opt_branch=current_branch,
                      opt_onto=None,
                      opt_as_first_child=False,
@@ -141,7 +141,7 @@ class MacheteClientWithCodeHosting(StatusMacheteClient):
                      opt_yes=opt_yes,
                      verbose=True,
                      switch_head_if_new_branch=True)
-            if current_branch not in self.managed_branches:
+            if not self._state.is_managed(current_branch):
                 subcommand = "create-" + spec.pr_short_name.lower()
                 raise MacheteException(
                     f"Subcommand `{subcommand}` can NOT be executed on the branch"
@@ -892,7 +892,7 @@ class MacheteClientWithCodeHosting(StatusMacheteClient):
             pr_path: List[PullRequest] = self.__get_upwards_path_including_pr(pr)
             prs_to_annotate.update(pr_path)
             reversed_pr_path: List[PullRequest] = pr_path[::-1]  # need to add from root downwards
-            if reversed_pr_path[0].base not in self.managed_branches:
+            if not self._state.is_managed(LocalBranchShortName.of(reversed_pr_path[0].base)):
                 self.add(
                     opt_branch=LocalBranchShortName.of(reversed_pr_path[0].base),
                     opt_as_first_child=False,
@@ -902,7 +902,7 @@ class MacheteClientWithCodeHosting(StatusMacheteClient):
                     verbose=False,
                     switch_head_if_new_branch=False)
             for pr_on_path in reversed_pr_path:
-                if pr_on_path.head not in self.managed_branches:
+                if not self._state.is_managed(LocalBranchShortName.of(pr_on_path.head)):
                     self.add(
                         opt_branch=LocalBranchShortName.of(pr_on_path.head),
                         opt_onto=LocalBranchShortName.of(pr_on_path.base),
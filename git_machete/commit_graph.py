@@ -0,0 +1,142 @@
+"""In-process answers to ancestry and merge-base queries over a bounded region of the commit DAG.
+
+The region is expected to be loaded from `git rev-list --parents --boundary <tips> ^<excluded>...`,
+i.e. it consists of every commit reachable from the tips but not from the excluded commits (the *interior*),
+plus the *boundary* commits (reachable from the excluded commits, but parents of some interior commit).
+The interior is closed under "descendant of an interior commit that is an ancestor of a tip",
+which is what makes the answers exact:
+any path between two interior commits stays within the interior,
+so an ancestry query between two interior commits never needs to look past the boundary.
+Merge-base queries can legitimately lead past the boundary, though - in such case (and whenever any of the commits lies outside
+the interior), the answer is reported as unknown, and the caller is expected to fall back to `git merge-base`.
+
+Hashes are plain strings here; typed wrappers are applied by the caller (`git_machete.git.Git`).
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_FROM_FIRST = 1
+_FROM_SECOND = 2
+_STALE = 4
+
+
+class CommitGraph:
+
+    def __init__(self, rev_list_lines: Iterable[str]) -> None:
+        self.__parents: Dict[str, List[str]] = {}
+        boundary: Set[str] = set()
+        for line in rev_list_lines:
+            hashes = line.split(" ")
+            if hashes[0].startswith("-"):
+                boundary.add(hashes[0][1:])
+            else:
+                self.__parents[hashes[0]] = hashes[1:]
+        # Boundary commits are never walked past, so only their generation relative to the interior matters;
+        # 0 puts them below every interior commit.
+        self.__generation: Dict[str, int] = {commit: 0 for commit in boundary}
+        for commit in self.__parents:
+            self.__compute_generation(commit)
+
+    def __compute_generation(self, commit: str) -> int:
+        # Iterative post-order DFS: deep linear histories would blow the recursion limit.
+        stack = [commit]
+        while stack:
+            current = stack[-1]
+            if current in self.__generation:
+                stack.pop()
+                continue
+            missing = [p for p in self.__parents.get(current, []) if p not in self.__generation]
+            if missing:
+                stack.extend(missing)
+            else:
+                stack.pop()
+                self.__generation[current] = 1 + max((self.__generation[p] for p in self.__parents.get(current, [])), default=0)
+        return self.__generation[commit]
+
+    def __len__(self) -> int:
+        return len(self.__parents)
+
+    def is_ancestor_or_equal(self, earlier: str, later: str) -> Optional[bool]:  # noqa: KW
+        """`None` means unknown - at least one of the commits lies outside the interior."""
+        if earlier == later:
+            return True
+        if earlier not in self.__parents or later not in self.__parents:
+            return None
+        earlier_generation = self.__generation[earlier]
+        # Every ancestor has a strictly lower generation, so anything at or below `earlier`'s generation can be pruned.
+        visited: Set[str] = {later}
+        stack = [later]
+        while stack:
+            for parent in self.__parents.get(stack.pop(), []):
+                if parent == earlier:
+                    return True
+                if parent not in visited and self.__generation[parent] > earlier_generation:
+                    visited.add(parent)
+                    stack.append(parent)
+        return False
+
+    def get_ancestors_or_equal(self, commit: str) -> Set[str]:
+        """Only the ancestors within the interior; empty if the commit itself lies outside the interior."""
+        if commit not in self.__parents:
+            return set()
+        ancestors: Set[str] = {commit}
+        stack = [commit]
+        while stack:
+            for parent in self.__parents[stack.pop()]:
+                if parent in self.__parents and parent not in ancestors:
+                    ancestors.add(parent)
+                    stack.append(parent)
+        return ancestors
+
+    def get_merge_base(self, first: str, second: str) -> Tuple[bool, Optional[str]]:  # noqa: KW
+        """Returns `(answered, merge_base)`; `answered` is `False` whenever `git merge-base` must be consulted instead.
+
+        Mirrors git's own paint-down-to-common algorithm, walking from the highest generation downwards.
+        In case of more than one best common ancestor (criss-cross histories), we don't try to guess which one git would pick.
+        """
+        if first == second:
+            return True, first
+        if first not in self.__parents or second not in self.__parents:
+            return False, None
+        flags: Dict[str, int] = {first: _FROM_FIRST, second: _FROM_SECOND}
+        queue: List[Tuple[int, str]] = [(-self.__generation[first], first), (-self.__generation[second], second)]
+        heapq.heapify(queue)
+        # The same commit might be queued more than once (each time it gets new flags), and its queued entries become stale all at once.
+        # Hence, rather than scanning the queue for a non-stale entry upon each step, the non-stale entries are counted as we go.
+        queued_count: Dict[str, int] = {first: 1, second: 1}
+        non_stale_queued_count = 2
+        results: List[str] = []
+        while non_stale_queued_count:
+            _, commit = heapq.heappop(queue)
+            queued_count[commit] -= 1
+            commit_flags = flags[commit]
+            if not commit_flags & _STALE:
+                non_stale_queued_count -= 1
+            if commit not in self.__parents:
+                if not commit_flags & _STALE:
+                    # A non-stale walk has escaped past the boundary: the best common ancestor might lie out there.
+                    return False, None
+                continue
+            if commit_flags & (_FROM_FIRST | _FROM_SECOND) == (_FROM_FIRST | _FROM_SECOND) and not commit_flags & _STALE:
+                results.append(commit)
+                commit_flags |= _STALE
+                flags[commit] = commit_flags
+                non_stale_queued_count -= queued_count[commit]
+            for parent in self.__parents[commit]:
+                parent_flags = flags.get(parent, 0)
+                if parent_flags & commit_flags == commit_flags:
+                    continue
+                flags[parent] = parent_flags | commit_flags
+                if not flags[parent] & _STALE:
+                    non_stale_queued_count += 1
+                elif not parent_flags & _STALE:
+                    # Just became stale, and so did all of its entries queued so far.
+                    non_stale_queued_count -= queued_count.get(parent, 0)
+                queued_count[parent] = queued_count.get(parent, 0) + 1
+                heapq.heappush(queue, (-self.__generation[parent], parent))
+
+        best = [r for r in results if not any(other != r and self.is_ancestor_or_equal(r, other) for other in results)]
+        if len(best) > 1:
+            return False, None
+        return True, (best[0] if best else None)
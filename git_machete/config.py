@@ -1,11 +1,13 @@
 """Typed interface to machete-specific git config values (with defaults)."""
 
 from enum import auto
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 from git_machete.code_hosting import CodeHostingGitConfigKeys
 from git_machete.git import Git
-from git_machete.utils.exceptions import ParsableEnum
+from git_machete.utils.exceptions import MacheteException, ParsableEnum
+
+_N = TypeVar("_N", int, float)
 
 
 def _override_fork_point_to_key(branch: str) -> str:
@@ -44,8 +46,15 @@ class PRDescriptionIntroStyle(ParsableEnum):
 class MacheteConfig:
 
     _ADVICE_MACHETE_EDITOR_SELECTION = 'advice.macheteEditorSelection'
+    _IN_PROCESS_ANCESTRY = 'machete.inProcessAncestry'
     _SQUASH_MERGE_DETECTION = 'machete.squashMergeDetection'
     _STATUS_EXTRA_SPACE_BEFORE_BRANCH_NAME = 'machete.status.extraSpaceBeforeBranchName'
+    _STATUS_HOOK_CACHE_TTL = 'machete.status.hookCacheTtl'
+    _STATUS_HOOK_TIMEOUT = 'machete.status.hookTimeout'
+    _STATUS_HOOK_WORKERS = 'machete.status.hookWorkers'
+    _STATUS_PROMPT_TIMEOUT = 'machete.status.promptTimeout'
+    _STATUS_SNAPSHOT_CACHE = 'machete.status.snapshotCache'
+    _STATUS_WORKERS = 'machete.status.workers'
     _TRAVERSE_PUSH = 'machete.traverse.push'
     _TRAVERSE_WHEN_BRANCH_NOT_CHECKED_OUT_IN_ANY_WORKTREE = 'machete.traverse.whenBranchNotCheckedOutInAnyWorktree'
     _WORKTREE_USE_TOP_LEVEL_MACHETE_FILE = 'machete.worktree.useTopLevelMacheteFile'
@@ -64,6 +73,9 @@ class MacheteConfig:
     def core_editor(self) -> Optional[str]:
         return self._git.get_config_attr_or_none("core.editor")
 
+    def in_process_ancestry(self) -> bool:
+        return self._git.get_boolean_config_attr(key=self._IN_PROCESS_ANCESTRY, default_value=False)
+
     def squash_merge_detection(self) -> SquashMergeDetection:
         config_value_str = self._git.get_config_attr_or_none(self._SQUASH_MERGE_DETECTION)
         if config_value_str is None:
@@ -76,6 +88,33 @@ class MacheteConfig:
         return self._git.get_boolean_config_attr(
             key=self._STATUS_EXTRA_SPACE_BEFORE_BRANCH_NAME, default_value=False)
 
+    def status_hook_cache_ttl(self) -> int:
+        ttl = self.__get_number_config_attr(
+            self._STATUS_HOOK_CACHE_TTL, parse=int, is_valid=lambda value: value >= 0, valid_values="non-negative integers")
+        return 0 if ttl is None else ttl
+
+    def status_hook_timeout(self) -> Optional[float]:
+        return self.__get_number_config_attr(
+            self._STATUS_HOOK_TIMEOUT, parse=float, is_valid=lambda value: value > 0, valid_values="positive numbers")
+
+    def status_hook_workers(self) -> int:
+        workers = self.__get_number_config_attr(
+            self._STATUS_HOOK_WORKERS, parse=int, is_valid=lambda value: value >= 1, valid_values="positive integers")
+        return 1 if workers is None else workers
+
+    def status_prompt_timeout(self) -> float:
+        timeout = self.__get_number_config_attr(
+            self._STATUS_PROMPT_TIMEOUT, parse=float, is_valid=lambda value: value > 0, valid_values="positive numbers")
+        return 0.05 if timeout is None else timeout
+
+    def status_snapshot_cache(self) -> bool:
+        return self._git.get_boolean_config_attr(key=self._STATUS_SNAPSHOT_CACHE, default_value=False)
+
+    def status_workers(self) -> int:
+        workers = self.__get_number_config_attr(
+            self._STATUS_WORKERS, parse=int, is_valid=lambda value: value >= 1, valid_values="positive integers")
+        return 1 if workers is None else workers
+
     def traverse_fetch_for_remote(self, remote: str) -> bool:
         return self._git.get_boolean_config_attr(
             key=_traverse_remote_fetch_key(remote), default_value=True)
@@ -95,6 +134,20 @@ class MacheteConfig:
         return self._git.get_boolean_config_attr(
             key=self._WORKTREE_USE_TOP_LEVEL_MACHETE_FILE, default_value=True)
 
+    def __get_number_config_attr(
+            self, key: str, *, parse: Callable[[str], _N], is_valid: Callable[[_N], bool], valid_values: str) -> Optional[_N]:
+        config_value_str = self._git.get_config_attr_or_none(key)
+        if config_value_str is None:
+            return None
+        try:
+            value: Optional[_N] = parse(config_value_str)
+        except ValueError:
+            value = None
+        if value is None or not is_valid(value):
+            raise MacheteException(
+                f"Invalid value for `{key}` git config key: `{config_value_str or '<empty>'}`. Valid values are {valid_values}")
+        return value
+
     def fork_point_override_to_value(self, branch: str) -> Optional[str]:
         return self._git.get_config_attr_or_none(_override_fork_point_to_key(branch))
 
@@ -1,4 +1,8 @@
 DISCOVER_DEFAULT_FRESH_BRANCH_COUNT = 10
+MAX_COMMITS_FOR_BATCHED_COMMIT_LISTING = 10000
 MAX_COMMITS_FOR_SQUASH_MERGE_DETECTION = 1000
-INITIAL_COMMIT_COUNT_FOR_LOG = 10
+MAX_COMMITS_FOR_IN_PROCESS_ANCESTRY = 50000
+MAX_MERGE_BASE_CACHE_ENTRIES = 100000
+MAX_PATCH_ID_CACHE_ENTRIES = 100000
+STATUS_WATCH_POLL_INTERVAL_SECONDS = 1.0
 TOTAL_COMMIT_COUNT_FOR_LOG = 100
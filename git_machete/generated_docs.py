@@ -376,6 +376,13 @@ long_docs: Dict[str, str] = {
               * `up-only-no-branches` — same as `up-only`, but no branch names are included (only MR numbers & titles)
               * `none`                — prepend no intro to the MR description at all
 
+           `machete.inProcessAncestry`
+              The default value of this key is `false`. If set to `true`, git-machete loads the history between the local branches
+              (plus their remote counterparts) and their common ancestor with a single `git rev-list` call,
+              and then answers most of the merge-base and is-ancestor queries in-process rather than by running `git merge-base` for each pair of commits.
+              Queries that can't be answered exactly from the loaded history (for example, in case of criss-cross merges) still fall back to `git merge-base`.
+              Might speed up `status` and `traverse` in repositories with many branches.
+
            `machete.overrideForkPoint.<branch>.to`
               Executing `git machete fork-point --override-to[-parent|-inferred|=<revision>] [<branch>]` sets up a fork point override for `<branch>`.
 
@@ -421,6 +428,41 @@ long_docs: Dict[str, str] = {
                    │
                    └─ feature_branch2
 
+           `machete.status.hookCacheTtl`
+              The default value of this key is `0`, which means that the `machete-status-branch` hook is run for each branch every time.
+              If set to a positive number, the output of the hook is stored in `.git/machete-status-hook-cache` and reused for up to that many seconds,
+              as long as the branch points to the same commit and the hook file hasn't been modified in the meantime.
+
+           `machete.status.hookTimeout`
+              Not set by default. If set to a positive number, each run of the `machete-status-branch` hook is killed after that many seconds,
+              and its output is skipped (just as if the hook returned a non-zero exit code).
+
+           `machete.status.hookWorkers`
+              The default value of this key is `1`, so the `machete-status-branch` hook is run for one branch at a time.
+              If set to a higher number, up to that many runs of the hook (each for a different branch) are done at once,
+              independently of `machete.status.workers`. Only raise it if the hook is safe to run concurrently for many branches.
+              Note that `status` in repositories with many branches and a slow hook is only sped up once this key is set.
+              It isn't done by default, since existing hooks might rely on being run one at a time
+              (for example, when they write to a shared file or query a rate-limited API).
+
+           `machete.status.promptTimeout`
+              The default value of this key is `0.05`. The number of seconds that `status --prompt` has for determining the state of the current branch.
+              Once the time is up, the most recently printed state of the branch is printed instead (marked as `outdated`),
+              or `unknown` if there's none yet (see `.git/machete-status-prompt-cache`).
+              Meanwhile, the state is determined by a detached git-machete process in the background, ready for the next prompt.
+
+           `machete.status.snapshotCache`
+              The default value of this key is `false`. If set to `true`, the sync statuses of the managed branches
+              (along with the commits listed by `--list-commits`) are stored in `.git/machete-status-snapshot`,
+              and reused by the next `status` as long as neither the tree of branches, nor any branch (local or remote), nor any reflog, nor git config has changed.
+              Useful when `status` is run repeatedly (for example, from a shell prompt or an editor integration) while nothing changes.
+              The output of `machete-status-branch` hook is not stored in the snapshot (see `machete.status.hookCacheTtl`).
+
+           `machete.status.workers`
+              The default value of this key is `1`. If set to a higher number, up to that many threads are used to evaluate the sync status
+              (merge detection, fork point, relation to the remote counterpart) of the managed branches at once.
+              Might speed up `status` in repositories with many branches, especially on multi-core machines.
+
            `machete.traverse.fetch.<remote>`
               Configure the behavior of `git machete traverse` command for the given remote when `--fetch` flag is used.
               If set to `false`, this remote will not be fetched before the traversal.
@@ -1234,6 +1276,9 @@ long_docs: Dict[str, str] = {
               If `status` runs in ASCII-only mode (if `--color=auto` and stdout is <b>not</b> a terminal, or if `--color=never`),
               then `ASCII_ONLY=true`, otherwise `ASCII_ONLY=false`.
 
+              For `status`, the hook can be run for many branches at once (opt-in via `machete.status.hookWorkers` git config key),
+              its run can be limited in time (`machete.status.hookTimeout`), and its output can be cached (`machete.status.hookCacheTtl`).
+
         Please see hook_samples directory in git-machete project for examples.
         An example of using the standard git `post-commit hook` to `git machete add` branches automatically is also included.
    """,
@@ -1490,9 +1535,9 @@ long_docs: Dict[str, str] = {
    """,
     "status": """
         <b>Usage</b><b>
-           git machete s[tatus] [--color=WHEN]
+           git machete s[tatus] [--color=WHEN] [--format=FORMAT]
                                 [-l|--list-commits] [-L|--list-commits-with-hashes]
-                                [--squash-merge-detection=MODE]</b>
+                                [--squash-merge-detection=MODE] [--prompt|--watch]</b>
 
         Display a tree-shaped status of the branches listed in the branch layout file.
 
@@ -1576,6 +1621,13 @@ long_docs: Dict[str, str] = {
            <b>--color=WHEN</b>
               Colorize the output; WHEN can be `always`, `auto` (default: colorize only if stdout is a terminal), or `never`.
 
+           <b>--format=FORMAT</b>
+              Print the status as `text` (default) or as a single `json` document, for use by other tools.
+              Apart from the data displayed in the text format, JSON includes how long evaluating each branch took
+              and how many git processes were spawned on the way (`timing`), handy for finding which branches make `status` slow.
+              The work shared by all branches (like the inference of fork points) is timed separately, under `timing.shared`.
+              Cannot be combined with `--prompt` or `--watch`.
+
            <b>-l</b>, <b>--list-commits</b>
               Additionally list the commits introduced on each branch.
 
@@ -1587,11 +1639,23 @@ long_docs: Dict[str, str] = {
               Only consider strict (fast-forward or 2-parent) merges, rather than rebase/squash merges,
               when detecting if a branch is merged into its upstream (parent).
 
+           <b>--prompt</b>
+              Only print the edge leading to the currently checked out branch and its sync to the remote counterpart
+              (for example `o-develop (ahead of origin)`), or nothing if the branch isn't managed - for use in shell prompts.
+              Fork points are not inferred, so yellow edges are never displayed.
+              Takes at most `machete.status.promptTimeout` seconds, see below.
+
            <b>--squash-merge-detection=MODE</b>
               Specify the mode for detection of rebase/squash merges (gray edges).
               `MODE` can be `none` (fastest, no squash merges are detected), `simple` (default) or `exact` (slowest).
               See the below paragraph on `machete.squashMergeDetection` git config key for more details.
 
+           <b>--watch</b>
+              Keep running and redraw the status in place whenever any branch, the branch layout file,
+              `HEAD` or the ongoing git operation (rebase, merge etc.) changes, until interrupted with Ctrl+C.
+              Changes are detected by polling the files under `.git` once per second.
+              Sync statuses are only re-evaluated for the branches whose tip, parent, remote counterpart or fork point has changed.
+
         <b>Git config keys</b>
 
            `machete.squashMergeDetection`
@@ -1614,6 +1678,41 @@ long_docs: Dict[str, str] = {
            `machete.status.extraSpaceBeforeBranchName`
               To make it easier to select branch name from the `status` output on certain terminals (like `Alacritty),
               you can add an extra space between └─ and branch name by setting `git config machete.status.extraSpaceBeforeBranchName true`.
+
+           `machete.status.hookCacheTtl`
+              The default value of this key is `0`, which means that the `machete-status-branch` hook is run for each branch every time.
+              If set to a positive number, the output of the hook is stored in `.git/machete-status-hook-cache` and reused for up to that many seconds,
+              as long as the branch points to the same commit and the hook file hasn't been modified in the meantime.
+
+           `machete.status.hookTimeout`
+              Not set by default. If set to a positive number, each run of the `machete-status-branch` hook is killed after that many seconds,
+              and its output is skipped (just as if the hook returned a non-zero exit code).
+
+           `machete.status.hookWorkers`
+              The default value of this key is `1`, so the `machete-status-branch` hook is run for one branch at a time.
+              If set to a higher number, up to that many runs of the hook (each for a different branch) are done at once,
+              independently of `machete.status.workers`. Only raise it if the hook is safe to run concurrently for many branches.
+              Note that `status` in repositories with many branches and a slow hook is only sped up once this key is set.
+              It isn't done by default, since existing hooks might rely on being run one at a time
+              (for example, when they write to a shared file or query a rate-limited API).
+
+           `machete.status.promptTimeout`
+              The default value of this key is `0.05`. The number of seconds that `status --prompt` has for determining the state of the current branch.
+              Once the time is up, the most recently printed state of the branch is printed instead (marked as `outdated`),
+              or `unknown` if there's none yet (see `.git/machete-status-prompt-cache`).
+              Meanwhile, the state is determined by a detached git-machete process in the background, ready for the next prompt.
+
+           `machete.status.snapshotCache`
+              The default value of this key is `false`. If set to `true`, the sync statuses of the managed branches
+              (along with the commits listed by `--list-commits`) are stored in `.git/machete-status-snapshot`,
+              and reused by the next `status` as long as neither the tree of branches, nor any branch (local or remote), nor any reflog, nor git config has changed.
+              Useful when `status` is run repeatedly (for example, from a shell prompt or an editor integration) while nothing changes.
+              The output of `machete-status-branch` hook is not stored in the snapshot (see `machete.status.hookCacheTtl`).
+
+           `machete.status.workers`
+              The default value of this key is `1`. If set to a higher number, up to that many threads are used to evaluate the sync status
+              (merge detection, fork point, relation to the remote counterpart) of the managed branches at once.
+              Might speed up `status` in repositories with many branches, especially on multi-core machines.
    """,
     "traverse": """
         <b>Usage</b><b>
@@ -1,23 +1,34 @@
+import heapq
 import io
+import itertools
 import os
 import re
 import string
 import sys
+import threading
+from contextlib import closing, contextmanager
 from enum import Enum, auto
 from pathlib import Path as PyPath
-from typing import Any, Dict, Iterator, List, Match, NamedTuple, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Generator, Iterator, List, Match, NamedTuple, Optional, Sequence, Set, Tuple
 
-from git_machete.constants import MAX_COMMITS_FOR_SQUASH_MERGE_DETECTION
-from git_machete.git_version_thresholds import (PATCH_ID_UNSTABLE_OUTPUT_ORDER, PUSH_FORCE_IF_INCLUDES, PUSH_FORCE_WITH_LEASE,
+from git_machete.commit_graph import CommitGraph
+from git_machete.constants import (MAX_COMMITS_FOR_BATCHED_COMMIT_LISTING, MAX_COMMITS_FOR_IN_PROCESS_ANCESTRY,
+                                   MAX_COMMITS_FOR_SQUASH_MERGE_DETECTION, MAX_MERGE_BASE_CACHE_ENTRIES, MAX_PATCH_ID_CACHE_ENTRIES)
+from git_machete.git_version_thresholds import (CAT_FILE_BATCH_CHECK_FORMAT, FOR_EACH_REF_UPSTREAM_TRACKSHORT,
+                                                PATCH_ID_UNSTABLE_OUTPUT_ORDER, PUSH_FORCE_IF_INCLUDES, PUSH_FORCE_WITH_LEASE,
                                                 REBASE_EMPTY_DROP, RELIABLE_MULTI_BRANCH_REFLOG, WORKTREE_COMMAND, WORKTREE_REMOVE_COMMAND)
+from git_machete.history_walk import HistoryWalks, JointHistoryWalk
 from git_machete.utils._subproc import PopenResult
-from git_machete.utils.cmd import get_cmd_shell_repr, popen_cmd, run_cmd
+from git_machete.utils.cmd import LineCoprocess, StreamedCmd, get_cmd_shell_repr, popen_cmd, popen_cmd_pipeline, run_cmd
 from git_machete.utils.collections import get_non_empty_lines
 from git_machete.utils.debug_log import debug, hex_repr
 from git_machete.utils.exceptions import MacheteException, UnderlyingGitException, UnexpectedMacheteException
 from git_machete.utils.fs import is_executable, slurp_file
 from git_machete.utils.markup import escape_markup, print_fmt
 from git_machete.utils.paths import AbsPath, Path
+from git_machete.utils.record_file import RecordFile
+from git_machete.utils.ref_files import read_refs
+from git_machete.utils.reflog_file import read_reflog_newest_first
 
 
 class AnyRevision(str):
@@ -198,6 +209,13 @@ HEAD = AnyRevision.of("HEAD")
 # Fixes a bug documented in GitHub issue #1286.
 GIT_EXEC = ("git", "-c", "log.showSignature=false")
 
+# SHA-1 only, just as `FullCommitHash`.
+_RAW_HASH_LENGTH = 20
+# Records: <hash1> <hash2> <merge-base, or all zeros if none>, hash1 < hash2, all raw.
+_MERGE_BASE_CACHE_MAGIC = b"git-machete merge-base cache v2\n"
+# Records: <commit hash> <patch-id, or all zeros if the commit has none (merge commits, empty commits)>, all raw.
+_PATCH_ID_CACHE_MAGIC = b"git-machete patch-id cache v1\n"
+
 
 # === Enums ===
 
@@ -229,29 +247,47 @@ class Git:
 
     def __init__(self) -> None:
         self.owner: Optional[Any] = None
+        # Guards the lazy loading of the caches, so that a `Git` instance can be queried from multiple threads at once
+        # (see `StatusMacheteClient.compute_status_data`). Once loaded, the caches are only ever updated one entry at a time.
+        self.__lock = threading.RLock()
+        # Numbers of git processes spawned so far (in total and by each thread), see `get_git_process_count`.
+        self.__git_process_count: int = 0
+        self.__git_process_count_lock = threading.Lock()
+        self.__git_process_count_by_thread = threading.local()
 
         self.__git_version: Optional[Tuple[int, int, int]] = None
         self.__main_worktree_root_dir: Optional[AbsPath] = None
         self.__main_worktree_git_dir: Optional[AbsPath] = None
         self.__current_worktree_root_dir: Optional[AbsPath] = None
         self.__current_worktree_git_dir: Optional[AbsPath] = None
+        self.__common_git_dir: Optional[AbsPath] = None
+        self.__ref_files_readable: Optional[bool] = None
+        self.__object_resolver: Optional[LineCoprocess] = None
+        self.__in_process_ancestry_enabled: bool = False
+        self.__patch_id_by_commit_hash_cached: Optional[Dict[FullCommitHash, Optional[FullPatchId]]] = None
+        self.__deferred_persistent_cache_writes: Optional[List[Callable[[], None]]] = None
+
+        self.__history_walks = HistoryWalks(lambda tips: self._stream_git("rev-list", "--parents", *tips, "--"))
 
+        self.__commit_graph_cached: Optional[CommitGraph] = None
+        self.__commit_graph_load_attempted: bool = False
         self.__commit_hash_by_revision_cached: Optional[Dict[AnyRevision, Optional[FullCommitHash]]] = None
         self.__committer_unix_timestamp_by_revision_cached: Optional[Dict[AnyRevision, int]] = None
         self.__config_cached: Optional[Dict[str, str]] = None
         self.__counterparts_for_fetching_cached: Optional[Dict[LocalBranchShortName, Optional[RemoteBranchShortName]]] = None
         self.__fetch_done_for: Set[str] = set()
-        self.__initial_log_hashes_cached: Dict[FullCommitHash, List[FullCommitHash]] = {}
         self.__is_equivalent_patch_reachable_cached: Dict[Tuple[FullCommitHash, FullCommitHash], bool] = {}
         self.__is_equivalent_tree_reachable_cached: Dict[Tuple[FullCommitHash, FullCommitHash], bool] = {}
         self.__local_branches_cached: Optional[List[LocalBranchShortName]] = None
         self._merge_base_cached: Optional[Dict[Tuple[FullCommitHash, FullCommitHash], Optional[FullCommitHash]]] = None
+        self.__reflog_files_cached: Dict[AnyBranchName, List[GitReflogEntry]] = {}
         self.__reflogs_cached: Optional[Dict[AnyBranchName, List[GitReflogEntry]]] = None
-        self.__remaining_log_hashes_cached: Dict[FullCommitHash, List[FullCommitHash]] = {}
         self.__remote_branches_cached: Optional[List[RemoteBranchShortName]] = None
         self.__remotes_cached: Optional[List[str]] = None
         self.__removed_from_remote: Optional[Set[str]] = None
         self.__short_commit_hash_by_revision_cached: Dict[AnyRevision, Optional[ShortCommitHash]] = {}
+        self.__sync_to_upstream_status_by_branch_cached: Optional[
+            Dict[LocalBranchShortName, Tuple[RemoteBranchShortName, SyncToRemoteStatus]]] = None
         self.__tree_hash_by_commit_hash_cached: Optional[Dict[FullCommitHash, Optional[FullTreeHash]]] = None
 
     def flush_caches(self) -> None:
@@ -262,13 +298,76 @@ class Git:
         self.__config_cached = None
         self.__counterparts_for_fetching_cached = None
         self.__local_branches_cached = None
+        self.__reflog_files_cached = {}
         self.__reflogs_cached = None
         self.__remote_branches_cached = None
         self.__remotes_cached = None
         self.__removed_from_remote = None
         self.__short_commit_hash_by_revision_cached = {}
+        self.__sync_to_upstream_status_by_branch_cached = None
         self.__flush_current_worktree_caches()
 
+    @contextmanager
+    def __invalidating_caches(
+            self,
+            *,
+            refs: Sequence[str] = (),
+            branch_lists: bool = False,
+            upstreams: bool = False,
+            config: bool = False,
+            remotes: bool = False
+    ) -> Iterator[None]:
+        """A targeted alternative to `flush_caches` for the commands whose effects are known upfront.
+
+        `refs` are the full names of refs updated by the command (`HEAD` included);
+        an entry ending with `/` stands for all refs with such prefix.
+        `branch_lists` means that branches might get created or deleted, `upstreams` - that the tracking config might change.
+        Caches are invalidated even if the command fails, since it might have been partially applied.
+        """
+        try:
+            yield
+        finally:
+            def is_updated(refname: str) -> bool:
+                return any(refname == ref or (ref.endswith("/") and refname.startswith(ref)) for ref in refs)
+
+            # Revisions other than full branch names (`HEAD`, `HEAD~1`, short branch names and so on)
+            # might resolve to whatever an updated ref now points to, so they're dropped altogether.
+            def is_still_valid(revision: AnyRevision) -> bool:
+                return revision.startswith("refs/") and not is_updated(revision)
+
+            if refs:
+                if self.__commit_hash_by_revision_cached is not None:
+                    self.__commit_hash_by_revision_cached = \
+                        {rev: hash for rev, hash in self.__commit_hash_by_revision_cached.items() if is_still_valid(rev)}
+                self.__short_commit_hash_by_revision_cached = \
+                    {rev: hash for rev, hash in self.__short_commit_hash_by_revision_cached.items() if is_still_valid(rev)}
+                # A missing entry means "no such branch" here, so it's all or nothing.
+                if self.__committer_unix_timestamp_by_revision_cached is not None and \
+                        (branch_lists or any(map(is_updated, self.__committer_unix_timestamp_by_revision_cached))):
+                    self.__committer_unix_timestamp_by_revision_cached = None
+                self.__reflog_files_cached = {b: reflog for b, reflog in self.__reflog_files_cached.items() if not is_updated(b)}
+                self.__reflogs_cached = None
+                if self.__sync_to_upstream_status_by_branch_cached is not None:
+                    self.__sync_to_upstream_status_by_branch_cached = {
+                        b: (upstream, status) for b, (upstream, status) in self.__sync_to_upstream_status_by_branch_cached.items()
+                        if not is_updated(b.full_name()) and not is_updated(upstream.full_name())}
+                if self.__object_resolver is not None:
+                    self.__object_resolver.close()
+                    self.__object_resolver = None
+            if branch_lists:
+                self.__local_branches_cached = None
+                self.__remote_branches_cached = None
+            if upstreams or branch_lists:
+                self.__counterparts_for_fetching_cached = None
+                self.__removed_from_remote = None
+            if config:
+                self.__config_cached = None
+            if remotes:
+                self.__remotes_cached = None
+            # Reflogs of branches and their upstreams are all that the owner (`MacheteClient`) caches.
+            if (any(ref != "HEAD" for ref in refs) or upstreams or config) and self.owner:
+                self.owner.flush_caches()
+
     def chdir(self, path: Path) -> None:
         os.chdir(path)
         self.__flush_current_worktree_caches()
@@ -277,8 +376,26 @@ class Git:
         # No point in clearing main worktree paths as they are not affected by chdir between worktrees
         self.__current_worktree_root_dir = None
         self.__current_worktree_git_dir = None
+        # The object resolver is bound to the worktree it was spawned in (think `HEAD`),
+        # and restarting it after a mutating command is cheap insurance against it serving a stale view of refs.
+        if self.__object_resolver is not None:
+            self.__object_resolver.close()
+            self.__object_resolver = None
+
+    def get_git_process_count(self, *, of_current_thread: bool = False) -> int:
+        """How many git processes have been spawned so far (by all threads, or only by the calling one).
+        A query to a long-lived process (like `git cat-file --batch-check`) doesn't count as a separate process."""
+        if of_current_thread:
+            return getattr(self.__git_process_count_by_thread, "value", 0)
+        return self.__git_process_count
+
+    def __count_git_processes(self, count: int = 1) -> None:
+        with self.__git_process_count_lock:
+            self.__git_process_count += count
+        self.__git_process_count_by_thread.value = self.get_git_process_count(of_current_thread=True) + count
 
     def _run_git(self, git_cmd: str, *args: str, flush_caches: bool, allow_non_zero: bool = False) -> int:
+        self.__count_git_processes()
         exit_code = run_cmd(*GIT_EXEC, git_cmd, *args)
         if flush_caches:
             self.flush_caches()
@@ -289,15 +406,41 @@ class Git:
 
     def _popen_git(self, git_cmd: str, *args: str,
                    allow_non_zero: bool = False, env: Optional[Dict[str, str]] = None, input: Optional[str] = None) -> PopenResult:
+        self.__count_git_processes()
         result = popen_cmd(*GIT_EXEC, git_cmd, *args, env=env, input=input)
         if not allow_non_zero and result.exit_code != 0:
-            cmd_repr = escape_markup(get_cmd_shell_repr(*GIT_EXEC, git_cmd, *args, env=env))
-            exit_code_msg: str = f"`{cmd_repr}` returned {result.exit_code}\n"
-            stdout_msg: str = f"\n<b>stdout</b>:\n<dim>{escape_markup(result.stdout)}</dim>" if result.stdout else ""
-            stderr_msg: str = f"\n<b>stderr</b>:\n<dim>{escape_markup(result.stderr)}</dim>" if result.stderr else ""
-            raise UnderlyingGitException(exit_code_msg + stdout_msg + stderr_msg)
+            self.__raise_underlying_git_exception(get_cmd_shell_repr(*GIT_EXEC, git_cmd, *args, env=env), result)
+        return result
+
+    def _popen_git_pipeline(self, first_git_cmd_and_args: Sequence[str], second_git_cmd_and_args: Sequence[str], *,
+                            input: Optional[str] = None) -> PopenResult:
+        first_cmd_and_args = GIT_EXEC + tuple(first_git_cmd_and_args)
+        second_cmd_and_args = GIT_EXEC + tuple(second_git_cmd_and_args)
+        self.__count_git_processes(2)
+        result = popen_cmd_pipeline(first_cmd_and_args, second_cmd_and_args, input=input)
+        if result.exit_code != 0:
+            self.__raise_underlying_git_exception(
+                get_cmd_shell_repr(*first_cmd_and_args, env=None) + " | " + get_cmd_shell_repr(*second_cmd_and_args, env=None), result)
         return result
 
+    def _stream_git(self, git_cmd: str, *args: str) -> Generator[str, None, None]:
+        """Yields the lines of stdout as soon as they're produced; see `StreamedCmd`.
+        Meant to be wrapped in `contextlib.closing` whenever the caller might stop iterating early."""
+        self.__count_git_processes()
+        streamed_cmd = StreamedCmd(*GIT_EXEC, git_cmd, *args)
+        yield from streamed_cmd.lines()
+        assert streamed_cmd.exit_code is not None
+        if streamed_cmd.exit_code != 0:
+            self.__raise_underlying_git_exception(
+                get_cmd_shell_repr(*GIT_EXEC, git_cmd, *args, env=None), PopenResult(streamed_cmd.exit_code, "", streamed_cmd.stderr))
+
+    @staticmethod
+    def __raise_underlying_git_exception(cmd_repr: str, result: PopenResult) -> None:
+        exit_code_msg: str = f"`{escape_markup(cmd_repr)}` returned {result.exit_code}\n"
+        stdout_msg: str = f"\n<b>stdout</b>:\n<dim>{escape_markup(result.stdout)}</dim>" if result.stdout else ""
+        stderr_msg: str = f"\n<b>stderr</b>:\n<dim>{escape_markup(result.stderr)}</dim>" if result.stderr else ""
+        raise UnderlyingGitException(exit_code_msg + stdout_msg + stderr_msg)
+
     def get_git_version(self) -> Tuple[int, int, int]:
         if not self.__git_version:
             # We need to cut out the x.y.z part and not just take the result of 'git version' as is,
@@ -375,6 +518,27 @@ class Git:
                 self.__main_worktree_git_dir = git_dir
         return self.__main_worktree_git_dir
 
+    def __get_common_git_dir(self) -> AbsPath:
+        # Same logic as git's own: a linked worktree's git dir points to the common dir via the `commondir` file.
+        if not self.__common_git_dir:
+            git_dir = self.get_current_worktree_git_dir()
+            commondir_file = git_dir.join_fragments("commondir")
+            if os.path.isfile(commondir_file):
+                self.__common_git_dir = AbsPath(Path.join_paths(git_dir, slurp_file(commondir_file).strip()))
+            else:
+                self.__common_git_dir = git_dir
+        return self.__common_git_dir
+
+    def __are_ref_files_readable(self) -> bool:
+        # Refs and reflogs can only be read directly from the files ref backend (the default);
+        # reftable repositories (`git init --ref-format=reftable`) keep them in binary tables instead.
+        if self.__ref_files_readable is None:
+            ref_storage = self.get_config_attr_or_none("extensions.refStorage")
+            self.__ref_files_readable = (ref_storage or "files").lower() == "files" and \
+                not os.path.isdir(self.__get_common_git_dir().join_fragments("reftable"))
+            debug(f"refs and reflogs are {'' if self.__ref_files_readable else 'NOT '}readable directly from files")
+        return self.__ref_files_readable
+
     def get_main_worktree_git_subpath(self, *fragments: str) -> AbsPath:
         # Let's use /-style paths even on Windows, for consistency with what git itself returns.
         return self.get_main_worktree_git_dir().join_fragments(*fragments)
@@ -489,17 +653,18 @@ class Git:
     # === Config ===
 
     def __ensure_config_loaded(self) -> None:
-        if self.__config_cached is None:
-            self.__config_cached = {}
-            git_config_stdout = self._popen_git("config", "--list", "--null").stdout
-            for config_entry in filter(None, git_config_stdout.split("\0")):
-                # Apparently, even on Windows, this command uses just \n (and not \r\n) to separate config key from value.
-                key_and_value_lines = config_entry.split('\n', 1)
-                if len(key_and_value_lines) == 2:
-                    key, value_lines = key_and_value_lines
-                    self.__config_cached[key.lower()] = value_lines
-                else:
-                    raise UnexpectedMacheteException(f"Cannot parse config entry: {config_entry}.")
+        with self.__lock:
+            if self.__config_cached is None:
+                self.__config_cached = {}
+                git_config_stdout = self._popen_git("config", "--list", "--null").stdout
+                for config_entry in filter(None, git_config_stdout.split("\0")):
+                    # Apparently, even on Windows, this command uses just \n (and not \r\n) to separate config key from value.
+                    key_and_value_lines = config_entry.split('\n', 1)
+                    if len(key_and_value_lines) == 2:
+                        key, value_lines = key_and_value_lines
+                        self.__config_cached[key.lower()] = value_lines
+                    else:
+                        raise UnexpectedMacheteException(f"Cannot parse config entry: {config_entry}.")
 
     def get_config_attr(self, key: str, *, default_value: str) -> str:
         value = self.get_config_attr_or_none(key)
@@ -510,6 +675,11 @@ class Git:
         assert self.__config_cached is not None
         return self.__config_cached.get(key.lower())
 
+    def get_all_config_attrs(self) -> Dict[str, str]:
+        self.__ensure_config_loaded()
+        assert self.__config_cached is not None
+        return dict(self.__config_cached)
+
     def get_boolean_config_attr(self, key: str, *, default_value: bool) -> bool:
         value = self.get_boolean_config_attr_or_none(key)
         return value if value is not None else default_value
@@ -537,11 +707,13 @@ class Git:
     # === Remotes ===
 
     def add_remote(self, name: str, url: str) -> None:  # noqa: KW
-        self._run_git('remote', 'add', name, url, flush_caches=True)
+        with self.__invalidating_caches(config=True, remotes=True):
+            self._run_git('remote', 'add', name, url, flush_caches=False)
 
     def get_remotes(self) -> List[str]:
-        if self.__remotes_cached is None:
-            self.__remotes_cached = get_non_empty_lines(self._popen_git("remote").stdout)
+        with self.__lock:
+            if self.__remotes_cached is None:
+                self.__remotes_cached = get_non_empty_lines(self._popen_git("remote").stdout)
         return self.__remotes_cached
 
     def get_url_of_remote(self, remote: str) -> Optional[str]:
@@ -551,11 +723,14 @@ class Git:
 
     def fetch_remote(self, remote: str) -> None:
         if remote not in self.__fetch_done_for:
-            self._run_git("fetch", remote, "--prune", flush_caches=True)
+            with self.__invalidating_caches(refs=[f"refs/remotes/{remote}/"], branch_lists=True):
+                self._run_git("fetch", remote, "--prune", flush_caches=False)
             self.__fetch_done_for.add(remote)
 
     def fetch_refspec(self, remote: str, refspec: str) -> int:  # noqa: KW
-        return self._run_git("fetch", "--prune", remote, refspec, flush_caches=True)
+        # The refspec might just as well point to a local branch.
+        with self.__invalidating_caches(refs=["HEAD", "refs/heads/", f"refs/remotes/{remote}/"], branch_lists=True):
+            return self._run_git("fetch", "--prune", remote, refspec, flush_caches=False)
 
     def does_remote_branch_exist(self, remote: str, branch: LocalBranchShortName) -> bool:  # noqa: KW
         # `--heads` is passed here to avoid checking for `refs/pulls/...`,
@@ -595,20 +770,26 @@ class Git:
     # === Branch upstream tracking & push/pull ===
 
     def rename_local_branch(self, *, old_name: LocalBranchShortName, new_name: LocalBranchShortName) -> None:
-        self._run_git("branch", "-m", old_name, new_name, flush_caches=True)
+        # The config section of the branch is renamed as well.
+        with self.__invalidating_caches(refs=["HEAD", old_name.full_name(), new_name.full_name()], branch_lists=True, config=True):
+            self._run_git("branch", "-m", old_name, new_name, flush_caches=False)
 
     def set_upstream_to(self, remote_branch: RemoteBranchShortName) -> None:
-        self._run_git("branch", "--set-upstream-to", remote_branch, flush_caches=True)
+        with self.__invalidating_caches(upstreams=True, config=True):
+            self._run_git("branch", "--set-upstream-to", remote_branch, flush_caches=False)
 
     def set_upstream_of(self, *, branch: LocalBranchShortName, remote_branch: RemoteBranchShortName) -> None:
-        self._run_git("branch", "--set-upstream-to", remote_branch, branch, flush_caches=True)
+        with self.__invalidating_caches(upstreams=True, config=True):
+            self._run_git("branch", "--set-upstream-to", remote_branch, branch, flush_caches=False)
 
     def unset_upstream_of(self, branch: LocalBranchShortName) -> None:
-        self._run_git("branch", "--unset-upstream", branch, flush_caches=True)
+        with self.__invalidating_caches(upstreams=True, config=True):
+            self._run_git("branch", "--unset-upstream", branch, flush_caches=False)
 
     def reset_keep(self, to_revision: AnyRevision) -> None:
         try:
-            self._run_git("reset", "--keep", to_revision, flush_caches=True)
+            with self.__invalidating_caches(refs=self.__get_refs_updated_via_head()):
+                self._run_git("reset", "--keep", to_revision, flush_caches=False)
         except UnderlyingGitException:
             raise UnderlyingGitException(
                 f"Cannot perform `git reset --keep {to_revision}`. This is most likely caused by local uncommitted changes.")
@@ -623,17 +804,59 @@ class Git:
         else:
             opt_force = ["--force"]
         args = [remote, branch]
-        self._run_git("push", "--set-upstream", *(opt_force + args), flush_caches=True)
+        remote_branch = RemoteBranchShortName.of(f"{remote}/{branch}")
+        with self.__invalidating_caches(refs=[remote_branch.full_name()], branch_lists=remote_branch not in self.get_remote_branches(),
+                                        upstreams=True):
+            self._run_git("push", "--set-upstream", *(opt_force + args), flush_caches=False)
+        # Rather than reloading, let's patch what the successful push is known to have changed.
+        # The remote-tracking branch now points to the pushed commit (unless the fetch refspec of the remote is non-standard)...
+        commit_hash = self.__commit_hash_by_revision_cached.get(branch.full_name()) if self.__commit_hash_by_revision_cached else None
+        if commit_hash and self.get_config_attr_or_none(f"remote.{remote}.fetch") == f"+refs/heads/*:refs/remotes/{remote}/*":
+            assert self.__commit_hash_by_revision_cached is not None
+            self.__commit_hash_by_revision_cached[remote_branch.full_name()] = commit_hash
+        # ... and `--set-upstream` has set up the tracking config.
+        if self.__config_cached is not None:
+            self.__config_cached[f"branch.{branch}.remote".lower()] = remote
+            self.__config_cached[f"branch.{branch}.merge".lower()] = branch.full_name()
 
     def pull_ff_only(self, remote: str, remote_branch: RemoteBranchShortName) -> None:  # noqa: KW
         self.fetch_remote(remote)
-        self._run_git("merge", "--ff-only", remote_branch, flush_caches=True)
+        with self.__invalidating_caches(refs=self.__get_refs_updated_via_head()):
+            self._run_git("merge", "--ff-only", remote_branch, flush_caches=False)
         # There's apparently no way to set remote automatically when doing 'git pull' (as opposed to 'git push'),
         # so a separate 'git branch --set-upstream-to' is needed.
         self.set_upstream_to(remote_branch)
 
     # === Commit & tree hash resolution ===
 
+    def __get_object_resolver(self) -> Optional[LineCoprocess]:
+        if self.get_git_version() < CAT_FILE_BATCH_CHECK_FORMAT:
+            return None
+        with self.__lock:
+            if self.__object_resolver is None:
+                self.__count_git_processes()
+                self.__object_resolver = LineCoprocess(*GIT_EXEC, "cat-file", "--batch-check=%(objectname) %(objecttype)")
+        return self.__object_resolver
+
+    def __peel_via_object_resolver(self, revision: AnyRevision, *, object_type: str) -> Tuple[bool, Optional[str]]:
+        """Resolve `revision^{object_type}` over the long-lived `git cat-file --batch-check` process.
+
+        Returns `(answered, hash)`: `answered` is `False` when the resolver is not available
+        (old git, or the process died), in which case the caller should fall back to a one-shot `git rev-parse`;
+        otherwise `hash` is `None` iff the revision does not resolve to an object of the given type.
+        """
+        resolver = self.__get_object_resolver()
+        if resolver is None:
+            return False, None
+        answer = resolver.query(f"{revision}^{{{object_type}}}")
+        if answer is None:
+            return False, None
+        # For a missing (or ambiguous) object, the answer is `<input> missing` (or `<input> ambiguous`) regardless of the format.
+        parts = answer.split(" ")
+        if len(parts) == 2 and parts[1] == object_type and FullCommitHash.is_valid(parts[0]):
+            return True, parts[0]
+        return True, None
+
     def __find_short_commit_hash_by_revision(self, revision: AnyRevision) -> ShortCommitHash:
         return ShortCommitHash.of(self._popen_git("rev-parse", "--short", revision + "^{commit}").stdout.rstrip())  # noqa: FS003
 
@@ -642,10 +865,16 @@ class Git:
         # (even if for some hashes, a shorter prefix could be enough).
         # Easy to check with `git log -100 --format=%H | xargs -L1 git rev-parse --short`.
         if revision not in self.__short_commit_hash_by_revision_cached:
-            try:
-                self.__short_commit_hash_by_revision_cached[revision] = self.__find_short_commit_hash_by_revision(revision)
-            except UnderlyingGitException:
+            # `git cat-file` has no notion of abbreviated hashes, so a one-shot `git rev-parse --short` is still needed,
+            # but at least the revisions that don't resolve at all are weeded out without spawning a process.
+            commit_hash = self.get_commit_hash_by_revision(revision)
+            if commit_hash is None:
                 self.__short_commit_hash_by_revision_cached[revision] = None
+            else:
+                try:
+                    self.__short_commit_hash_by_revision_cached[revision] = self.__find_short_commit_hash_by_revision(commit_hash)
+                except UnderlyingGitException:
+                    self.__short_commit_hash_by_revision_cached[revision] = None
         return self.__short_commit_hash_by_revision_cached[revision]
 
     def get_short_commit_hash_by_revision(self, hash: FullCommitHash) -> ShortCommitHash:
@@ -653,6 +882,9 @@ class Git:
         return self.get_short_commit_hash_by_revision_or_none(hash)  # type: ignore[return-value]
 
     def __find_commit_hash_by_revision(self, revision: AnyRevision) -> Optional[FullCommitHash]:
+        answered, commit_hash = self.__peel_via_object_resolver(revision, object_type="commit")
+        if answered:
+            return FullCommitHash.of(commit_hash) if commit_hash else None
         # Without ^{commit}, 'git rev-parse --verify' will not only accept references to other kinds of objects (like trees and blobs),
         # but just echo the argument (and exit successfully) even if the argument doesn't match anything in the object store.
         try:
@@ -663,22 +895,27 @@ class Git:
     def get_commit_hash_by_revision(self, revision: AnyRevision) -> Optional[FullCommitHash]:
         if self.is_full_hash(revision.full_name()):
             return FullCommitHash.of(revision)
-        if self.__commit_hash_by_revision_cached is None:
-            self.__load_branches()
+        with self.__lock:
+            if self.__commit_hash_by_revision_cached is None:
+                self.__load_branches()
         assert self.__commit_hash_by_revision_cached is not None
         if revision not in self.__commit_hash_by_revision_cached:
             self.__commit_hash_by_revision_cached[revision] = self.__find_commit_hash_by_revision(revision)
         return self.__commit_hash_by_revision_cached[revision]
 
     def __find_tree_hash_by_revision(self, revision: AnyRevision) -> Optional[FullTreeHash]:
+        answered, tree_hash = self.__peel_via_object_resolver(revision, object_type="tree")
+        if answered:
+            return FullTreeHash.of(tree_hash) if tree_hash else None
         try:
             return FullTreeHash.of(self._popen_git("rev-parse", "--verify", "--quiet", revision + "^{tree}").stdout.rstrip())  # noqa: FS003
         except UnderlyingGitException:
             return None
 
     def get_tree_hash_by_commit_hash(self, commit_hash: FullCommitHash) -> Optional[FullTreeHash]:
-        if self.__tree_hash_by_commit_hash_cached is None:
-            self.__load_branches()
+        with self.__lock:
+            if self.__tree_hash_by_commit_hash_cached is None:
+                self.__load_branches()
         assert self.__tree_hash_by_commit_hash_cached is not None
         if commit_hash not in self.__tree_hash_by_commit_hash_cached:
             self.__tree_hash_by_commit_hash_cached[commit_hash] = self.__find_tree_hash_by_revision(commit_hash)
@@ -689,8 +926,9 @@ class Git:
         return re.match("^[0-9a-f]{40}$", revision)  # noqa: FS003
 
     def get_committer_unix_timestamp_by_revision(self, revision: AnyBranchName) -> int:
-        if self.__committer_unix_timestamp_by_revision_cached is None:
-            self.__load_branches()
+        with self.__lock:
+            if self.__committer_unix_timestamp_by_revision_cached is None:
+                self.__load_branch_committer_dates()
         assert self.__committer_unix_timestamp_by_revision_cached is not None
         return self.__committer_unix_timestamp_by_revision_cached.get(revision.full_name(), 0)
 
@@ -735,8 +973,9 @@ class Git:
             return RemoteBranchShortName.of(f"{remotes_containing_branch[0]}/{branch}")
 
     def get_strict_counterpart_for_fetching_of_branch(self, branch: LocalBranchShortName) -> Optional[RemoteBranchShortName]:
-        if self.__counterparts_for_fetching_cached is None:
-            self.__load_branches()
+        with self.__lock:
+            if self.__counterparts_for_fetching_cached is None:
+                self.__load_upstreams()
         assert self.__counterparts_for_fetching_cached is not None
         return self.__counterparts_for_fetching_cached.get(branch)
 
@@ -746,8 +985,9 @@ class Git:
         return self.get_strict_counterpart_for_fetching_of_branch(branch) or self.__get_inferred_counterpart_for_fetching_of_branch(branch)
 
     def is_removed_from_remote(self, branch: LocalBranchShortName) -> bool:
-        if self.__removed_from_remote is None:
-            self.__load_branches()
+        with self.__lock:
+            if self.__removed_from_remote is None:
+                self.__load_upstreams()
         assert self.__removed_from_remote is not None
         return branch in self.__removed_from_remote
 
@@ -785,7 +1025,11 @@ class Git:
         (which would otherwise surface as the cryptic `fatal: '<branch>' is already used by worktree at <path>`)
         should use `checkout_in_current_worktree` instead.
         """
-        self._run_git("checkout", "--quiet", branch, "--", flush_caches=True)
+        # If there's no such local branch yet, git creates one out of the remote branch of the same name (and sets up tracking).
+        is_new_branch = branch not in self.get_local_branches()
+        with self.__invalidating_caches(refs=["HEAD"] + ([branch.full_name()] if is_new_branch else []),
+                                        branch_lists=is_new_branch, upstreams=is_new_branch, config=is_new_branch):
+            self._run_git("checkout", "--quiet", branch, "--", flush_caches=False)
 
     def expect_branch_not_held_by_other_worktree(self, branch: LocalBranchShortName) -> None:
         """If `<branch>` is checked out in a linked worktree other than the current one, raise a `MacheteException`
@@ -824,54 +1068,81 @@ class Git:
         self.checkout(branch)
 
     def get_local_branches(self) -> List[LocalBranchShortName]:
-        if self.__local_branches_cached is None:
-            self.__load_branches()
+        with self.__lock:
+            if self.__local_branches_cached is None:
+                self.__load_branches()
         assert self.__local_branches_cached is not None
         return self.__local_branches_cached
 
     def get_remote_branches(self) -> List[RemoteBranchShortName]:
-        if self.__remote_branches_cached is None:
-            self.__load_branches()
+        with self.__lock:
+            if self.__remote_branches_cached is None:
+                self.__load_branches()
         assert self.__remote_branches_cached is not None
         return self.__remote_branches_cached
 
+    def __get_branch_refs(self) -> List[Tuple[str, str]]:
+        if self.__are_ref_files_readable():
+            return read_refs(self.__get_common_git_dir(), prefixes=["refs/heads/", "refs/remotes/"])
+        result: List[Tuple[str, str]] = []
+        # Just like the direct reading, `%(objectname)` doesn't require git to open the commit objects.
+        for line in get_non_empty_lines(
+                self._popen_git("for-each-ref", "--format=%(refname)\t%(objectname)", "refs/heads", "refs/remotes").stdout):
+            values = line.split("\t")
+            if len(values) != 2:
+                raise UnexpectedMacheteException(
+                    f"`git for-each-ref` did not return exactly 2 values: `{values}` ({hex_repr(line)}).")
+            result.append((values[0], values[1]))
+        return result
+
     def __load_branches(self) -> None:
+        # Only names and hashes of branches are loaded here;
+        # committer dates and upstreams are only loaded once needed (see `__load_branch_committer_dates` and `__load_upstreams`).
         self.__commit_hash_by_revision_cached = {}
-        self.__committer_unix_timestamp_by_revision_cached = {}
-        self.__counterparts_for_fetching_cached = {}
         self.__local_branches_cached = []
-        self.__removed_from_remote = set()
         self.__remote_branches_cached = []
-        self.__tree_hash_by_commit_hash_cached = {}
+        if self.__tree_hash_by_commit_hash_cached is None:
+            self.__tree_hash_by_commit_hash_cached = {}
+
+        for refname, commit_hash in self.__get_branch_refs():
+            if refname.startswith("refs/remotes/"):
+                self.__remote_branches_cached += [RemoteBranchFullName.of(refname).to_short_name()]
+                self.__commit_hash_by_revision_cached[RemoteBranchFullName.of(refname)] = FullCommitHash.of(commit_hash)
+            else:
+                self.__local_branches_cached += [LocalBranchFullName.of(refname).to_short_name()]
+                self.__commit_hash_by_revision_cached[LocalBranchFullName.of(refname)] = FullCommitHash.of(commit_hash)
 
+    def __load_branch_committer_dates(self) -> None:
+        # Unlike names and hashes, these require git to open every commit object pointed to by a branch.
+        self.__committer_unix_timestamp_by_revision_cached = {}
+        if self.__tree_hash_by_commit_hash_cached is None:
+            self.__tree_hash_by_commit_hash_cached = {}
         # Using 'committerdate:raw' instead of 'committerdate:unix' since the latter isn't supported by some older versions of git.
-        raw_remote = get_non_empty_lines(
-            self._popen_git("for-each-ref", "--format=%(refname)\t%(objectname)\t%(tree)\t%(committerdate:raw)", "refs/remotes").stdout)
-        for line in raw_remote:
+        for line in get_non_empty_lines(self._popen_git(
+                "for-each-ref", "--format=%(refname)\t%(objectname)\t%(tree)\t%(committerdate:raw)", "refs/heads", "refs/remotes").stdout):
             values = line.split("\t")
             if len(values) != 4:
                 raise UnexpectedMacheteException(
-                    "`git for-each-ref` did not return exactly 4 values for `refs/remotes`: "
+                    "`git for-each-ref` did not return exactly 4 values: "
                     f"`{values}` ({hex_repr(line)}).")
             branch, commit_hash, tree_hash, committer_unix_timestamp_and_time_zone = values
-            b_stripped_remote = RemoteBranchFullName.of(branch).to_short_name()
-            self.__remote_branches_cached += [b_stripped_remote]
-            self.__commit_hash_by_revision_cached[RemoteBranchFullName.of(branch)] = FullCommitHash.of(commit_hash)
+            # Tree hashes come at no extra cost here.
             self.__tree_hash_by_commit_hash_cached[FullCommitHash.of(commit_hash)] = FullTreeHash.of(tree_hash)
-            self.__committer_unix_timestamp_by_revision_cached[RemoteBranchFullName.of(branch)] = int(
+            self.__committer_unix_timestamp_by_revision_cached[AnyBranchName.of(branch)] = int(
                 committer_unix_timestamp_and_time_zone.split(' ')[0])
 
-        raw_local = get_non_empty_lines(
-            self._popen_git("for-each-ref", "--format=%(refname)\t%(objectname)\t%(tree)\t%(committerdate:raw)\t%(upstream)",
-                            "refs/heads").stdout)
-
-        for line in raw_local:
+    def __load_upstreams(self) -> None:
+        self.__counterparts_for_fetching_cached = {}
+        self.__removed_from_remote = set()
+        remote_branches = self.get_remote_branches()
+        # `%(upstream)` is resolved from the config alone, without opening any objects.
+        for line in get_non_empty_lines(self._popen_git("for-each-ref", "--format=%(refname)\t%(upstream)", "refs/heads").stdout):
             values = line.split("\t")
-            if len(values) != 5:
+            if len(values) != 2:
                 raise UnexpectedMacheteException(
-                    "`git for-each-ref` did not return exactly 5 values for `refs/heads`: "
+                    "`git for-each-ref` did not return exactly 2 values for `refs/heads`: "
                     f"`{values}` ({hex_repr(line)})")
-            branch, commit_hash, tree_hash, committer_unix_timestamp_and_time_zone, fetch_counterpart = values
+            branch, fetch_counterpart = values
             b_stripped_local = LocalBranchFullName.of(branch).to_short_name()
             # fetch_counterpart might be empty, or might even point to a local branch
             # (in case `branch.BRANCH.remote` config is set to `.`).
@@ -879,39 +1150,41 @@ class Git:
                 fetch_counterpart_stripped = RemoteBranchFullName.of(fetch_counterpart).to_short_name()
             else:
                 fetch_counterpart_stripped = None
-            self.__local_branches_cached += [b_stripped_local]
-            self.__commit_hash_by_revision_cached[LocalBranchFullName.of(branch)] = FullCommitHash.of(commit_hash)
-            self.__tree_hash_by_commit_hash_cached[FullCommitHash.of(commit_hash)] = FullTreeHash.of(tree_hash)
-            self.__committer_unix_timestamp_by_revision_cached[LocalBranchFullName.of(branch)] = int(
-                committer_unix_timestamp_and_time_zone.split(' ')[0])
-            if fetch_counterpart_stripped in self.__remote_branches_cached:
+            if fetch_counterpart_stripped in remote_branches:
                 self.__counterparts_for_fetching_cached[b_stripped_local] = fetch_counterpart_stripped
             elif fetch_counterpart_stripped is not None:
                 self.__removed_from_remote.add(b_stripped_local)
 
     # === Log & reflog ===
 
-    def __get_log_hashes(self, revision: AnyRevision, max_count: Optional[int]) -> List[FullCommitHash]:
-        opts = ([f"--max-count={str(max_count)}"] if max_count else []) + ["--format=%H", revision.full_name()]
-        return [FullCommitHash.of(line) for line in get_non_empty_lines(self._popen_git("log", *opts).stdout)]
-
     # Since getting the full history of a branch can be an expensive operation for large repositories
-    # (compared to all other underlying git operations), there are two optimizations in place:
-    # 1. we first fetch only a couple of first commits in the history,
-    # 2. if these first commits aren't enough for the purpose, we fetch more, but only up to the hard limit,
-    #    to avoid time-unbounded operations on really large repos.
-    def spoonfeed_log_hashes(self, branch_full_hash: FullCommitHash, *, initial_count: int, total_count: int) -> Iterator[FullCommitHash]:
-        if branch_full_hash not in self.__initial_log_hashes_cached:
-            self.__initial_log_hashes_cached[branch_full_hash] = \
-                self.__get_log_hashes(branch_full_hash, max_count=initial_count)
-        for hash in self.__initial_log_hashes_cached[branch_full_hash]:
-            yield FullCommitHash.of(hash)
-
-        if branch_full_hash not in self.__remaining_log_hashes_cached:
-            self.__remaining_log_hashes_cached[branch_full_hash] = \
-                self.__get_log_hashes(branch_full_hash, max_count=total_count)[initial_count:]
-        for hash in self.__remaining_log_hashes_cached[branch_full_hash]:
-            yield FullCommitHash.of(hash)
+    # (compared to all other underlying git operations), the history is read lazily (and only up to the hard limit,
+    # to avoid time-unbounded operations on really large repos), and is shared between the branches whose histories converge.
+    # Listings are keyed by commit hashes, so they never need to be flushed.
+    def spoonfeed_log_hashes(self, branch_full_hash: FullCommitHash, *, total_count: int) -> Generator[FullCommitHash, None, None]:
+        with closing(self.__history_walks.iter_history(branch_full_hash)) as hashes:
+            for hash in itertools.islice(hashes, total_count):
+                yield FullCommitHash.of(hash)
+
+    # For when the histories of many branches are known to be needed at once: rather than one walk per branch,
+    # all of them are read from a single `git rev-list` stream (which is killed once the block exits).
+    @contextmanager
+    def spoonfeeding_log_hashes_of_many(
+            self, branch_full_hashes: Sequence[FullCommitHash], *, total_count: int) -> Iterator[List[Iterator[FullCommitHash]]]:
+        if not branch_full_hashes:
+            yield []
+            return
+        # Reading the history of a single branch would take at most `total_count` lines, hence the same bound for the joint walk,
+        # so that a branch much older than the others doesn't make the walk read through the entire history since then.
+        walk = JointHistoryWalk(self._stream_git("rev-list", "--timestamp", "--parents", *branch_full_hashes, "--"),
+                                fall_back_to=self.__history_walks.iter_history, max_line_count_per_tip=total_count)
+        histories = [walk.iter_history(hash) for hash in branch_full_hashes]
+        try:
+            yield [map(FullCommitHash.of, itertools.islice(history, total_count)) for history in histories]
+        finally:
+            for history in histories:
+                history.close()
+            walk.close()
 
     def __load_all_reflogs(self) -> None:
         # %gd - reflog selector (refname@{num})
@@ -949,17 +1222,37 @@ class Git:
                 self.__reflogs_cached[any_branch_name] = []
             self.__reflogs_cached[any_branch_name] += [GitReflogEntry(hash=FullCommitHash.of(hash), reflog_subject=subject)]
 
+    def get_reflog_file_path_or_none(self, branch: AnyBranchName) -> Optional[AbsPath]:
+        """`None` if the reflog of the given branch can't be read directly from a file (see `get_reflog`)."""
+        if branch.startswith("refs/") and self.__are_ref_files_readable():
+            return self.__get_common_git_dir().join_fragments("logs", *branch.split("/"))
+        return None
+
+    def __read_reflog_file(self, branch: AnyBranchName) -> List[GitReflogEntry]:
+        path = self.__get_common_git_dir().join_fragments("logs", *branch.split("/"))
+        return [GitReflogEntry(hash=FullCommitHash.of(entry.hash), reflog_subject=entry.subject)
+                for entry in read_reflog_newest_first(path)]
+
     def get_reflog(self, branch: AnyBranchName) -> List[GitReflogEntry]:
+        # Reflogs of branches (unlike the one of `HEAD`) are shared between all worktrees,
+        # and reading them directly saves a `git reflog show` subprocess and all the parsing of its formatted output.
+        # Fully-qualified names are required, though: resolving a short name is a job best left to git.
+        if branch.startswith("refs/") and self.__are_ref_files_readable():
+            if branch not in self.__reflog_files_cached:
+                self.__reflog_files_cached[branch] = self.__read_reflog_file(branch)
+            return self.__reflog_files_cached[branch]
         # Git version `RELIABLE_MULTI_BRANCH_REFLOG` fixed a bug that made fetching reflog of more than
         # one branch at the same time unreliable in certain cases
         if self.get_git_version() >= RELIABLE_MULTI_BRANCH_REFLOG:
-            if self.__reflogs_cached is None:
-                self.__load_all_reflogs()
+            with self.__lock:
+                if self.__reflogs_cached is None:
+                    self.__load_all_reflogs()
             assert self.__reflogs_cached is not None
             return self.__reflogs_cached.get(branch, [])
         else:
-            if self.__reflogs_cached is None:
-                self.__reflogs_cached = {}
+            with self.__lock:
+                if self.__reflogs_cached is None:
+                    self.__reflogs_cached = {}
             if branch not in self.__reflogs_cached:
                 # %H - full hash
                 # %gs - reflog subject
@@ -974,9 +1267,12 @@ class Git:
     # === Branch creation & current-branch detection ===
 
     def create_branch(self, branch: LocalBranchShortName, out_of_revision: AnyRevision, *, switch_head: bool) -> None:  # noqa: KW101
-        self._run_git("branch", branch, out_of_revision, flush_caches=True)
+        # Tracking might get set up depending on `branch.autoSetupMerge` config and the kind of `out_of_revision`.
+        with self.__invalidating_caches(refs=[branch.full_name()], branch_lists=True, upstreams=True, config=True):
+            self._run_git("branch", branch, out_of_revision, flush_caches=False)
         if switch_head:
-            self._run_git("checkout", branch, flush_caches=True)
+            with self.__invalidating_caches(refs=["HEAD"]):
+                self._run_git("checkout", branch, flush_caches=False)
 
     def get_currently_bisected_branch_or_none(self) -> Optional[LocalBranchShortName]:
         bisect_start_file = self.get_current_worktree_git_subpath("BISECT_START")
@@ -1039,6 +1335,10 @@ class Git:
             raise UnderlyingGitException(
                 "Revert in progress. Conclude the revert first with `git revert --continue` or `git revert --abort`.")
 
+    def __get_refs_updated_via_head(self) -> List[str]:
+        current_branch = self.get_currently_checked_out_branch_or_none()
+        return ["HEAD"] + ([current_branch.full_name()] if current_branch else [])
+
     def get_current_branch_or_none(self) -> Optional[LocalBranchShortName]:
         return self.get_currently_checked_out_branch_or_none() or self.get_currently_rebased_branch_or_none()
 
@@ -1050,21 +1350,111 @@ class Git:
 
     # === Merge-base & ancestry ===
 
-    def __get_merge_base_cache_path(self) -> AbsPath:
+    def enable_in_process_ancestry(self) -> None:
+        self.__in_process_ancestry_enabled = True
+
+    def __get_commit_graph(self) -> Optional[CommitGraph]:
+        """The region of history between the local branches (plus their remote counterparts) and their common ancestor,
+        loaded with a single `git rev-list` so that most merge-base and ancestry queries can be answered without spawning git.
+
+        Note that the graph is deliberately retained across `flush_caches`:
+        ancestry between already existing commits never changes, and commits created later are simply not found in the graph
+        (which makes the queries involving them fall back to `git merge-base`).
+        """
+        if not self.__in_process_ancestry_enabled:
+            return None
+        with self.__lock:
+            if not self.__commit_graph_load_attempted:
+                self.__commit_graph_load_attempted = True
+                tips: Set[FullCommitHash] = set()
+                for branch in self.get_local_branches():
+                    for ref in (branch, self.get_combined_counterpart_for_fetching_of_branch(branch)):
+                        commit_hash = self.get_commit_hash_by_revision(ref) if ref else None
+                        if commit_hash:
+                            tips.add(commit_hash)
+                if not tips:
+                    return None
+                # For branches with unrelated histories, there's no common base to bound the walk - let's just stick to `git merge-base`.
+                base = self._popen_git("merge-base", "--octopus", *sorted(tips), allow_non_zero=True).stdout.strip()
+                if not base:
+                    return None
+                lines = get_non_empty_lines(self._popen_git(
+                    "rev-list", "--parents", "--boundary", f"--max-count={MAX_COMMITS_FOR_IN_PROCESS_ANCESTRY + 1}",
+                    # Excluding the parents of the base rather than the base itself, so that the base (often the tip of the root branch)
+                    # stays within the graph.
+                    *sorted(tips), f"^{base}^@").stdout)
+                interior_commit_count = sum(1 for line in lines if not line.startswith("-"))
+                if interior_commit_count > MAX_COMMITS_FOR_IN_PROCESS_ANCESTRY:
+                    debug(f"more than {MAX_COMMITS_FOR_IN_PROCESS_ANCESTRY} commits since {base}, not loading the commit graph")
+                    return None
+                self.__commit_graph_cached = CommitGraph(lines)
+                debug(f"loaded commit graph of {len(self.__commit_graph_cached)} commit(s) since {base}")
+        return self.__commit_graph_cached
+
+    def defer_persistent_cache_writes(self) -> None:
+        """From now on, the writes to the persistent (merge-base and patch-id) caches are only queued in memory
+        until `write_deferred_persistent_caches` - so that a thread abandoned halfway through can't leave any of these files torn."""
+        with self.__lock:
+            self.__deferred_persistent_cache_writes = []
+
+    def write_deferred_persistent_caches(self) -> None:
+        with self.__lock:
+            writes, self.__deferred_persistent_cache_writes = self.__deferred_persistent_cache_writes or [], None
+        for write in writes:
+            write()
+
+    def __write_persistent_cache(self, write: Callable[[], None]) -> None:
+        with self.__lock:
+            if self.__deferred_persistent_cache_writes is not None:
+                self.__deferred_persistent_cache_writes.append(write)
+                return
+        write()
+
+    def __get_merge_base_cache_file(self) -> RecordFile:
+        # Under a name of its own, so that git-machete up to v3.44.1 (which only understands the text format)
+        # can keep using the legacy file in the same repository.
+        return RecordFile(self.get_main_worktree_git_dir().join_fragments("machete-merge-base-cache-v2"),
+                          magic=_MERGE_BASE_CACHE_MAGIC, record_size=3 * _RAW_HASH_LENGTH)
+
+    def __get_legacy_merge_base_cache_path(self) -> AbsPath:
         return self.get_main_worktree_git_dir().join_fragments("machete-merge-base-cache")
 
     def __load_merge_base_cache(self) -> None:
         """Load merge-base cache from file. Called lazily on first use."""
-        if self._merge_base_cached is not None:
-            return
-
-        self._merge_base_cached = {}
-        cache_path = self.__get_merge_base_cache_path()
-        if not os.path.exists(cache_path):
-            return
-
-        debug(f"reading merge-base cache from {cache_path}")
-        with open(cache_path, 'r') as f:
+        with self.__lock:
+            if self._merge_base_cached is not None:
+                return
+
+            self._merge_base_cached = {}
+            cache_file = self.__get_merge_base_cache_file()
+            debug(f"reading merge-base cache from {cache_file.path}")
+            records = cache_file.read()
+            if records is None:
+                debug(f"{cache_file.path}: unexpected header, discarding")
+                self.__rewrite_merge_base_cache(cache_file)
+                return
+            legacy_cache_path = self.__get_legacy_merge_base_cache_path()
+            if not os.path.exists(cache_file.path) and os.path.exists(legacy_cache_path):
+                # Importing just once: the legacy file is never written to, and once the current one exists, it's no longer read.
+                self.__load_legacy_merge_base_cache(legacy_cache_path)
+                self.__rewrite_merge_base_cache(cache_file)
+                return
+
+            no_merge_base = bytes(_RAW_HASH_LENGTH)
+            for record in records:
+                hash1 = FullCommitHash.of(record[:_RAW_HASH_LENGTH].hex())
+                hash2 = FullCommitHash.of(record[_RAW_HASH_LENGTH:2 * _RAW_HASH_LENGTH].hex())
+                raw_merge_base = record[2 * _RAW_HASH_LENGTH:]
+                self._merge_base_cached[(hash1, hash2)] = \
+                    FullCommitHash.of(raw_merge_base.hex()) if raw_merge_base != no_merge_base else None
+            if len(records) > MAX_MERGE_BASE_CACHE_ENTRIES:
+                self.__compact_merge_base_cache(cache_file)
+
+    def __load_legacy_merge_base_cache(self, cache_path: AbsPath) -> None:
+        """Text format (`<hash1> <hash2> [<merge-base>]` per line) used by git-machete up to v3.44.1.
+        Undecodable bytes (for example, binary content written by an unreleased git-machete) only make their lines invalid."""
+        assert self._merge_base_cached is not None
+        with open(cache_path, 'r', encoding="utf-8", errors="replace") as f:
             for line_num, line in enumerate(f, start=1):
                 line = line.strip()
                 if not line:
@@ -1087,24 +1477,45 @@ class Git:
                     debug(f"{cache_path}:{line_num}: invalid merge-base commit hash format, ignoring")
                     continue
 
-                hash1 = FullCommitHash.of(hash1_str)
-                hash2 = FullCommitHash.of(hash2_str)
+                hash1 = FullCommitHash.of(hash1_str.lower())
+                hash2 = FullCommitHash.of(hash2_str.lower())
                 # Normalize: ensure hash1 <= hash2
                 if hash1 > hash2:
                     hash1, hash2 = hash2, hash1
 
-                merge_base = FullCommitHash.of(merge_base_str) if merge_base_str else None
+                merge_base = FullCommitHash.of(merge_base_str.lower()) if merge_base_str else None
                 self._merge_base_cached[(hash1, hash2)] = merge_base
 
+    def __compact_merge_base_cache(self, cache_file: RecordFile) -> None:
+        """Evicts the entries for commits no longer reachable from any ref (typically: rebased or deleted branches),
+        and if that's not enough, also the oldest entries, so that the file doesn't need compacting again any time soon."""
+        assert self._merge_base_cached is not None
+        debug(f"compacting merge-base cache at {cache_file.path} ({len(self._merge_base_cached)} entries)")
+        reachable_hashes = self.__filter_reachable_commit_hashes({h for key in self._merge_base_cached for h in key})
+        entries = [(key, mb) for key, mb in self._merge_base_cached.items() if key[0] in reachable_hashes and key[1] in reachable_hashes]
+        # Dict preserves the insertion (and hence file) order, so the last entries are the most recently computed ones.
+        self._merge_base_cached = dict(entries[-(MAX_MERGE_BASE_CACHE_ENTRIES // 2):])
+        self.__rewrite_merge_base_cache(cache_file)
+
+    def __filter_reachable_commit_hashes(self, commit_hashes: Set[FullCommitHash]) -> Set[str]:
+        return {h for h in self._popen_git("rev-list", "--all").stdout.splitlines() if h in commit_hashes}
+
+    def __rewrite_merge_base_cache(self, cache_file: RecordFile) -> None:
+        assert self._merge_base_cached is not None
+        records = [self.__to_merge_base_cache_record(hash1=hash1, hash2=hash2, merge_base=merge_base)
+                   for (hash1, hash2), merge_base in self._merge_base_cached.items()]
+        self.__write_persistent_cache(lambda: cache_file.rewrite(records))
+
+    @staticmethod
+    def __to_merge_base_cache_record(*, hash1: FullCommitHash, hash2: FullCommitHash, merge_base: Optional[FullCommitHash]) -> bytes:
+        return bytes.fromhex(hash1) + bytes.fromhex(hash2) + (bytes.fromhex(merge_base) if merge_base else bytes(_RAW_HASH_LENGTH))
+
     def __save_merge_base_cache_entry(self, *, hash1: FullCommitHash, hash2: FullCommitHash, merge_base: Optional[FullCommitHash]) -> None:
         """Append a merge-base cache entry to the cache file."""
-        cache_path = self.__get_merge_base_cache_path()
-        with open(cache_path, 'a') as f:
-            debug(f"writing merge-base cache entry to {cache_path}: {hash1} {hash2} {merge_base or '(no merge-base)'}")
-            if merge_base is not None:
-                f.write(f"{hash1} {hash2}  {merge_base}\n")
-            else:
-                f.write(f"{hash1} {hash2}\n")
+        cache_file = self.__get_merge_base_cache_file()
+        debug(f"writing merge-base cache entry to {cache_file.path}: {hash1} {hash2} {merge_base or '(no merge-base)'}")
+        records = [self.__to_merge_base_cache_record(hash1=hash1, hash2=hash2, merge_base=merge_base)]
+        self.__write_persistent_cache(lambda: cache_file.append(records))
 
     def __get_merge_base_for_commit_hashes(self, hash1: FullCommitHash, hash2: FullCommitHash) -> Optional[FullCommitHash]:  # noqa: KW
         # This if statement is not changing the outcome of the later return, but it enhances the efficiency of the script.
@@ -1134,7 +1545,10 @@ class Git:
             # In the rare case when hash1, hash2 have no common commits, the flag: allow_non_zero=True
             # (allows, non zero exit code to be returned by git merge-base command, without raising an exception)
             # is used and the __get_merge_base function returns None.
-            merge_base = self._popen_git("merge-base", hash1, hash2, allow_non_zero=True).stdout.strip()
+            commit_graph = self.__get_commit_graph()
+            answered, merge_base = commit_graph.get_merge_base(hash1, hash2) if commit_graph else (False, None)
+            if not answered:
+                merge_base = self._popen_git("merge-base", hash1, hash2, allow_non_zero=True).stdout.strip()
             merge_base_hash = FullCommitHash.of(merge_base) if merge_base else None
             self._merge_base_cached[hash1, hash2] = merge_base_hash
             # Save to cache file
@@ -1146,6 +1560,11 @@ class Git:
         later_hash = self.get_commit_hash_by_revision(later_revision)
         if not earlier_hash or not later_hash:
             return False
+        commit_graph = self.__get_commit_graph()
+        if commit_graph:
+            answer = commit_graph.is_ancestor_or_equal(earlier_hash, later_hash)
+            if answer is not None:
+                return answer
         return self.__get_merge_base_for_commit_hashes(earlier_hash, later_hash) == earlier_hash
 
     def is_ancestor(self, earlier_revision: AnyRevision, later_revision: AnyRevision) -> bool:  # noqa: KW
@@ -1193,17 +1612,16 @@ class Git:
         tree_hash_for_equivalent_to = self.get_tree_hash_by_commit_hash(equivalent_to_commit_hash)
 
         # `git log ^equivalent_to_commit_hash reachable_from_commit_hash`
-        # shows all commits reachable from reachable_from_commit_hash but NOT from equivalent_to_commit_hash
-        tree_hashes_for_reachable_from = get_non_empty_lines(
-            self._popen_git(
-                "log",
-                "--format=%T",  # full commit's tree hash
-                "^" + equivalent_to_commit_hash,
-                reachable_from_commit_hash
-            ).stdout
-        )
-
-        result = tree_hash_for_equivalent_to in tree_hashes_for_reachable_from
+        # shows all commits reachable from reachable_from_commit_hash but NOT from equivalent_to_commit_hash.
+        # For recently squash-merged branches, the matching tree is typically near the top,
+        # so the rest of the history doesn't even need to be listed.
+        with closing(self._stream_git(
+            "log",
+            "--format=%T",  # full commit's tree hash
+            "^" + equivalent_to_commit_hash,
+            reachable_from_commit_hash
+        )) as tree_hashes_for_reachable_from:
+            result = any(tree_hash == tree_hash_for_equivalent_to for tree_hash in tree_hashes_for_reachable_from)
         debug(f"tree_hash_for_equivalent_to in tree_hashes_for_reachable_from = {result}")
         self.__is_equivalent_tree_reachable_cached[equivalent_to_commit_hash, reachable_from_commit_hash] = result
         return result
@@ -1231,17 +1649,13 @@ class Git:
         if not common_ancestor:
             return False
 
-        changes_of_equivalent_to = self._popen_git(
-            "diff",
-            common_ancestor,
-            equivalent_to_commit_hash
-        ).stdout
-        if changes_of_equivalent_to.strip() == '':
+        has_changes, patch_id_for_changes_of_equivalent_to = self.__get_patch_id_for_changes(
+            earliest_exclusive=common_ancestor, latest_inclusive=equivalent_to_commit_hash)
+        if not has_changes:
             # Empty changeset means the branches are identical, so the tree is equivalent.
             self.__is_equivalent_patch_reachable_cached[equivalent_to_commit_hash, reachable_from_commit_hash] = True
             return True
 
-        patch_id_for_changes_of_equivalent_to: Optional[FullPatchId] = self.__get_patch_id_for_diff(changes_of_equivalent_to)
         patch_ids_for_commits_of_reachable_from: Set[FullPatchId] = set(
             self.__get_patch_ids_for_commits_between(
                 earliest_exclusive=common_ancestor,
@@ -1253,6 +1667,13 @@ class Git:
         self.__is_equivalent_patch_reachable_cached[equivalent_to_commit_hash, reachable_from_commit_hash] = result
         return result
 
+    def __get_patch_id_for_changes(
+            self, *, earliest_exclusive: FullCommitHash, latest_inclusive: FullCommitHash) -> Tuple[bool, Optional[FullPatchId]]:
+        changes = self._popen_git("diff", earliest_exclusive, latest_inclusive).stdout
+        if changes.strip() == '':
+            return False, None
+        return True, self.__get_patch_id_for_diff(changes)
+
     def __get_patch_id_for_diff(self, patch_contents: str) -> Optional[FullPatchId]:
         lines = get_non_empty_lines(self._popen_git("patch-id", input=patch_contents).stdout)
 
@@ -1264,21 +1685,206 @@ class Git:
         # as we only care about the patch-id, not commit-hash.
         return FullPatchId.of(lines[0].split(' ')[0])
 
+    # Bulk counterparts of `is_equivalent_tree_reachable`/`is_equivalent_patch_reachable` for many `equivalent_to` candidates
+    # sharing the same `reachable_from` (typically: all children of one parent branch).
+    # Rather than walking the history of `reachable_from` once per candidate, the history down to the common ancestor
+    # of all the merge-bases is walked just once, and then, for each candidate, the commits that are ancestors
+    # of its own merge-base are filtered out in-process.
+    # The results are also put into the same (commit hash-keyed) caches as the results of the single-candidate methods.
+
+    def are_equivalent_trees_reachable(
+            self,
+            *,
+            equivalent_to: Sequence[AnyRevision],
+            reachable_from: AnyRevision,
+    ) -> List[bool]:
+        prepared = self.__prepare_bulk_equivalence_check(
+            equivalent_to=equivalent_to, reachable_from=reachable_from, cache=self.__is_equivalent_tree_reachable_cached)
+        if prepared is None:
+            return [self.is_equivalent_tree_reachable(equivalent_to=e, reachable_from=reachable_from) for e in equivalent_to]
+        reachable_from_commit_hash, merge_base_by_candidate, history, commit_graph = prepared
+
+        commit_hashes_by_tree_hash: Dict[FullTreeHash, List[FullCommitHash]] = {}
+        for commit_hash, tree_hash in history:
+            commit_hashes_by_tree_hash.setdefault(tree_hash, []).append(commit_hash)
+        for candidate, merge_base in merge_base_by_candidate.items():
+            candidate_tree_hash = self.get_tree_hash_by_commit_hash(candidate)
+            # Commits with the same tree as the candidate are rare, so it's cheap to check each of them for ancestry individually.
+            # Note that if the merge-base lies outside the walked history (`None`), then none of the walked commits is its ancestor.
+            result = candidate_tree_hash is not None and any(
+                commit_graph.is_ancestor_or_equal(commit_hash, merge_base) is not True
+                for commit_hash in commit_hashes_by_tree_hash.get(candidate_tree_hash, []))
+            debug(f"tree of {candidate} reachable from {reachable_from_commit_hash} = {result}")
+            self.__is_equivalent_tree_reachable_cached[candidate, reachable_from_commit_hash] = result
+        return [self.is_equivalent_tree_reachable(equivalent_to=e, reachable_from=reachable_from) for e in equivalent_to]
+
+    def are_equivalent_patches_reachable(
+            self,
+            *,
+            equivalent_to: Sequence[AnyRevision],
+            reachable_from: AnyRevision,
+    ) -> List[bool]:
+        prepared = self.__prepare_bulk_equivalence_check(
+            equivalent_to=equivalent_to, reachable_from=reachable_from, cache=self.__is_equivalent_patch_reachable_cached)
+        if prepared is None:
+            return [self.is_equivalent_patch_reachable(equivalent_to=e, reachable_from=reachable_from) for e in equivalent_to]
+        reachable_from_commit_hash, merge_base_by_candidate, history, commit_graph = prepared
+
+        commit_hashes_by_candidate: Dict[FullCommitHash, List[FullCommitHash]] = {}
+        patch_id_by_candidate: Dict[FullCommitHash, Optional[FullPatchId]] = {}
+        for candidate, merge_base in merge_base_by_candidate.items():
+            has_changes, patch_id_by_candidate[candidate] = self.__get_patch_id_for_changes(
+                earliest_exclusive=merge_base, latest_inclusive=candidate)
+            if not has_changes:
+                # Empty changeset means the branches are identical, so the tree is equivalent.
+                self.__is_equivalent_patch_reachable_cached[candidate, reachable_from_commit_hash] = True
+                continue
+            ancestors_of_merge_base = commit_graph.get_ancestors_or_equal(merge_base)
+            commit_hashes_by_candidate[candidate] = [commit_hash for commit_hash, _ in history
+                                                     if commit_hash not in ancestors_of_merge_base][:MAX_COMMITS_FOR_SQUASH_MERGE_DETECTION]
+
+        # Patch-ids for all candidates are computed in one go.
+        patch_id_for_commit = self.__get_patch_ids_for_commits(
+            list(dict.fromkeys(commit_hash for commit_hashes in commit_hashes_by_candidate.values() for commit_hash in commit_hashes)))
+        for candidate, commit_hashes in commit_hashes_by_candidate.items():
+            result = patch_id_by_candidate[candidate] in {patch_id_for_commit.get(commit_hash) for commit_hash in commit_hashes}
+            debug(f"patch of {candidate} reachable from {reachable_from_commit_hash} = {result}")
+            self.__is_equivalent_patch_reachable_cached[candidate, reachable_from_commit_hash] = result
+        return [self.is_equivalent_patch_reachable(equivalent_to=e, reachable_from=reachable_from) for e in equivalent_to]
+
+    def __prepare_bulk_equivalence_check(
+            self,
+            *,
+            equivalent_to: Sequence[AnyRevision],
+            reachable_from: AnyRevision,
+            cache: Dict[Tuple[FullCommitHash, FullCommitHash], bool],
+    ) -> Optional[Tuple[FullCommitHash, Dict[FullCommitHash, FullCommitHash], List[Tuple[FullCommitHash, FullTreeHash]], CommitGraph]]:
+        """Returns `None` if there's nothing to gain from the bulk mode, and the single-candidate methods should be used instead.
+
+        Otherwise, returns the hash of `reachable_from`, merge-bases of those candidates that aren't cached yet,
+        and (in the usual `git log` order) commits + their trees reachable from `reachable_from`,
+        but not from the merge-bases' common ancestor, along with the graph of these commits.
+        """
+        reachable_from_commit_hash = self.get_commit_hash_by_revision(reachable_from)
+        if not reachable_from_commit_hash:
+            return None
+        merge_base_by_candidate: Dict[FullCommitHash, FullCommitHash] = {}
+        for candidate in equivalent_to:
+            candidate_commit_hash = self.get_commit_hash_by_revision(candidate)
+            if not candidate_commit_hash or candidate_commit_hash == reachable_from_commit_hash \
+                    or (candidate_commit_hash, reachable_from_commit_hash) in cache:
+                continue
+            merge_base = self.get_merge_base(reachable_from_commit_hash, candidate_commit_hash)
+            if not merge_base:
+                # Unrelated histories - rare enough to not bother.
+                return None
+            merge_base_by_candidate[candidate_commit_hash] = merge_base
+        if len(merge_base_by_candidate) < 2:
+            return None
+
+        merge_bases = sorted(set(merge_base_by_candidate.values()))
+        base = merge_bases[0] if len(merge_bases) == 1 else \
+            self._popen_git("merge-base", "--octopus", *merge_bases, allow_non_zero=True).stdout.strip()
+        # All merge-bases are ancestors of reachable_from, so they're unlikely to be unrelated.
+        if not base:  # pragma: no cover
+            return None
+        history: List[Tuple[FullCommitHash, FullTreeHash]] = []
+        commit_graph_lines: List[str] = []
+        for line in get_non_empty_lines(self._popen_git("log", "--format=%H %T %P", f"^{base}", reachable_from_commit_hash, "--").stdout):
+            commit_hash, tree_hash, *parent_hashes = line.split(" ")
+            history.append((FullCommitHash.of(commit_hash), FullTreeHash(tree_hash)))
+            # `%P` is empty for root commits.
+            commit_graph_lines.append(" ".join([commit_hash] + [parent_hash for parent_hash in parent_hashes if parent_hash]))
+        return reachable_from_commit_hash, merge_base_by_candidate, history, CommitGraph(commit_graph_lines)
+
+    def __get_patch_id_cache_file(self) -> RecordFile:
+        return RecordFile(self.get_main_worktree_git_dir().join_fragments("machete-patch-id-cache"),
+                          magic=_PATCH_ID_CACHE_MAGIC, record_size=2 * _RAW_HASH_LENGTH)
+
+    def __load_patch_id_cache(self) -> Dict[FullCommitHash, Optional[FullPatchId]]:
+        """Patch-id of a commit never changes, so unlike most other caches, this one is persisted and never flushed."""
+        with self.__lock:
+            if self.__patch_id_by_commit_hash_cached is None:
+                self.__patch_id_by_commit_hash_cached = {}
+                cache_file = self.__get_patch_id_cache_file()
+                debug(f"reading patch-id cache from {cache_file.path}")
+                records = cache_file.read()
+                if records is None:
+                    debug(f"{cache_file.path}: unknown format, discarding")
+                    self.__write_persistent_cache(lambda: cache_file.rewrite([]))
+                    records = []
+                no_patch_id = bytes(_RAW_HASH_LENGTH)
+                for record in records:
+                    raw_patch_id = record[_RAW_HASH_LENGTH:]
+                    self.__patch_id_by_commit_hash_cached[FullCommitHash.of(record[:_RAW_HASH_LENGTH].hex())] = \
+                        FullPatchId(raw_patch_id.hex()) if raw_patch_id != no_patch_id else None
+                if len(records) > MAX_PATCH_ID_CACHE_ENTRIES:
+                    self.__compact_patch_id_cache(cache_file)
+        return self.__patch_id_by_commit_hash_cached
+
+    def __compact_patch_id_cache(self, cache_file: RecordFile) -> None:
+        """Same eviction policy as for the merge-base cache: unreachable commits first, then the oldest entries."""
+        assert self.__patch_id_by_commit_hash_cached is not None
+        debug(f"compacting patch-id cache at {cache_file.path} ({len(self.__patch_id_by_commit_hash_cached)} entries)")
+        reachable_hashes = self.__filter_reachable_commit_hashes(set(self.__patch_id_by_commit_hash_cached))
+        entries = [(commit_hash, patch_id) for commit_hash, patch_id in self.__patch_id_by_commit_hash_cached.items()
+                   if commit_hash in reachable_hashes]
+        self.__patch_id_by_commit_hash_cached = dict(entries[-(MAX_PATCH_ID_CACHE_ENTRIES // 2):])
+        records = [self.__to_patch_id_cache_record(commit_hash=commit_hash, patch_id=patch_id)
+                   for commit_hash, patch_id in self.__patch_id_by_commit_hash_cached.items()]
+        self.__write_persistent_cache(lambda: cache_file.rewrite(records))
+
+    @staticmethod
+    def __to_patch_id_cache_record(*, commit_hash: FullCommitHash, patch_id: Optional[FullPatchId]) -> bytes:
+        return bytes.fromhex(commit_hash) + (bytes.fromhex(patch_id) if patch_id else bytes(_RAW_HASH_LENGTH))
+
     def __get_patch_ids_for_commits_between(
             self, *, earliest_exclusive: AnyRevision, latest_inclusive: AnyRevision, max_commits: int
     ) -> Dict[FullCommitHash, FullPatchId]:
-        patches = self._popen_git("log", "--patch", f"^{earliest_exclusive}", latest_inclusive, f"-{max_commits}", "--").stdout
-        patch_id_output = self._popen_git("patch-id", input=patches).stdout
+        commit_hashes = [FullCommitHash.of(h) for h in get_non_empty_lines(
+            self._popen_git("rev-list", f"^{earliest_exclusive}", latest_inclusive, f"--max-count={max_commits}", "--").stdout)]
+        return self.__get_patch_ids_for_commits(commit_hashes)
+
+    def __get_patch_ids_for_commits(self, commit_hashes: List[FullCommitHash]) -> Dict[FullCommitHash, FullPatchId]:
+        patch_id_cache = self.__load_patch_id_cache()
+        missing_commit_hashes = [h for h in commit_hashes if h not in patch_id_cache]
+        if missing_commit_hashes:
+            computed_patch_ids = self.__compute_patch_ids_for_commits(missing_commit_hashes)
+            for commit_hash in missing_commit_hashes:
+                patch_id_cache[commit_hash] = computed_patch_ids.get(commit_hash)
+            cache_file = self.__get_patch_id_cache_file()
+            debug(f"writing {len(missing_commit_hashes)} patch-id cache entries to {cache_file.path}")
+            records = [self.__to_patch_id_cache_record(commit_hash=commit_hash, patch_id=patch_id_cache[commit_hash])
+                       for commit_hash in missing_commit_hashes]
+            self.__write_persistent_cache(lambda: cache_file.append(records))
+
+        patch_id_for_commit: Dict[FullCommitHash, FullPatchId] = {}
+        for commit_hash in commit_hashes:
+            patch_id = patch_id_cache[commit_hash]
+            if patch_id is not None:
+                patch_id_for_commit[commit_hash] = patch_id
+        return patch_id_for_commit
+
+    def __compute_patch_ids_for_commits(self, commit_hashes: List[FullCommitHash]) -> Dict[FullCommitHash, FullPatchId]:
+        # Passing the hashes via stdin, as there might be too many of them for a command line (esp. on Windows).
+        log_args = ("log", "--patch", "--no-walk=unsorted", "--stdin")
+        log_input = "\n".join(commit_hashes) + "\n"
 
         patch_id_for_commit: Dict[FullCommitHash, FullPatchId] = {}
         # See issue #1329 for why git version `PATCH_ID_UNSTABLE_OUTPUT_ORDER` (but not <=2.46.0 or >=2.46.2) needs a special treatment
         if self.get_git_version() == PATCH_ID_UNSTABLE_OUTPUT_ORDER:
-            commit_hashes = [line.replace('commit ', '') for line in patches.splitlines()
-                             if re.fullmatch('commit [0-9a-f]{40}', line)]  # noqa: FS003
-            for line, commit_hash in zip(patch_id_output.splitlines(), commit_hashes):
+            # Patches need to be inspected in Python here, so no streaming.
+            patches = self._popen_git(*log_args, input=log_input).stdout
+            patch_id_output = self._popen_git("patch-id", input=patches).stdout
+            logged_commit_hashes = [line.replace('commit ', '') for line in patches.splitlines()
+                                    if re.fullmatch('commit [0-9a-f]{40}', line)]  # noqa: FS003
+            for line, commit_hash in zip(patch_id_output.splitlines(), logged_commit_hashes):
                 patch_id, _ = line.strip().split(" ", 1)
                 patch_id_for_commit[FullCommitHash.of(commit_hash)] = FullPatchId(patch_id)
         else:
+            # Patches might be huge (think: vendored dependencies or generated files), so let's stream them straight into `git patch-id`
+            # rather than materializing them in Python.
+            patch_id_output = self._popen_git_pipeline(log_args, ("patch-id",), input=log_input).stdout
             for line in patch_id_output.splitlines():
                 patch_id, commit_hash = line.strip().split(" ", 1)
                 patch_id_for_commit[FullCommitHash.of(commit_hash)] = FullPatchId(patch_id)
@@ -1323,10 +1929,12 @@ class Git:
         # We need to specify the message explicitly to avoid 'refs/heads/' prefix getting into the message...
         commit_message = f"Merge branch '{branch}' into {into}"
         # ...since we prepend 'refs/heads/' to the merged branch name for unambiguity.
-        self._run_git("merge", "-m", commit_message, branch.full_name(), *extra_params, flush_caches=True)
+        with self.__invalidating_caches(refs=["HEAD", into.full_name()]):
+            self._run_git("merge", "-m", commit_message, branch.full_name(), *extra_params, flush_caches=False)
 
     def merge_fast_forward_only(self, branch: LocalBranchShortName) -> None:  # refs/heads/ prefix is assumed for 'branch'
-        self._run_git("merge", "--ff-only", branch.full_name(), flush_caches=True)
+        with self.__invalidating_caches(refs=self.__get_refs_updated_via_head()):
+            self._run_git("merge", "--ff-only", branch.full_name(), flush_caches=False)
 
     def rebase(self, onto: AnyRevision, from_exclusive: AnyRevision, branch: LocalBranchShortName,  # noqa: KW101
                *, opt_no_interactive_rebase: bool, extra_rebase_opts: List[str]) -> None:
@@ -1336,6 +1944,7 @@ class Git:
                 rebase_opts.append("--interactive")
             if self.get_git_version() >= REBASE_EMPTY_DROP:
                 rebase_opts.append("--empty=drop")
+            # Interactive rebase can stop and let the user run just about any command, hence a complete flush.
             self._run_git("rebase", *rebase_opts, "--onto", onto, from_exclusive, branch, flush_caches=True)
         finally:
             # https://public-inbox.org/git/317468c6-40cc-9f26-8ee3-3392c3908efb@talktalk.net/T
@@ -1376,6 +1985,66 @@ class Git:
                 self._popen_git("log", "--format=%H:%h:%s", f"^{earliest_exclusive}", latest_inclusive, "--").stdout)
         ]))
 
+    def get_commits_between_many(self, ranges: Sequence[Tuple[AnyRevision, AnyRevision]]) -> List[List[GitLogEntry]]:
+        """`get_commits_between` for each of the `(earliest_exclusive, latest_inclusive)` ranges, but with a single `git log`
+        over all of them (bounded by the merge-base of all the revisions involved), rather than one `git log` per range.
+        Commits are then attributed to the ranges in-process, each range in the very same order as `get_commits_between` lists it
+        (also when committer dates are equal), so that the output doesn't depend on which of the two ways is taken.
+        Falls back to one `git log` per range for unrelated histories, and whenever the bounded history turns out too long.
+        """
+        range_hashes = [(self.get_commit_hash_by_revision(earliest), self.get_commit_hash_by_revision(latest))
+                        for earliest, latest in ranges]
+        all_hashes = sorted({h for pair in range_hashes for h in pair if h})
+        if len(ranges) < 2 or len(all_hashes) < 2 or any(not earliest or not latest for earliest, latest in range_hashes):
+            return [self.get_commits_between(earliest, latest) for earliest, latest in ranges]
+        base = self._popen_git("merge-base", "--octopus", *all_hashes, allow_non_zero=True).stdout.strip()
+        if not base:
+            return [self.get_commits_between(earliest, latest) for earliest, latest in ranges]
+        # Unlike in `get_commits_between`, the earliest revisions are listed as well,
+        # since their ancestors are needed to tell the ranges apart.
+        lines = get_non_empty_lines(self._popen_git(
+            "log", "--format=%H:%h:%ct:%P:%s", f"--max-count={MAX_COMMITS_FOR_BATCHED_COMMIT_LISTING + 1}",
+            *all_hashes, f"^{base}", "--").stdout)
+        if len(lines) > MAX_COMMITS_FOR_BATCHED_COMMIT_LISTING:
+            debug(f"more than {MAX_COMMITS_FOR_BATCHED_COMMIT_LISTING} commits since {base}, listing commits range by range")
+            return [self.get_commits_between(earliest, latest) for earliest, latest in ranges]
+
+        entry_by_hash: Dict[str, GitLogEntry] = {}
+        committer_unix_timestamp_by_hash: Dict[str, int] = {}
+        parents_by_hash: Dict[str, List[str]] = {}
+        for line in lines:
+            commit_hash, short_hash, committer_unix_timestamp, parents, subject = line.split(":", 4)
+            entry_by_hash[commit_hash] = GitLogEntry(
+                hash=FullCommitHash(commit_hash), short_hash=ShortCommitHash(short_hash), subject=subject)
+            committer_unix_timestamp_by_hash[commit_hash] = int(committer_unix_timestamp)
+            parents_by_hash[commit_hash] = parents.split()
+        graph = CommitGraph(f"{commit_hash} {' '.join(parents)}" for commit_hash, parents in parents_by_hash.items())
+
+        result: List[List[GitLogEntry]] = []
+        for earliest_hash, latest_hash in range_hashes:
+            assert earliest_hash and latest_hash
+            # Whatever is not listed (the base and its ancestors) is reachable from every revision, so it can be safely ignored.
+            range_commits = graph.get_ancestors_or_equal(latest_hash) - graph.get_ancestors_or_equal(earliest_hash)
+            # The order of the commits of the range in the output of a joint `git log` might differ from what `git log` for just this range
+            # would produce (when committer dates are equal). Hence, the walk of `git log` (newest committer date first,
+            # and first in, first out in case of a tie) is replayed over the commits of the range.
+            range_entries: List[GitLogEntry] = []
+            queue: List[Tuple[int, int, str]] = []
+            if latest_hash in range_commits:
+                queue.append((-committer_unix_timestamp_by_hash[latest_hash], 0, latest_hash))
+            insertion_count = 1
+            while queue:
+                _, _, commit_hash = heapq.heappop(queue)
+                range_entries.append(entry_by_hash[commit_hash])
+                for parent in parents_by_hash[commit_hash]:
+                    if parent in range_commits:
+                        range_commits.remove(parent)
+                        heapq.heappush(queue, (-committer_unix_timestamp_by_hash[parent], insertion_count, parent))
+                        insertion_count += 1
+            # Reversed, just like in `get_commits_between`.
+            result.append(list(reversed(range_entries)))
+        return result
+
     def get_commit_data(self, commit: AnyRevision, pattern: GitFormatPatterns) -> str:
         if pattern not in GitFormatPatterns:
             raise UnexpectedMacheteException(
@@ -1427,19 +2096,72 @@ class Git:
             return SyncToRemoteStatus.DIVERGED_FROM_AND_OLDER_THAN_REMOTE if b_t < rb_t else \
                 SyncToRemoteStatus.DIVERGED_FROM_AND_NEWER_THAN_REMOTE
 
-    def get_combined_remote_sync_status(self, branch: LocalBranchShortName) -> Tuple[SyncToRemoteStatus, Optional[str]]:
+    def __load_sync_to_upstream_statuses(self) -> None:
+        # A single `for-each-ref` compares all local branches against their upstreams,
+        # rather than two ancestry checks (possibly two `git merge-base` processes) per branch.
+        # Unlike `%(upstream:track)`, `%(upstream:trackshort)` (one of `=`, `>`, `<`, `<>`) isn't subject to translation.
+        self.__sync_to_upstream_status_by_branch_cached = {}
+        for line in get_non_empty_lines(
+                self._popen_git("for-each-ref", "--format=%(refname)\t%(upstream:trackshort)", "refs/heads").stdout):
+            values = line.split("\t")
+            if len(values) != 2:
+                raise UnexpectedMacheteException(
+                    "`git for-each-ref` did not return exactly 2 values for `refs/heads`: "
+                    f"`{values}` ({hex_repr(line)})")
+            branch, track = LocalBranchFullName.of(values[0]).to_short_name(), values[1]
+            upstream = self.get_strict_counterpart_for_fetching_of_branch(branch)
+            # Tracking info is also reported for upstreams that are local branches (`branch.BRANCH.remote` set to `.`),
+            # which aren't counterparts for fetching.
+            if upstream is None or track not in ("=", ">", "<", "<>"):
+                continue
+            if track == "<>":
+                b_t = self.get_committer_unix_timestamp_by_revision(branch)
+                rb_t = self.get_committer_unix_timestamp_by_revision(upstream)
+                status = SyncToRemoteStatus.DIVERGED_FROM_AND_OLDER_THAN_REMOTE if b_t < rb_t else \
+                    SyncToRemoteStatus.DIVERGED_FROM_AND_NEWER_THAN_REMOTE
+            elif track == ">":
+                status = SyncToRemoteStatus.AHEAD_OF_REMOTE
+            elif track == "<":
+                status = SyncToRemoteStatus.BEHIND_REMOTE
+            else:
+                status = SyncToRemoteStatus.IN_SYNC_WITH_REMOTE
+            self.__sync_to_upstream_status_by_branch_cached[branch] = (upstream, status)
+
+    def __get_sync_to_upstream_status(
+            self, branch: LocalBranchShortName, *, upstream: RemoteBranchShortName) -> Optional[SyncToRemoteStatus]:
+        with self.__lock:
+            if self.__sync_to_upstream_status_by_branch_cached is None:
+                self.__load_sync_to_upstream_statuses()
+        assert self.__sync_to_upstream_status_by_branch_cached is not None
+        # Entries are dropped once either of the refs gets updated (see `__invalidating_caches`).
+        cached = self.__sync_to_upstream_status_by_branch_cached.get(branch)
+        return cached[1] if cached is not None and cached[0] == upstream else None
+
+    def get_combined_remote_sync_status(
+            self, branch: LocalBranchShortName, *, compare_all_upstreams_at_once: bool = True) -> Tuple[SyncToRemoteStatus, Optional[str]]:
+        """With `compare_all_upstreams_at_once` (and git at least `FOR_EACH_REF_UPSTREAM_TRACKSHORT`), the statuses of all branches
+        with upstreams are determined (and cached) together, which pays off as soon as more than a couple of branches are queried."""
         if not self.get_remotes():
             return SyncToRemoteStatus.NO_REMOTES, None
         remote_branch = self.get_combined_counterpart_for_fetching_of_branch(branch)
         if not remote_branch:
             return SyncToRemoteStatus.UNTRACKED, None
-        return self.get_relation_to_remote_counterpart(branch, remote_branch), self.get_combined_remote_for_fetching_of_branch(branch)
+        status: Optional[SyncToRemoteStatus] = None
+        if compare_all_upstreams_at_once and self.get_git_version() >= FOR_EACH_REF_UPSTREAM_TRACKSHORT and \
+                remote_branch == self.get_strict_counterpart_for_fetching_of_branch(branch):
+            status = self.__get_sync_to_upstream_status(branch, upstream=remote_branch)
+        # Inferred counterparts (and the branches updated since the statuses have been loaded) are compared one by one.
+        if status is None:
+            status = self.get_relation_to_remote_counterpart(branch, remote_branch)
+        return status, self.get_combined_remote_for_fetching_of_branch(branch)
 
     # === Branch & ref modifications ===
 
     def delete_branch(self, branch_name: LocalBranchShortName, *, force: bool) -> int:
         delete_option = '-D' if force else '-d'
-        return self._run_git('branch', delete_option, branch_name, flush_caches=True)
+        # The reflog and the config section of the branch are removed as well.
+        with self.__invalidating_caches(refs=[branch_name.full_name()], branch_lists=True, config=True):
+            return self._run_git('branch', delete_option, branch_name, flush_caches=False)
 
     def commit_tree_with_given_parent_and_message_and_env(  # noqa: KW
             self, parent_revision: AnyRevision, msg: str, env: Dict[str, str]) -> FullCommitHash:
@@ -1448,7 +2170,8 @@ class Git:
             "commit-tree", "HEAD^{tree}", "-p", parent_revision, "-m", msg, env=env).stdout.strip())  # noqa: FS003
 
     def update_head_ref_to_new_hash_with_reflog_subject(self, hash: FullCommitHash, reflog_subject: str) -> int:  # noqa: KW
-        return self._run_git("update-ref", "HEAD", hash, "-m", reflog_subject, flush_caches=True)
+        with self.__invalidating_caches(refs=self.__get_refs_updated_via_head()):
+            return self._run_git("update-ref", "HEAD", hash, "-m", reflog_subject, flush_caches=False)
 
     # === Misc helpers ===
 
@@ -1462,6 +2185,18 @@ class Git:
     def get_latest_checkout_timestamps(self) -> Dict[str, int]:  # TODO (#110): default dict with 0
         # Entries are in the format '<branch_name>@{<unix_timestamp> <time-zone>}'
         result = {}
+        if self.__are_ref_files_readable():
+            # Unlike branch reflogs, the reflog of `HEAD` is specific to the current worktree.
+            for reflog_entry in read_reflog_newest_first(self.get_current_worktree_git_subpath("logs", "HEAD")):
+                checkout_match = re.search("^checkout: moving from (.+) to (.+)$", reflog_entry.subject)
+                if checkout_match:
+                    for branch in checkout_match.groups():
+                        # Only the latest occurrence for any given branch is interesting
+                        # (i.e. the first one to occur in reflog)
+                        if branch not in result:
+                            result[branch] = reflog_entry.timestamp
+            return result
+
         # %gd - reflog selector (HEAD@{<unix-timestamp> <time-zone>} for `--date=raw`;
         #   `--date=unix` is not available on some older versions of git)
         # %gs - reflog subject
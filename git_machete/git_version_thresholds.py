@@ -26,6 +26,16 @@ MINIMUM_SUPPORTED_GIT_VERSION: GitVersion = (1, 8, 0)  # noqa: F841
 # Earliest version to support `git push --force-with-lease`.
 PUSH_FORCE_WITH_LEASE: GitVersion = (1, 8, 5)
 
+# `%(upstream:trackshort)` placeholder of `git for-each-ref --format` was introduced here.
+# At/above it we determine the sync to upstream of all branches with a single `git for-each-ref`;
+# below it we fall back to checking the ancestry of each branch and its upstream separately.
+FOR_EACH_REF_UPSTREAM_TRACKSHORT: GitVersion = (1, 8, 5)
+
+# `git cat-file --batch-check=<format>` (custom output format for the batch mode) was introduced here.
+# At/above it we resolve revisions and tree hashes via a single long-lived `git cat-file` process;
+# below it we fall back to a one-shot `git rev-parse` per revision.
+CAT_FILE_BATCH_CHECK_FORMAT: GitVersion = (1, 8, 4)
+
 # `git worktree` command was introduced here; below this version git-machete degrades to treating the
 # current checkout as the only worktree.
 WORKTREE_COMMAND: GitVersion = (2, 5, 0)
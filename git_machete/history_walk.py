@@ -0,0 +1,178 @@
+"""Lazily read listings of commit history, shared between all the tips whose histories converge.
+
+The listings follow the default order of `git rev-list` (and `git log`): newest commits (by committer date) first.
+Each listing is read from a `git rev-list --parents` process only as far as any of its readers gets,
+and the process is killed as soon as the last reader stops iterating.
+The *frontier* (commits already reached, but not yet listed) is tracked along the way,
+so that a listing can later be resumed from where it was cut off, without re-walking the commits already listed.
+
+Whenever the frontier narrows down to a single commit, the rest of the listing is just the listing of that commit.
+This is what makes the listings shared: if that commit has already been reached by another listing in the same way
+(typically: the tip of a parent branch, as reached from the tip of a child branch), the rest is taken from there.
+
+`HistoryWalks` can be iterated from multiple threads at once: reading from the processes (and all the bookkeeping)
+is serialized, while the commits already listed are handed over without any locking.
+
+`JointHistoryWalk` is meant for the cases when the histories of many tips are known to be needed at once:
+all of them are recovered in-process from a single `git rev-list` stream instead
+(save for the tips whose histories don't come up in the stream soon enough).
+
+Hashes are plain strings here; typed wrappers are applied by the caller (`git_machete.git.Git`).
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Callable, Dict, Generator, List, Optional, Sequence, Set, Tuple
+
+
+class _Listing:
+
+    def __init__(self, tip: str) -> None:
+        self.commits: List[str] = []
+        self.listed: Set[str] = set()
+        self.frontier: Set[str] = {tip}
+        self.continues_as: Optional[str] = None
+        self.lines: Optional[Generator[str, None, None]] = None
+        self.reader_count: int = 0
+
+
+class HistoryWalks:
+
+    def __init__(self, stream_rev_list: Callable[[Sequence[str]], Generator[str, None, None]]) -> None:
+        """`stream_rev_list` is expected to yield the lines of `git rev-list --parents <tips...>` as they're produced."""
+        self.__stream_rev_list = stream_rev_list
+        # For each commit, the listing (and the index within that listing) that the listing of this commit is a suffix of.
+        self.__position_by_commit: Dict[str, Tuple[_Listing, int]] = {}
+        self.__lock = threading.Lock()
+
+    def iter_history(self, tip: str) -> Generator[str, None, None]:
+        with self.__lock:
+            if tip not in self.__position_by_commit:
+                self.__position_by_commit[tip] = (_Listing(tip), 0)
+            listing, index = self.__position_by_commit[tip]
+        return self.__iter_listing(listing, index)
+
+    def __iter_listing(self, listing: _Listing, index: int) -> Generator[str, None, None]:
+        with self.__lock:
+            listing.reader_count += 1
+        try:
+            while True:
+                # Commits are only ever appended to a listing, so the ones already listed can be yielded without holding the lock.
+                if index < len(listing.commits):
+                    yield listing.commits[index]
+                    index += 1
+                    continue
+                with self.__lock:
+                    while index >= len(listing.commits) and listing.continues_as is None and listing.frontier:
+                        self.__read_next_commit(listing)
+                    continues_as = listing.continues_as if index >= len(listing.commits) else None
+                    is_exhausted = index >= len(listing.commits) and not listing.frontier
+                if continues_as is not None:
+                    yield from self.iter_history(continues_as)
+                    return
+                elif is_exhausted:
+                    return
+        finally:
+            with self.__lock:
+                listing.reader_count -= 1
+                if listing.reader_count == 0:
+                    self.__stop_reading(listing)
+
+    def __read_next_commit(self, listing: _Listing) -> None:
+        if listing.lines is None:
+            listing.lines = self.__stream_rev_list(sorted(listing.frontier))
+        line = next(listing.lines, None)
+        if line is None:
+            listing.lines = None
+            listing.frontier.clear()
+            return
+        commit, *parents = line.split(" ")
+        is_only_reached_commit = listing.frontier == {commit}
+        listing.frontier.discard(commit)
+        listing.frontier.update(parent for parent in parents if parent not in listing.listed)
+        listing.listed.add(commit)
+        listing.commits.append(commit)
+        if is_only_reached_commit and commit not in self.__position_by_commit:
+            self.__position_by_commit[commit] = (listing, len(listing.commits) - 1)
+        if len(listing.frontier) == 1:
+            next_commit = next(iter(listing.frontier))
+            if next_commit in self.__position_by_commit:
+                listing.continues_as = next_commit
+                listing.frontier.clear()
+                self.__stop_reading(listing)
+
+    @staticmethod
+    def __stop_reading(listing: _Listing) -> None:
+        if listing.lines is not None:
+            listing.lines.close()
+            listing.lines = None
+
+
+class JointHistoryWalk:
+
+    def __init__(self, rev_list_lines: Generator[str, None, None], *,
+                 fall_back_to: Callable[[str], Generator[str, None, None]], max_line_count_per_tip: int) -> None:
+        """`rev_list_lines` is expected to yield the lines of `git rev-list --timestamp --parents <tips...>` as they're produced.
+
+        Since the stream lists the commits reachable from any of the tips newest first, getting to the history of a tip
+        much older than the others (typically: a stale branch) might take reading through lots of the newer history of the other tips.
+        Hence, the reading done on behalf of each tip is capped at `max_line_count_per_tip` lines;
+        past that, the rest of the history of the tip is taken from `fall_back_to` (a separate listing of a single tip) instead.
+        """
+        self.__lines = rev_list_lines
+        self.__fall_back_to = fall_back_to
+        self.__max_line_count_per_tip = max_line_count_per_tip
+        self.__is_exhausted = False
+        self.__timestamps: Dict[str, int] = {}
+        self.__parents: Dict[str, List[str]] = {}
+
+    def __load(self, commit: str, *, max_line_count: int) -> int:
+        """Returns the number of lines read; `commit` is still not loaded after that if it's not within `max_line_count` lines."""
+        # The stream is ordered by committer date as well, so the parents of the commits listed so far come up soon enough.
+        line_count = 0
+        while commit not in self.__parents and not self.__is_exhausted and line_count < max_line_count:
+            line = next(self.__lines, None)
+            if line is None:
+                self.__is_exhausted = True
+                break
+            line_count += 1
+            timestamp, loaded_commit, *parents = line.split(" ")
+            self.__timestamps[loaded_commit] = int(timestamp)
+            self.__parents[loaded_commit] = parents
+        return line_count
+
+    def iter_history(self, tip: str) -> Generator[str, None, None]:
+        """Mirrors the default revision walk of git: the most recent of the reached commits (by committer date) is listed first,
+        and the ties are resolved in the order of reaching (first parents first).
+        """
+        line_budget = self.__max_line_count_per_tip
+        listed_count = 0
+        order_of_reaching = itertools.count()
+        reached: Set[str] = set()
+        queue: List[Tuple[int, int, str]] = []
+        newly_reached = [tip]
+        while True:
+            for commit in newly_reached:
+                if commit in reached:
+                    continue
+                line_budget -= self.__load(commit, max_line_count=line_budget)
+                if commit in self.__parents:
+                    reached.add(commit)
+                    heapq.heappush(queue, (-self.__timestamps[commit], next(order_of_reaching), commit))
+                elif not self.__is_exhausted:
+                    # Both listings follow the same order, so the commits listed so far can just be skipped.
+                    history = self.__fall_back_to(tip)
+                    for _ in itertools.islice(history, listed_count):
+                        pass
+                    yield from history
+                    return
+            if not queue:
+                return
+            _, _, commit = heapq.heappop(queue)
+            yield commit
+            listed_count += 1
+            newly_reached = self.__parents[commit]
+
+    def close(self) -> None:
+        self.__lines.close()
@@ -19,6 +19,7 @@ class CommandLineOptions:
         self.opt_draft: bool = False
         self.opt_explain: bool = False
         self.opt_fetch: bool = False
+        self.opt_format: str = "text"
         self.opt_fork_point: Optional[AnyRevision] = None
         self.opt_ignore_if_missing: bool = False
         self.opt_inferred: bool = False
@@ -34,6 +35,7 @@ class CommandLineOptions:
         self.opt_override_to: Optional[str] = None
         self.opt_override_to_inferred: bool = False
         self.opt_override_to_parent: bool = False
+        self.opt_prompt: bool = False
         # Tri-state: `None` means "user did not pass any `--push*`/`--no-push*` flag",
         # leaving the effective value to be resolved against `machete.traverse.push` (or the built-in default of `True`)
         # at the use site inside the client.
@@ -55,6 +57,7 @@ class CommandLineOptions:
         self.opt_title: Optional[str] = None
         self.opt_unset_override: bool = False
         self.opt_update_related_descriptions: bool = False
+        self.opt_watch: bool = False
         self.opt_with_urls: bool = False
         self.opt_yes: bool = False
 
@@ -20,7 +20,13 @@ Layout:
 * `.markup`     - markup language and styled output (`print_fmt`, ...);
                   owns `use_ansi_escapes_in_stdout` / `..._stderr`
 * `.paths`      - POSIX-style path helpers
+* `.record_file`- append-only files of fixed-width binary records
+                  (the persistent merge-base and patch-id caches)
+* `.ref_files`  - reading refs straight from packed-refs and loose ref files
+* `.reflog_file`- reading reflogs straight from `<git-dir>/logs`
 * `.terminal`   - TTY detection and ANSI escape-code constants
+* `.versioned_file` - text files with a format version header, replaced
+                  as a whole (the other persistent caches)
 
 Mutable runtime flags live on the submodule that conceptually owns them
 (rather than on this package object), so external callers reach them via
@@ -7,7 +7,8 @@ whose result the logging path itself depends on.
 """
 
 import subprocess
-from typing import Dict, NamedTuple, Optional
+import tempfile
+from typing import IO, Dict, NamedTuple, Optional, Sequence
 
 
 class PopenResult(NamedTuple):
@@ -25,13 +26,69 @@ def _run_cmd(cmd: str, *args: str, cwd: Optional[str] = None, env: Optional[Dict
 
 
 def _popen_cmd(cmd: str, *args: str,
-               cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None, input: Optional[str] = None) -> PopenResult:
+               cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None, input: Optional[str] = None,
+               timeout: Optional[float] = None) -> PopenResult:
+    """Raises `subprocess.TimeoutExpired` (once the process is killed) if it doesn't complete within `timeout` seconds."""
     stdin = subprocess.PIPE if input is not None else None
     input_bytes = input.encode('utf-8') if input else None
 
     process = subprocess.Popen([cmd] + list(args), stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=stdin, cwd=cwd, env=env)
-    stdout_bytes, stderr_bytes = process.communicate(input_bytes)
+    try:
+        stdout_bytes, stderr_bytes = process.communicate(input_bytes, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        # Not draining the pipes: if the process has spawned children of its own, they might still hold them open.
+        for stream in (process.stdin, process.stdout, process.stderr):
+            if stream is not None:
+                stream.close()
+        process.wait()
+        raise
     exit_code: int = process.returncode  # must be retrieved after process.communicate()
     stdout: str = stdout_bytes.decode('utf-8')
     stderr: str = stderr_bytes.decode('utf-8')
     return PopenResult(exit_code, stdout, stderr)
+
+
+def _spawn_cmd(cmd: str, *args: str, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> "subprocess.Popen[bytes]":
+    # stderr is discarded rather than piped: nobody drains it while the process is alive,
+    # so a chatty process could otherwise fill up the pipe buffer and deadlock.
+    return subprocess.Popen([cmd] + list(args), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=cwd, env=env)
+
+
+def _spawn_cmd_for_reading(cmd: str, *args: str, stderr: IO[bytes],
+                           cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> "subprocess.Popen[bytes]":
+    return subprocess.Popen([cmd] + list(args), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr, cwd=cwd, env=env)
+
+
+def _popen_cmd_pipeline(first_cmd_and_args: Sequence[str], second_cmd_and_args: Sequence[str], *,
+                        cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None, input: Optional[str] = None) -> PopenResult:
+    """Equivalent of `first | second`: the output of the first process flows straight into the second one via an OS pipe,
+    without ever being materialized in Python - only the output of the second process is captured.
+
+    The exit code is the first non-zero exit code out of the two processes (like `set -o pipefail`), and stderr is concatenated.
+    """
+    # The first process's stderr goes to a temporary file rather than a pipe: nobody would drain such a pipe while
+    # the second process is being read from, so a chatty first process could otherwise fill up the pipe buffer and deadlock.
+    with tempfile.TemporaryFile() as first_stderr:
+        first = subprocess.Popen(list(first_cmd_and_args), stdin=subprocess.PIPE if input is not None else None,
+                                 stdout=subprocess.PIPE, stderr=first_stderr, cwd=cwd, env=env)
+        assert first.stdout is not None
+        second = subprocess.Popen(list(second_cmd_and_args), stdin=first.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                  cwd=cwd, env=env)
+        # Now only the second process holds the read end of the pipe, so that the first one gets SIGPIPE if the second one exits early.
+        first.stdout.close()
+        if input is not None:
+            assert first.stdin is not None
+            try:
+                first.stdin.write(input.encode('utf-8'))
+                first.stdin.close()
+            except BrokenPipeError:  # pragma: no cover
+                pass
+        stdout_bytes, second_stderr_bytes = second.communicate()
+        first.wait()
+        first_stderr.seek(0)
+        first_stderr_bytes = first_stderr.read()
+    exit_code: int = first.returncode or second.returncode
+    stdout: str = stdout_bytes.decode('utf-8')
+    stderr: str = first_stderr_bytes.decode('utf-8') + second_stderr_bytes.decode('utf-8')
+    return PopenResult(exit_code, stdout, stderr)
@@ -5,18 +5,27 @@ Compared to `._subproc` (used internally for capability detection), the helpers
 * log the command being run when `verbose_mode` / `debug_mode` / `measure_command_time` is set (via `print_fmt`),
 * redact GitHub / GitLab access tokens from captured stdout/stderr,
 * update the cached "current directory still exists" flag,
-* delegate the actual `subprocess` call to `_subproc._run_cmd` / `_subproc._popen_cmd`
-  so that tests can patch the former without losing the surrounding logic.
+* delegate the actual `subprocess` call to `_subproc._run_cmd` / `_subproc._popen_cmd` / `_subproc._popen_cmd_pipeline` /
+  `_subproc._spawn_cmd` / `_subproc._spawn_cmd_for_reading` so that tests can patch the former without losing the surrounding logic.
+
+`StreamedCmd` hands over the output of a process line by line, and lets the caller kill the process once it's no longer needed.
+
+`LineCoprocess` additionally wraps a long-lived process that answers one line of output per line of input
+(like `git cat-file --batch-check`), so that a stream of small queries doesn't pay for a fork+exec each.
 """
 
 import os
 import re
+import subprocess
 import sys
+import tempfile
+import threading
 import time
-from typing import Dict, Optional
+import weakref
+from typing import Callable, Dict, Generator, Optional, Sequence
 
 from git_machete.utils import _subproc, debug_log
-from git_machete.utils._subproc import PopenResult, _popen_cmd
+from git_machete.utils._subproc import PopenResult, _popen_cmd, _popen_cmd_pipeline
 from git_machete.utils.debug_log import debug
 from git_machete.utils.fs import get_current_directory_or_none
 from git_machete.utils.markup import escape_markup, print_fmt
@@ -84,11 +93,32 @@ def chdir_upwards_until_current_directory_exists() -> None:
         current_directory_confirmed_to_exist = True
 
 
-def popen_cmd(cmd: str, *args: str, cwd: Optional[Path] = None,
-              env: Optional[Dict[str, str]] = None, hide_debug_output: bool = False, input: Optional[str] = None) -> PopenResult:
+def popen_cmd(cmd: str, *args: str, cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None,
+              hide_debug_output: bool = False, input: Optional[str] = None, timeout: Optional[float] = None) -> PopenResult:
+    return _popen_with_logging(
+        get_cmd_shell_repr(cmd, *args, env=env),
+        lambda: _popen_cmd(cmd, *args, cwd=cwd, env=env, input=input, timeout=timeout),
+        hide_debug_output=hide_debug_output)
+
+
+def popen_cmd_pipeline(first_cmd_and_args: Sequence[str], second_cmd_and_args: Sequence[str], *,
+                       env: Optional[Dict[str, str]] = None, input: Optional[str] = None) -> PopenResult:
+    """Like `popen_cmd`, but for `first | second`; see `_subproc._popen_cmd_pipeline`."""
+    return _popen_with_logging(
+        get_cmd_shell_repr(*first_cmd_and_args, env=env) + " | " + get_cmd_shell_repr(*second_cmd_and_args, env=env),
+        lambda: _popen_cmd_pipeline(first_cmd_and_args, second_cmd_and_args, env=env, input=input),
+        hide_debug_output=False)
+
+
+# GitHub tokens are likely to appear e.g. in the output of `git config -l`:
+# `https://<TOKEN>@github.com/org/repo.git` is a supported URL format for git remotes.
+def _redact_tokens(input: str) -> str:
+    return re.sub(debug_log.CODE_HOSTING_TOKEN_PREFIX_REGEX + '[a-zA-Z0-9]+', '<REDACTED>', input)
+
+
+def _popen_with_logging(flat_cmd: str, popen: Callable[[], PopenResult], *, hide_debug_output: bool) -> PopenResult:
     chdir_upwards_until_current_directory_exists()
 
-    flat_cmd = get_cmd_shell_repr(cmd, *args, env=env)
     escaped_flat_cmd = escape_markup(flat_cmd)
 
     def print_command(markup: str) -> None:
@@ -103,18 +133,14 @@ def popen_cmd(cmd: str, *args: str, cwd: Optional[Path] = None,
         print_command(escaped_flat_cmd)
 
     start = time.time()
-    exit_code, stdout, stderr = result = _popen_cmd(cmd, *args, cwd=cwd, env=env, input=input)
+    exit_code, stdout, stderr = result = popen()
     if measure_command_time:  # pragma: no cover
         end = time.time()
         elapsed_ms = int((end - start) * 1e3)
         print(f"{elapsed_ms} ms")
 
-    # GitHub tokens are likely to appear e.g. in the output of `git config -l`:
-    # `https://<TOKEN>@github.com/org/repo.git` is a supported URL format for git remotes.
-    def redact_tokens(input: str) -> str:
-        return re.sub(debug_log.CODE_HOSTING_TOKEN_PREFIX_REGEX + '[a-zA-Z0-9]+', '<REDACTED>', input)
-    stdout = redact_tokens(stdout)
-    stderr = redact_tokens(stderr)
+    stdout = _redact_tokens(stdout)
+    stderr = _redact_tokens(stderr)
 
     if debug_log.debug_mode:
         if exit_code != 0:
@@ -133,6 +159,124 @@ def popen_cmd(cmd: str, *args: str, cwd: Optional[Path] = None,
     return result
 
 
+class LineCoprocess:
+    """A long-lived subprocess that is expected to write exactly one line to stdout for each line written to its stdin.
+
+    The process is spawned lazily on the first `query` and lives until `close` is called
+    (or until the owning object is garbage-collected/the interpreter exits, whichever comes first).
+    Once the process dies unexpectedly, `query` keeps returning `None` - callers are expected to fall back to one-shot commands.
+    Queries from multiple threads are serialized, so that each of them gets the answer to its own line.
+    """
+
+    def __init__(self, cmd: str, *args: str, env: Optional[Dict[str, str]] = None) -> None:
+        self.__cmd = cmd
+        self.__args = args
+        self.__env = env
+        self.__process: Optional["subprocess.Popen[bytes]"] = None
+        self.__finalizer: Optional[Callable[[], object]] = None
+        self.__broken: bool = False
+        self.__lock = threading.Lock()
+
+    def __spawn(self) -> "subprocess.Popen[bytes]":
+        chdir_upwards_until_current_directory_exists()
+        escaped_flat_cmd = escape_markup(get_cmd_shell_repr(self.__cmd, *self.__args, env=self.__env))
+        if debug_log.debug_mode:
+            print_fmt(f"<b>>>> {escaped_flat_cmd} &amp;</b>", file=sys.stderr)
+        elif verbose_mode or measure_command_time:
+            print_fmt(f"{escaped_flat_cmd} &amp;", file=sys.stderr)
+        process = _subproc._spawn_cmd(self.__cmd, *self.__args, env=self.__env)
+        # Closing stdin is enough to make a well-behaved line-oriented process exit on its own.
+        self.__finalizer = weakref.finalize(self, LineCoprocess.__terminate, process)
+        return process
+
+    @staticmethod
+    def __terminate(process: "subprocess.Popen[bytes]") -> None:
+        for stream in (process.stdin, process.stdout):
+            if stream is not None:
+                try:
+                    stream.close()
+                except OSError:  # pragma: no cover
+                    pass
+        process.wait()
+
+    def query(self, line: str) -> Optional[str]:
+        """Write `line` to the process's stdin and return the (newline-stripped) line it answers with,
+        or `None` if the process is no longer able to answer."""
+        with self.__lock:
+            if self.__broken:
+                return None
+            if self.__process is None:
+                self.__process = self.__spawn()
+            assert self.__process.stdin is not None and self.__process.stdout is not None
+            try:
+                self.__process.stdin.write((line + "\n").encode('utf-8'))
+                self.__process.stdin.flush()
+                raw = self.__process.stdout.readline()
+            except OSError:  # pragma: no cover
+                raw = b''
+            if not raw:  # pragma: no cover
+                debug(f"coprocess `{self.__cmd}` did not answer, falling back to one-shot commands")
+                self.__broken = True
+                self.close()
+                return None
+            answer = raw.decode('utf-8').rstrip("\r\n")
+            if debug_log.debug_mode:
+                print_fmt(f"<dim>&lt;{escape_markup(line)}>: {escape_markup(answer)}</dim>", file=sys.stderr)
+            return answer
+
+    def close(self) -> None:
+        if self.__finalizer is not None:
+            self.__finalizer()  # no-op if already called
+            self.__finalizer = None
+        self.__process = None
+
+
+class StreamedCmd:
+    """A subprocess whose stdout is handed over line by line, as soon as each line is produced.
+
+    Whoever iterates over `lines` can stop at any moment (for example, once the answer is already known):
+    closing the iterator (explicitly or by just dropping it) kills the process rather than letting it run to completion.
+    `exit_code` and `stderr` are only populated once the process has run to completion.
+    """
+
+    def __init__(self, cmd: str, *args: str, env: Optional[Dict[str, str]] = None) -> None:
+        self.__cmd = cmd
+        self.__args = args
+        self.__env = env
+        self.exit_code: Optional[int] = None
+        self.stderr: str = ""
+
+    def lines(self) -> Generator[str, None, None]:
+        chdir_upwards_until_current_directory_exists()
+        escaped_flat_cmd = escape_markup(get_cmd_shell_repr(self.__cmd, *self.__args, env=self.__env))
+        if debug_log.debug_mode:
+            print_fmt(f"<b>>>> {escaped_flat_cmd}</b>", file=sys.stderr)
+        elif verbose_mode or measure_command_time:
+            print_fmt(escaped_flat_cmd, file=sys.stderr)
+
+        # Just as in `_subproc._popen_cmd_pipeline`, a pipe for stderr could fill up (and deadlock) while stdout is being read.
+        with tempfile.TemporaryFile() as stderr_file:
+            process = _subproc._spawn_cmd_for_reading(self.__cmd, *self.__args, stderr=stderr_file, env=self.__env)
+            assert process.stdout is not None
+            try:
+                for raw in process.stdout:
+                    line = raw.decode('utf-8').rstrip("\r\n")
+                    if debug_log.debug_mode:
+                        print_fmt(f"<dim>{escape_markup(_redact_tokens(line))}</dim>", file=sys.stderr)
+                    yield line
+                self.exit_code = process.wait()
+                stderr_file.seek(0)
+                self.stderr = stderr_file.read().decode('utf-8')
+                if debug_log.debug_mode and self.exit_code != 0:
+                    print_fmt(f"<red>&lt;exit code: {self.exit_code}>\n</red>", file=sys.stderr)
+            finally:
+                if process.poll() is None:
+                    debug(f"terminating `{self.__cmd}` early")
+                    process.kill()
+                process.stdout.close()
+                process.wait()
+
+
 def get_cmd_shell_repr(cmd: str, *args: str, env: Optional[Dict[str, str]]) -> str:
     def shell_escape(arg: str) -> str:
         return re.sub("[() <>$]", r"\\\g<0>", arg) \
@@ -1,6 +1,5 @@
 """Generic collection / iteration helpers."""
 
-import itertools
 from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
 
 T = TypeVar('T')
@@ -11,10 +10,6 @@ def excluding(iterable: Iterable[T], s: Iterable[T]) -> List[T]:
     return list(filter(lambda x: x not in s, iterable))
 
 
-def flat_map(func: Callable[[T], List[T]], iterable: Iterable[T]) -> List[T]:
-    return list(itertools.chain.from_iterable(map(func, iterable)))
-
-
 def find_or_none(func: Callable[[T], bool], iterable: Iterable[T]) -> Optional[T]:
     return next(filter(func, iterable), None)  # type: ignore [arg-type]
 
@@ -64,6 +64,11 @@ def _fmt(s: str, *, use_ansi_escapes: bool) -> str:
     return result
 
 
+def strip_markup(s: str) -> str:
+    """Plain text of `s`, with no styling at all - regardless of `--color` and TTY detection (e.g. for machine-readable output)."""
+    return _fmt(s, use_ansi_escapes=False)
+
+
 def print_fmt(s: str, *, file: Optional[Any] = None, newline: bool = True) -> None:
     """Format `s` with `_fmt` for the stream `file`, then print.
 
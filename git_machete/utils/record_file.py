@@ -0,0 +1,100 @@
+"""Append-only files of fixed-width binary records, used for the persistent caches under the main worktree's git dir.
+
+The file starts with a magic header (which also carries the format version), followed by records of `record_size` bytes each.
+Writers serialize on a sibling `.lock` file, so that concurrent invocations (for example, from several worktrees) never
+interleave their appends, and compaction replaces the whole file atomically.
+Readers don't lock at all: a torn trailing record (from an append still in progress) is just ignored.
+Since the lock is held for the whole append, a torn record seen by a writer can only be left by an append that never completed
+(for example, from a process killed in the middle of it), so it's cut off before appending, not to misalign all the subsequent records.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+
+from git_machete.utils.debug_log import debug
+from git_machete.utils.paths import AbsPath
+
+
+@contextmanager
+def exclusive_lock(lock_path: str, *, blocking: bool = True) -> Iterator[bool]:
+    """Yields whether the lock is held: always the case when `blocking`,
+    otherwise `False` if another process is already holding it (rather than waiting for it to be released)."""
+    with open(lock_path, "a") as lock_file:
+        if sys.platform == "win32":  # pragma: no cover; we don't collect coverage on Windows due to poor performance
+            import msvcrt
+            lock_file.seek(0)
+            try:
+                # Retries for ~10 seconds before raising OSError.
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            except OSError:
+                if blocking:
+                    raise
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class RecordFile:
+
+    def __init__(self, path: AbsPath, *, magic: bytes, record_size: int) -> None:
+        self.path: AbsPath = path
+        self.__magic: bytes = magic
+        self.__record_size: int = record_size
+
+    def read(self) -> Optional[List[bytes]]:
+        """Returns `None` if the file exists, but is not in the expected format (for example, written by an older git-machete)."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            content = f.read()
+        if not content.startswith(self.__magic):
+            return None
+        body = memoryview(content)[len(self.__magic):]
+        usable_length = len(body) - len(body) % self.__record_size
+        if usable_length != len(body):
+            debug(f"{self.path}: ignoring a torn trailing record")
+        return [body[i:i + self.__record_size].tobytes() for i in range(0, usable_length, self.__record_size)]
+
+    def append(self, records: Iterable[bytes]) -> None:
+        data = b"".join(records)
+        assert len(data) % self.__record_size == 0
+        with exclusive_lock(self.path + ".lock"):
+            with open(self.path, "ab") as f:
+                size = f.seek(0, os.SEEK_END)
+                if 0 < size < len(self.__magic):
+                    debug(f"{self.path}: cutting off a torn header")
+                    size = f.truncate(0)
+                elif size > len(self.__magic) and (size - len(self.__magic)) % self.__record_size != 0:
+                    debug(f"{self.path}: cutting off a torn trailing record")
+                    size = f.truncate(size - (size - len(self.__magic)) % self.__record_size)
+                # Header is only written by whoever happens to create the file; `rewrite` takes care of converting foreign content.
+                if size == 0:
+                    f.write(self.__magic)
+                f.write(data)
+
+    def rewrite(self, records: Iterable[bytes]) -> None:
+        temp_path = self.path + ".tmp"
+        with exclusive_lock(self.path + ".lock"):
+            with open(temp_path, "wb") as f:
+                f.write(self.__magic)
+                for record in records:
+                    assert len(record) == self.__record_size
+                    f.write(record)
+            os.replace(temp_path, self.path)
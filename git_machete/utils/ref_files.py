@@ -0,0 +1,76 @@
+"""Direct reader of refs stored by the files ref backend: the `packed-refs` file plus loose ref files under `<common-dir>/refs/`.
+
+Only ref names and the hashes they point to are read, so that (unlike with `git for-each-ref --format=...%(tree)...`)
+no commit object ever needs to be opened. Loose refs take precedence over packed ones, just as in git itself.
+"""
+
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Same as in git itself (see `SYMREF_MAXDEPTH` in refs.c).
+_MAX_SYMREF_DEPTH = 5
+
+
+def _read_packed_refs(git_dir: str) -> Dict[str, str]:
+    result: Dict[str, str] = {}
+    path = os.path.join(git_dir, "packed-refs")
+    if not os.path.isfile(path):
+        return result
+    with open(path, "rb") as f:
+        for raw_line in f:
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+            # Skip the `# pack-refs with: ...` header and `^<peeled-hash>` lines that follow annotated tags.
+            if not line or line.startswith("#") or line.startswith("^"):
+                continue
+            hash, _, refname = line.partition(" ")
+            result[refname] = hash
+    return result
+
+
+def _read_loose_ref(git_dir: str, *, refname: str) -> Optional[str]:
+    path = os.path.join(git_dir, *refname.split("/"))
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8").strip()
+
+
+def _list_loose_refnames(git_dir: str, *, prefix: str) -> List[str]:
+    root = os.path.join(git_dir, *prefix.rstrip("/").split("/"))
+    result: List[str] = []
+    for dir_path, _, file_names in os.walk(root):
+        relative_dir = os.path.relpath(dir_path, root).replace(os.sep, "/")
+        for file_name in file_names:
+            # Lock files are left behind by ref updates in progress (or interrupted).
+            if not file_name.endswith(".lock"):
+                result.append(prefix + (file_name if relative_dir == "." else f"{relative_dir}/{file_name}"))
+    return result
+
+
+def read_refs(git_dir: str, *, prefixes: Sequence[str]) -> List[Tuple[str, str]]:
+    """Returns `(refname, hash)` pairs for all refs starting with any of `prefixes`, sorted by refname like `git for-each-ref` does.
+
+    Symbolic refs (like `refs/remotes/origin/HEAD`) are resolved to the hash of their target;
+    dangling or malformed refs are skipped (`git for-each-ref` ignores such broken refs as well).
+    """
+    packed_refs = _read_packed_refs(git_dir)
+
+    def resolve(refname: str) -> Optional[str]:
+        for _ in range(_MAX_SYMREF_DEPTH):
+            content = _read_loose_ref(git_dir, refname=refname)
+            if content is None:
+                return packed_refs.get(refname)
+            if not content.startswith("ref:"):
+                return content if content and all(c in "0123456789abcdef" for c in content) else None
+            refname = content[len("ref:"):].strip()
+        return None
+
+    refnames = {refname for refname in packed_refs if any(refname.startswith(prefix) for prefix in prefixes)}
+    for prefix in prefixes:
+        refnames.update(_list_loose_refnames(git_dir, prefix=prefix))
+    result: List[Tuple[str, str]] = []
+    for refname in sorted(refnames):
+        hash = resolve(refname)
+        if hash:
+            result.append((refname, hash))
+    return result
@@ -0,0 +1,117 @@
+"""Direct reader of reflog files of the files ref backend (`<git-dir>/logs/HEAD`, `<common-dir>/logs/refs/...`).
+
+Each line of a reflog file has the format `<old-hash> SP <new-hash> SP <name> SP <<email>> SP <timestamp> SP <tz> TAB <message> LF`,
+with the oldest entry first. Entries are yielded newest-first (like `git reflog show` does) by reading the file backwards in blocks,
+so that a caller interested only in the most recent entries never reads the (possibly long) head of the file.
+Reflog files are mostly just appended to (until expired or deleted altogether), which is what `read_reflog_appended_since` relies on;
+it tells a rewrite (like `git reflog expire`, or `git reflog delete` of the newest entries followed by new appends) by the digests
+of the first line and of the last line read the previous time.
+"""
+
+import hashlib
+import os
+from typing import BinaryIO, Generator, List, NamedTuple, Optional, Tuple
+
+_BLOCK_SIZE = 64 * 1024
+
+
+class ReflogFileEntry(NamedTuple):
+    hash: str
+    timestamp: int
+    subject: str
+
+
+def _read_lines_backwards(path: str) -> Generator[bytes, None, None]:
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        partial_line = b""
+        while position > 0:
+            read_size = min(_BLOCK_SIZE, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + partial_line).split(b"\n")
+            # The first chunk might be the tail of a line that starts in an earlier block.
+            partial_line = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line
+        if partial_line:
+            yield partial_line
+
+
+class ReflogFileState(NamedTuple):
+    """Enough to tell whether the file has only been appended to since: its size, the digest of its first (oldest) line,
+    and the digest of its last line as of then (the one ending at `size`)."""
+    size: int
+    first_line_digest: str
+    last_line_digest: str
+
+
+_EMPTY_STATE = ReflogFileState(size=0, first_line_digest="", last_line_digest="")
+
+
+def _get_line_digest(line: bytes) -> str:
+    return hashlib.sha1(line).hexdigest() if line.endswith(b"\n") else ""
+
+
+def _get_digest_of_line_ending_at(f: BinaryIO, end: int) -> Optional[str]:
+    """`None` if no line ends at the given offset, or if the line is too long to tell (both meaning that the file has been rewritten)."""
+    if end == 0:
+        return ""
+    start = max(0, end - _BLOCK_SIZE)
+    f.seek(start)
+    block = f.read(end - start)
+    if not block.endswith(b"\n"):
+        return None
+    line_start = block.rfind(b"\n", 0, len(block) - 1) + 1
+    if line_start == 0 and start > 0:
+        return None
+    return _get_line_digest(block[line_start:])
+
+
+def _parse_line(raw_line: bytes) -> Optional[ReflogFileEntry]:
+    header, _, message = raw_line.partition(b"\t")
+    # The committer identity in the header is in whatever encoding `user.name` happened to be in, so only the fields we need are decoded.
+    fields = header.split(b" ")
+    if len(fields) < 4:  # pragma: no cover; git never writes such lines, but a damaged file shouldn't crash us
+        return None
+    new_hash, timestamp = fields[1].decode("ascii", errors="replace"), fields[-2].decode("ascii", errors="replace")
+    # Null new hash corresponds to ref deletion, `git reflog show` doesn't show such entries either.
+    if not new_hash.strip("0") or not timestamp.isdigit():
+        return None
+    return ReflogFileEntry(hash=new_hash, timestamp=int(timestamp), subject=message.decode("utf-8", errors="replace"))
+
+
+def read_reflog_newest_first(path: str) -> Generator[ReflogFileEntry, None, None]:
+    """Yields nothing if the file doesn't exist (no reflog has ever been written for the given ref)."""
+    if not os.path.isfile(path):
+        return
+    for raw_line in _read_lines_backwards(path):
+        entry = _parse_line(raw_line)
+        if entry:
+            yield entry
+
+
+def read_reflog_appended_since(path: str, state: Optional[ReflogFileState]) -> Tuple[List[ReflogFileEntry], ReflogFileState, bool]:
+    """Returns the entries appended since the file was in the given `state` (newest first), along with the current state of the file.
+    The last element of the result tells whether these entries are indeed just the appended ones; if not
+    (no previous state, or the file has been rewritten in the meantime), all the entries are returned.
+    A trailing line without a newline (an append still in progress) is left for the next time.
+    """
+    if not os.path.isfile(path):
+        return [], _EMPTY_STATE, state is not None and state.size == 0
+    with open(path, "rb") as f:
+        first_line_digest = _get_line_digest(f.readline())
+        is_appended = state is not None and state.first_line_digest == first_line_digest and \
+            state.size <= os.fstat(f.fileno()).st_size and state.last_line_digest == _get_digest_of_line_ending_at(f, state.size)
+        offset = state.size if state is not None and is_appended else 0
+        f.seek(offset)
+        content = f.read()
+    complete_length = content.rfind(b"\n") + 1
+    entries = [entry for entry in map(_parse_line, content[:complete_length].split(b"\n")[-2::-1]) if entry]
+    if complete_length > 0:
+        last_line_digest = _get_line_digest(content[content.rfind(b"\n", 0, complete_length - 1) + 1:complete_length])
+    else:
+        last_line_digest = state.last_line_digest if state is not None and is_appended else ""
+    new_state = ReflogFileState(size=offset + complete_length, first_line_digest=first_line_digest, last_line_digest=last_line_digest)
+    return entries, new_state, is_appended
@@ -0,0 +1,48 @@
+"""Text files starting with a header line that carries the format version, used for the persistent caches under the git dir
+that are rewritten as a whole (unlike `RecordFile`, which is only ever appended to).
+
+The file is always replaced atomically, so concurrent invocations can't corrupt it - at worst, one of them wins.
+Lines are split with `str.splitlines`, so it's up to each cache to keep all the line boundaries it recognizes
+(carriage returns included) out of its fields.
+"""
+
+import os
+import tempfile
+from typing import Iterable, List, Optional
+
+from git_machete.utils.debug_log import debug
+from git_machete.utils.paths import AbsPath
+
+
+class VersionedFile:
+
+    def __init__(self, path: AbsPath, *, header: str) -> None:
+        assert header.endswith("\n")
+        self.path: AbsPath = path
+        self.__header: str = header
+
+    def read_lines(self) -> Optional[List[str]]:
+        """Lines following the header, without line boundaries.
+        Returns `None` if the file doesn't exist or is not in the expected format (for example, written by an older git-machete)."""
+        if not os.path.isfile(self.path):
+            return None
+        with open(self.path, encoding="utf-8", newline="") as f:
+            content = f.read()
+        if not content.startswith(self.__header):
+            debug(f"{self.path}: unknown format, discarding")
+            return None
+        return content[len(self.__header):].splitlines()
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """Each of `lines` must end with `\\n`. Failing to write is only logged, since the file is just an optimization."""
+        debug(f"writing {self.path}")
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=os.path.basename(self.path) + ".")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(self.__header)
+                f.writelines(lines)
+            os.replace(temp_path, self.path)
+        except OSError as e:  # pragma: no cover
+            debug(f"cannot write {self.path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
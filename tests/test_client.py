@@ -1,9 +1,11 @@
 from git_machete.annotation import Annotation
 from git_machete.client.base import MacheteClient
+from git_machete.client.state import MacheteState, ManagedBranchName
 from git_machete.git import LocalBranchShortName
 from tests.base_test import BaseTest
 from tests.cli_runner import read_branch_layout_file, rewrite_branch_layout_file
-from tests.git_repository import check_out, commit, create_repo_with_remote, new_branch, push
+from tests.git_repository import check_out, commit, create_repo, create_repo_with_remote, new_branch, push
+from tests.shell import write_to_file
 
 
 class TestClient(BaseTest):
@@ -170,3 +172,59 @@ class TestClient(BaseTest):
 
         assert '#' not in read_branch_layout_file()
         assert read_branch_layout_file() == "master\n"
+
+    def test_save_branch_layout_file_with_thousands_of_branches(self) -> None:
+        create_repo()
+        # Deep enough to exceed the recursion limit, and wide enough to have thousands of siblings.
+        deep = [f"{'  ' * depth}deep-{depth}" for depth in range(2000)]
+        wide = [f"  wide-{index} PR #{index}" for index in range(8000)]
+        body = "\n".join(deep[:2] + wide + deep[2:]) + "\n"
+        write_to_file(".git/machete", body)
+
+        machete_client = MacheteClient(verify_branches=False)
+        machete_client.save_branch_layout_file()
+
+        assert read_branch_layout_file() == body
+
+    def test_machete_state_mutations(self) -> None:
+        def m(branch: str) -> ManagedBranchName:
+            return ManagedBranchName(branch)
+
+        state = MacheteState()
+        for branch, parent in [("a", None), ("a1", "a"), ("a2", "a"), ("a2x", "a2"), ("a3", "a"), ("b", None), ("b1", "b"), ("b2", "b")]:
+            state.add_branch(LocalBranchShortName(branch), parent=m(parent) if parent else None, annotation=None)
+
+        state.splice_out(m("a2"))
+        assert state.get_children(m("a")) == ["a1", "a2x", "a3"]
+        assert state.get_parent(m("a2x")) == "a"
+        state.splice_out(m("b"))
+        assert state.roots == ["a", "b1", "b2"]
+        assert state.get_parent(m("b1")) is None
+        state.add_as_child(branch=LocalBranchShortName("a0"), parent=m("a"), as_first_child=True)
+        assert state.get_children(m("a")) == ["a0", "a1", "a2x", "a3"]
+        state.rename_branch(old_name=m("a"), new_name=LocalBranchShortName("z"))
+        state.rename_branch(old_name=m("a1"), new_name=LocalBranchShortName("z1"))
+        assert state.roots == ["z", "b1", "b2"]
+        assert state.get_children(m("z")) == ["a0", "z1", "a2x", "a3"]
+        assert state.get_parent(m("a0")) == "z"
+        state.remove_leaf(m("a3"))
+        state.remove_leaf(m("b2"))
+        assert state.roots == ["z", "b1"]
+        # Branches are kept in the order of adding, regardless of where they're wired in the tree.
+        assert state.managed_branches == ["z", "z1", "a2x", "b1", "a0"]
+        assert not state.is_managed(m("a")) and state.is_managed(m("z"))
+
+        # Mutations only take time proportional to the number of branches they rewire, so thousands of them are no problem.
+        state = MacheteState()
+        state.add_branch(LocalBranchShortName("root"), parent=None, annotation=None)
+        stacks = [[m(f"stack-{index}-{depth}") for depth in range(5)] for index in range(4000)]
+        for stack in stacks:
+            for parent, branch in zip([m("root"), *stack], stack):
+                state.add_as_child(branch=branch, parent=parent, as_first_child=False)
+        for stack in stacks:
+            state.rename_branch(old_name=stack[0], new_name=LocalBranchShortName(f"renamed-{stack[0]}"))
+            state.splice_out(stack[2])
+            state.remove_leaf(stack[4])
+        assert len(state.managed_branches) == 1 + 3 * len(stacks)
+        assert state.get_children(m("root")) == [f"renamed-{stack[0]}" for stack in stacks]
+        assert state.get_children(stacks[-1][1]) == [stacks[-1][3]]
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from pytest_mock import MockerFixture
 
@@ -9,7 +10,7 @@ from tests.git_repository import (add_remote, check_out, commit, create_repo, cr
                                   get_commit_hash, get_current_commit_hash, merge, new_branch, new_orphan_branch, pull, push, reset_to,
                                   set_git_config_key)
 from tests.mockers import fixed_author_and_committer_date_in_past
-from tests.shell import execute, remove_directory
+from tests.shell import execute, read_file, remove_directory, write_to_file
 
 
 class TestForkPoint(BaseTest):
@@ -167,6 +168,108 @@ class TestForkPoint(BaseTest):
             "this commit seems to be a part of the unique history of master\n"
         )
 
+    def test_fork_point_with_persisted_reflog_index(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit("master commit")
+        new_branch("develop")
+        commit("develop commit")
+        new_branch("feature")
+        commit("feature commit")
+        rewrite_branch_layout_file("""
+            master
+                develop
+                    feature
+            """)
+        index_path = os.path.join(".git", "machete-reflog-index")
+
+        assert_success(["fork-point", "feature"], get_commit_hash("develop") + "\n")
+        index_lines = read_file(index_path).splitlines()
+        assert index_lines[0] == "git-machete reflog index v2"
+        assert sorted(line.split("\t")[0] for line in index_lines[1:]) == ["refs/heads/develop", "refs/heads/feature", "refs/heads/master"]
+
+        # The new reflog entry of develop is picked up, and appended to the index.
+        check_out("develop")
+        commit("another develop commit")
+        check_out("feature")
+        merge("develop")
+        assert_success(["fork-point", "feature"], get_commit_hash("develop") + "\n")
+        develop_line = next(line for line in read_file(index_path).splitlines() if line.startswith("refs/heads/develop\t"))
+        assert develop_line.split("\t")[5] == f"{get_commit_hash('develop')} {get_commit_hash('develop~1')}"
+
+        # The index is consulted rather than the reflog itself, as long as the reflog hasn't changed in the meantime.
+        assert_success(["fork-point", "feature", "--explain"],
+                       f"{get_commit_hash('develop')}\nthis commit seems to be a part of the unique history of develop\n")
+        write_to_file(index_path, read_file(index_path).replace(develop_line, develop_line.rsplit("\t", 1)[0] + "\t"))
+        assert "unique history of develop" not in launch_command("fork-point", "feature", "--explain")
+
+        # A rewritten reflog is indexed from scratch.
+        execute("git reflog expire --expire=all refs/heads/develop")
+        check_out("develop")
+        commit("yet another develop commit")
+        check_out("feature")
+        merge("develop")
+        assert_success(["fork-point", "feature"], get_commit_hash("develop") + "\n")
+
+    def test_fork_point_cache(self, mocker: MockerFixture) -> None:
+        create_repo()
+        new_branch("master")
+        commit("master commit")
+        new_branch("develop")
+        commit("develop commit")
+        new_branch("feature")
+        commit("feature commit")
+        rewrite_branch_layout_file("""
+            master
+                develop
+                    feature
+            """)
+        cache_path = os.path.join(".git", "machete-fork-point-cache")
+
+        assert_success(["fork-point", "feature"], get_commit_hash("develop") + "\n")
+        feature_line = next(line for line in read_file(cache_path).splitlines() if line.startswith("feature\t"))
+        assert feature_line.split("\t")[2:] == [get_commit_hash("develop"), "develop:develop"]
+
+        def tamper_with_cached_fork_point_of_feature() -> None:
+            line = next(line for line in read_file(cache_path).splitlines() if line.startswith("feature\t"))
+            write_to_file(cache_path, read_file(cache_path).replace(
+                line, line.replace(f"\t{get_commit_hash('develop')}\t", f"\t{get_commit_hash('master')}\t")))
+
+        # As long as nothing relevant has changed, the cached fork point is used (but not for `--explain`).
+        tamper_with_cached_fork_point_of_feature()
+        assert_success(["fork-point", "feature"], get_commit_hash("master") + "\n")
+        assert_success(["fork-point", "feature", "--explain"],
+                       f"{get_commit_hash('develop')}\nthis commit seems to be a part of the unique history of develop\n")
+
+        # A new entry in the reflog of a branch that the fork point hasn't been inferred from makes a difference, too
+        # (for example, after a reset of a sibling, it might now be the one to match the history of feature)...
+        check_out("master")
+        new_branch("other")
+        commit("other commit")
+        check_out("feature")
+        assert_success(["fork-point", "feature"], get_commit_hash("develop") + "\n")
+        tamper_with_cached_fork_point_of_feature()
+        assert_success(["fork-point", "feature"], get_commit_hash("master") + "\n")
+        execute("git branch -f other master")
+        assert_success(["fork-point", "feature"], get_commit_hash("develop") + "\n")
+        # ... and so does any change to the reflog of the branch that the fork point has been inferred from (even with its tip unchanged),
+        tamper_with_cached_fork_point_of_feature()
+        develop_hash = get_commit_hash("develop")
+        execute("git branch -f develop master")
+        execute(f"git branch -f develop {develop_hash}")
+        assert_success(["fork-point", "feature"], get_commit_hash("develop") + "\n")
+        # ... or a commit on the branch itself.
+        tamper_with_cached_fork_point_of_feature()
+        commit("another feature commit")
+        assert_success(["fork-point", "feature"], get_commit_hash("develop") + "\n")
+
+        # Fork points inferred by `status` are written to the cache all at once.
+        os.remove(cache_path)
+        mkstemp_spy = mocker.spy(tempfile, "mkstemp")
+        launch_command("status")
+        assert [call.kwargs["prefix"] for call in mkstemp_spy.call_args_list].count("machete-fork-point-cache.") == 1
+        assert [line.split("\t")[0] for line in read_file(cache_path).splitlines()[1:]] == ["develop", "feature"]
+
     def test_fork_point_override_for_invalid_branch(self) -> None:
         create_repo()
         new_branch("master")
@@ -1,16 +1,22 @@
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from tempfile import mkdtemp
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pytest
+from pytest_mock import MockerFixture
 
-from git_machete.git import AnyBranchName, AnyRevision, FullCommitHash, Git, LocalBranchShortName
+from git_machete.git import AnyBranchName, AnyRevision, FullCommitHash, Git, GitReflogEntry, LocalBranchShortName, SyncToRemoteStatus
 from git_machete.git_version_thresholds import WORKTREE_COMMAND
 from git_machete.utils.paths import AbsPath
+from git_machete.utils.ref_files import read_refs
 from tests.base_test import BaseTest
-from tests.git_repository import (add_worktree, check_out, commit, create_repo, get_current_commit_hash, get_git_version,
-                                  is_ancestor_or_equal, new_branch, new_orphan_branch, set_git_config_key)
-from tests.shell import execute, read_file, write_to_file
+from tests.git_repository import (add_worktree, check_out, commit, commit_n_times, create_repo, create_repo_with_remote,
+                                  get_current_commit_hash, get_git_version, is_ancestor_or_equal, new_branch, new_orphan_branch, push,
+                                  reset_to, set_git_config_key, wait_to_bump_commit_timestamp)
+from tests.mockers import fixed_author_and_committer_date_in_past
+from tests.shell import execute, popen, write_to_file
 
 
 class TestGitOperations(BaseTest):
@@ -26,6 +32,22 @@ class TestGitOperations(BaseTest):
                             master_branch_first_commit_hash + "^{commit}", allow_non_zero=True, flush_caches=False) == 0  # noqa: FS003
         assert git._run_git("rev-parse", "HEAD", flush_caches=False) == 0
 
+    def test_get_git_process_count(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit()
+
+        git = Git()
+        git._run_git("rev-parse", "HEAD", flush_caches=False)
+        git._popen_git("rev-parse", "HEAD")
+        git._popen_git_pipeline(("log", "-1", "--patch"), ("patch-id",))
+        assert git.get_git_process_count() == git.get_git_process_count(of_current_thread=True) == 4
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(lambda: git._popen_git("rev-parse", "HEAD")).result().exit_code == 0
+        assert git.get_git_process_count() == 5
+        assert git.get_git_process_count(of_current_thread=True) == 4
+
     def test_popen_git(self) -> None:
         create_repo()
         new_branch("master")
@@ -168,6 +190,78 @@ class TestGitOperations(BaseTest):
         assert git.is_equivalent_tree_reachable(equivalent_to=feature, reachable_from=master) is False
         assert git.is_equivalent_patch_reachable(equivalent_to=feature, reachable_from=master) is False
 
+    def test_are_equivalent_trees_and_patches_reachable(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit("master first commit")
+        new_branch("squashed")
+        commit("squashed commit")
+        check_out("master")
+        new_branch("cherry-picked")
+        commit("cherry-picked commit")
+        check_out("master")
+        new_branch("unmerged")
+        commit("unmerged commit")
+        check_out("master")
+        commit("extra commit")
+        execute("git merge --squash squashed")
+        execute("git commit -m squashed")
+        execute("git cherry-pick cherry-picked")
+        new_branch("late")
+        commit("late commit")
+        check_out("master")
+        execute("git merge --squash late")
+        execute("git commit -m 'late squashed'")
+        commit("another master commit")
+
+        new_branch("squashed-on-top")
+        commit("squashed-on-top commit")
+        check_out("master")
+        execute("git merge --squash squashed-on-top")
+        execute("git commit -m 'squashed-on-top squashed'")
+
+        candidates = [AnyRevision(b) for b in ("squashed", "cherry-picked", "unmerged", "late", "squashed-on-top")]
+        master = AnyRevision("master")
+        assert Git().are_equivalent_trees_reachable(equivalent_to=candidates, reachable_from=master) == \
+            [False, False, False, True, True]
+        assert Git().are_equivalent_patches_reachable(equivalent_to=candidates, reachable_from=master) == \
+            [True, True, False, True, True]
+
+        # Bulk answers must agree with the ones given one candidate at a time.
+        git = Git()
+        git.are_equivalent_trees_reachable(equivalent_to=candidates, reachable_from=master)
+        git.are_equivalent_patches_reachable(equivalent_to=candidates, reachable_from=master)
+        for candidate in candidates:
+            assert git.is_equivalent_tree_reachable(equivalent_to=candidate, reachable_from=master) == \
+                Git().is_equivalent_tree_reachable(equivalent_to=candidate, reachable_from=master)
+            assert git.is_equivalent_patch_reachable(equivalent_to=candidate, reachable_from=master) == \
+                Git().is_equivalent_patch_reachable(equivalent_to=candidate, reachable_from=master)
+
+    def test_commit_and_tree_hash_resolution(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit("master first commit")
+        master_hash = get_current_commit_hash()
+        master_tree_hash = popen("git rev-parse HEAD^{tree}")  # noqa: FS003
+        execute("git tag -a -m 'annotated' v1.0")
+
+        git = Git()
+        assert git.get_commit_hash_by_revision(AnyRevision("master")) == master_hash
+        assert git.get_commit_hash_by_revision(AnyRevision("HEAD")) == master_hash
+        # Annotated tags are peeled down to the commit they point to.
+        assert git.get_commit_hash_by_revision(AnyRevision("v1.0")) == master_hash
+        assert git.get_commit_hash_by_revision(AnyRevision("no-such-branch")) is None
+        # A tree is not a commit, so it must not resolve.
+        assert git.get_commit_hash_by_revision(AnyRevision(master_tree_hash[:10])) is None
+        assert git.get_tree_hash_by_commit_hash(FullCommitHash.of(master_hash)) == master_tree_hash
+        assert git.get_short_commit_hash_by_revision_or_none(AnyRevision("no-such-branch")) is None
+        assert git.get_short_commit_hash_by_revision_or_none(AnyRevision("master")) == popen("git rev-parse --short master")
+
+        # Refs that move after the resolver has been spawned must not be served stale once the caches are flushed.
+        commit("master second commit")
+        git.flush_caches()
+        assert git.get_commit_hash_by_revision(AnyRevision("HEAD")) == get_current_commit_hash()
+
     def test_git_config_with_newlines(self) -> None:
         create_repo()
         write_to_file(".git/config", '[foo]\n  bar = "hello\\nworld"')
@@ -200,6 +294,193 @@ class TestGitOperations(BaseTest):
         # should raise an UnexpectedMacheteException.
         git.get_reflog(AnyBranchName.of("feature@foo"))
 
+    def test_caches_after_targeted_invalidation(self) -> None:
+        create_repo_with_remote()
+        new_branch("master")
+        commit("master first commit")
+        push()
+        new_branch("feature")
+        commit("feature commit")
+        check_out("master")
+
+        git = Git()
+        master, feature = LocalBranchShortName.of("master"), LocalBranchShortName.of("feature")
+        assert git.get_local_branches() == ["feature", "master"]
+        assert git.get_remote_branches() == ["origin/master"]
+
+        git.push("origin", feature)
+        assert git.get_remote_branches() == ["origin/feature", "origin/master"]
+        assert git.get_commit_hash_by_revision(AnyBranchName.of("origin/feature")) == popen("git rev-parse feature")
+        assert git.get_strict_counterpart_for_fetching_of_branch(feature) == "origin/feature"
+        assert git.get_config_attr_or_none("branch.feature.remote") == "origin"
+
+        git.checkout(feature)
+        git.reset_keep(AnyRevision.of("master"))
+        assert git.get_commit_hash_by_revision(feature.full_name()) == popen("git rev-parse master")
+        assert git.get_commit_hash_by_revision(AnyRevision.of("HEAD")) == popen("git rev-parse master")
+        assert [e.reflog_subject for e in git.get_reflog(feature.full_name())][0].startswith("reset: moving to")
+        assert git.get_committer_unix_timestamp_by_revision(feature) == int(popen("git log -1 --format=%ct master"))
+
+        git.rename_local_branch(old_name=feature, new_name=LocalBranchShortName.of("renamed"))
+        assert git.get_local_branches() == ["master", "renamed"]
+        assert git.get_strict_counterpart_for_fetching_of_branch(LocalBranchShortName.of("renamed")) == "origin/feature"
+        assert git.get_commit_hash_by_revision(feature.full_name()) is None
+
+        # Checking out a branch that only exists in the remote creates a local one that tracks the remote one.
+        git.delete_branch(master, force=True)
+        assert git.get_local_branches() == ["renamed"]
+        git.checkout(master)
+        assert git.get_local_branches() == ["master", "renamed"]
+        assert git.get_strict_counterpart_for_fetching_of_branch(master) == "origin/master"
+        assert git.get_current_branch() == "master"
+
+    def test_get_combined_remote_sync_status(self, mocker: MockerFixture) -> None:
+        create_repo_with_remote()
+        new_branch("master")
+        commit("master first commit")
+        push()
+        for branch in ("ahead", "behind", "diverged-older", "diverged-newer"):
+            new_branch(branch)
+            push()
+        check_out("ahead")
+        commit("ahead commit")
+        check_out("behind")
+        commit("behind commit")
+        push()
+        reset_to("HEAD~")
+        check_out("diverged-older")
+        commit("diverged-older local commit")
+        wait_to_bump_commit_timestamp()
+        new_branch("diverged-older-remote")
+        reset_to("HEAD~")
+        commit("diverged-older remote commit")
+        execute("git push --force origin diverged-older-remote:diverged-older")
+        new_branch("diverged-newer-remote")
+        reset_to("diverged-newer")
+        commit("diverged-newer remote commit")
+        execute("git push --force origin diverged-newer-remote:diverged-newer")
+        check_out("diverged-newer")
+        execute("git branch -D diverged-older-remote diverged-newer-remote")
+        wait_to_bump_commit_timestamp()
+        commit("diverged-newer local commit")
+        # No upstream, so the counterpart is inferred from the branch name.
+        new_branch("inferred")
+        execute("git push origin inferred")
+        commit("inferred commit")
+        check_out("master")
+
+        git = Git()
+        popen_git_spy = mocker.spy(git, "_popen_git")
+        statuses = {b: git.get_combined_remote_sync_status(b) for b in git.get_local_branches()}
+        assert statuses == {
+            "ahead": (SyncToRemoteStatus.AHEAD_OF_REMOTE, "origin"),
+            "behind": (SyncToRemoteStatus.BEHIND_REMOTE, "origin"),
+            "diverged-newer": (SyncToRemoteStatus.DIVERGED_FROM_AND_NEWER_THAN_REMOTE, "origin"),
+            "diverged-older": (SyncToRemoteStatus.DIVERGED_FROM_AND_OLDER_THAN_REMOTE, "origin"),
+            "inferred": (SyncToRemoteStatus.AHEAD_OF_REMOTE, "origin"),
+            "master": (SyncToRemoteStatus.IN_SYNC_WITH_REMOTE, "origin"),
+        }
+        # The branches with upstreams are all compared within a single `git for-each-ref`; only `inferred` requires `git merge-base`.
+        git_commands = [c.args[0] for c in popen_git_spy.call_args_list]
+        assert git_commands.count("for-each-ref") == 3  # refs, upstreams and committer dates
+        assert git_commands.count("merge-base") == 1
+
+        # Only the statuses of the updated branches are computed anew.
+        git.push("origin", LocalBranchShortName.of("ahead"))
+        assert git.get_combined_remote_sync_status(LocalBranchShortName.of("ahead")) == (SyncToRemoteStatus.IN_SYNC_WITH_REMOTE, "origin")
+        assert git.get_combined_remote_sync_status(LocalBranchShortName.of("behind")) == (SyncToRemoteStatus.BEHIND_REMOTE, "origin")
+
+        # Git too old to tell the sync to upstream within `for-each-ref` leaves each branch to be compared separately.
+        self.patch_symbol(mocker, 'git_machete.git.Git.get_git_version', lambda self: (1, 8, 4))
+        git = Git()
+        popen_git_spy = mocker.spy(git, "_popen_git")
+        statuses[LocalBranchShortName.of("ahead")] = (SyncToRemoteStatus.IN_SYNC_WITH_REMOTE, "origin")
+        assert {b: git.get_combined_remote_sync_status(b) for b in git.get_local_branches()} == statuses
+        assert not any("%(upstream:trackshort)" in arg for c in popen_git_spy.call_args_list for arg in c.args)
+
+    def test_get_reflog_and_latest_checkout_timestamps_from_reflog_files(self) -> None:
+        create_repo_with_remote()
+        new_branch("master")
+        commit("master first commit")
+        push()
+        new_branch("feature/with@sign")
+        commit("feature commit")
+        commit("another feature commit")
+        reset_to("HEAD~1")
+        execute("git rebase --force-rebase master")
+        push()
+        check_out("master")
+        execute("git branch -m feature/with@sign feature/renamed")
+        check_out("feature/renamed")
+
+        def get_reflog_via_git(branch: str) -> List[GitReflogEntry]:
+            return [GitReflogEntry(hash=FullCommitHash.of(h), reflog_subject=s) for h, s in
+                    (line.split(":", 1) for line in popen(f"git reflog show --format=%H:%gs {branch} --").splitlines())]
+
+        git = Git()
+        for branch in ("refs/heads/master", "refs/heads/feature/renamed",
+                       "refs/remotes/origin/master", "refs/remotes/origin/feature/with@sign"):
+            assert git.get_reflog(AnyBranchName.of(branch)) == get_reflog_via_git(branch)
+        assert git.get_reflog(AnyBranchName.of("refs/heads/no-such-branch")) == []
+
+        expected_checkout_timestamps: Dict[str, int] = {}
+        for line in popen("git reflog show --format=%gd:%gs --date=raw").splitlines():
+            match = re.search("^HEAD@\\{([0-9]+) .+\\}:checkout: moving from (.+) to (.+)$", line)  # noqa: FS003
+            if match:
+                for branch in match.groups()[1:]:
+                    expected_checkout_timestamps.setdefault(branch, int(match.group(1)))
+        assert set(expected_checkout_timestamps) == {"master", "feature/with@sign", "feature/renamed"}
+        assert git.get_latest_checkout_timestamps() == expected_checkout_timestamps
+
+    def test_load_branches_from_ref_files(self) -> None:
+        create_repo_with_remote()
+        new_branch("master")
+        commit("master first commit")
+        push()
+        new_branch("feature/nested")
+        commit("feature commit")
+        push()
+        new_branch("packed")
+        commit("packed commit")
+        execute("git remote set-head origin master")
+        execute("git pack-refs --all")
+        # A loose ref takes precedence over the packed one.
+        commit("another packed commit")
+        check_out("master")
+        execute("git branch --set-upstream-to=origin/feature/nested packed")
+        # Leftover of an interrupted ref update.
+        write_to_file(".git/refs/heads/master.lock", get_current_commit_hash())
+
+        expected_refs = [tuple(line.split(" ")) for line in
+                         popen("git for-each-ref --format='%(refname) %(objectname)' refs/heads refs/remotes").splitlines()]
+        assert read_refs(Git().get_main_worktree_git_dir(), prefixes=["refs/heads/", "refs/remotes/"]) == expected_refs
+
+        git = Git()
+        assert git.get_local_branches() == ["feature/nested", "master", "packed"]
+        assert git.get_remote_branches() == ["origin/HEAD", "origin/feature/nested", "origin/master"]
+        assert git.get_commit_hash_by_revision(AnyBranchName.of("packed")) == popen("git rev-parse packed")
+        assert git.get_strict_counterpart_for_fetching_of_branch(LocalBranchShortName.of("packed")) == "origin/feature/nested"
+        assert git.get_committer_unix_timestamp_by_revision(LocalBranchShortName.of("packed")) == \
+            int(popen("git log -1 --format=%ct packed"))
+
+    @pytest.mark.skipif(get_git_version() < WORKTREE_COMMAND, reason="git worktree command was introduced in git 2.5")
+    def test_get_reflog_and_latest_checkout_timestamps_in_linked_worktree(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit("master first commit")
+        new_branch("feature")
+        commit("feature commit")
+        check_out("master")
+        os.chdir(add_worktree("feature"))
+        new_branch("other")
+
+        git = Git()
+        # Branch reflogs are shared with the main worktree...
+        assert [e.reflog_subject for e in git.get_reflog(AnyBranchName.of("refs/heads/feature"))] == \
+            ["commit: feature commit", "branch: Created from HEAD"]
+        # ... while HEAD reflog is not: checkouts made in the main worktree don't count here.
+        assert set(git.get_latest_checkout_timestamps()) == {"feature", "other"}
+
     @pytest.mark.skipif(get_git_version() < WORKTREE_COMMAND, reason="git worktree command was introduced in git 2.5")
     def test_load_branch_by_worktree_root_dir(self) -> None:
         """Direct unit test of `Git.load_branch_by_worktree_root_dir`. Walks through every interesting
@@ -299,6 +580,213 @@ class TestGitOperations(BaseTest):
             os.path.realpath(feature3_worktree): None,
         }
 
+    def test_in_process_ancestry(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit("root commit")
+        commit("master first commit")
+        new_branch("develop")
+        commit("develop commit")
+        check_out("master")
+        commit("master second commit")
+        execute("git merge --no-ff --no-edit develop")
+        # Criss-cross merges, resulting in two best common ancestors for the tips of `cross-a` and `cross-b`.
+        new_branch("cross-a")
+        commit("cross-a commit")
+        check_out("master")
+        new_branch("cross-b")
+        commit("cross-b commit")
+        execute("git merge --no-ff --no-edit cross-a~0")
+        check_out("cross-a")
+        execute("git merge --no-ff --no-edit cross-b^1")
+
+        git = Git()
+        git.enable_in_process_ancestry()
+        commit_hashes = [FullCommitHash.of(h) for h in popen("git rev-list --all").splitlines()]
+        for earlier in commit_hashes:
+            for later in commit_hashes:
+                # In case of criss-cross histories, `git merge-base` picks one of the best common ancestors depending on argument order.
+                expected_merge_bases = popen(f"git merge-base --all {earlier} {later}").splitlines()
+                assert git.get_merge_base(earlier, later) in expected_merge_bases, f"merge-base of {earlier} and {later}"
+                assert git.is_ancestor_or_equal(earlier, later) == is_ancestor_or_equal(earlier, later), f"{earlier} vs {later}"
+
+        # Commits created after the graph has been loaded are answered by `git merge-base` instead.
+        check_out("develop")
+        commit("develop second commit")
+        git.flush_caches()
+        develop_hash = FullCommitHash.of(get_current_commit_hash())
+        assert git.is_ancestor_or_equal(FullCommitHash.of(popen("git rev-parse master~1")), develop_hash) is False
+        assert git.get_merge_base(FullCommitHash.of(popen("git rev-parse master")), develop_hash) == popen("git rev-parse develop~1")
+
+    def test_spoonfeed_log_hashes(self, mocker: MockerFixture) -> None:
+        create_repo()
+        new_branch("master")
+        for i in range(5):
+            commit(f"master commit {i}")
+        new_branch("develop")
+        commit("develop commit")
+        check_out("master")
+        commit("master commit 5")
+        execute("git merge --no-ff --no-edit develop")
+        new_branch("feature")
+        commit("feature commit 0")
+        commit("feature commit 1")
+        new_branch("subfeature")
+        commit("subfeature commit")
+
+        def expected_log_hashes(revision: str, total_count: int = 100) -> List[str]:
+            return popen(f"git rev-list --max-count={total_count} {revision}").splitlines()
+
+        git = Git()
+        stream_git_spy = mocker.spy(git, "_stream_git")
+        subfeature_hash = FullCommitHash.of(popen("git rev-parse subfeature"))
+        # Stopping early and then resuming the listing must not skip or repeat any commit.
+        hashes = git.spoonfeed_log_hashes(subfeature_hash, total_count=100)
+        assert [next(hashes) for _ in range(2)] == expected_log_hashes("subfeature", 2)
+        hashes.close()
+        assert list(git.spoonfeed_log_hashes(subfeature_hash, total_count=100)) == expected_log_hashes("subfeature")
+        assert list(git.spoonfeed_log_hashes(subfeature_hash, total_count=4)) == expected_log_hashes("subfeature", 4)
+        stream_git_spy_call_count = stream_git_spy.call_count
+
+        # The histories of these branches are fully contained in the history of `subfeature` listed above.
+        for branch in ["feature", "master", "develop~1", "master~3"]:
+            branch_hash = FullCommitHash.of(popen(f"git rev-parse {branch}"))
+            assert list(git.spoonfeed_log_hashes(branch_hash, total_count=100)) == expected_log_hashes(branch), branch
+        assert stream_git_spy.call_count == stream_git_spy_call_count
+        # ... unlike the history of `develop`, which only converges with the history of `subfeature` past its tip.
+        develop_hash = FullCommitHash.of(popen("git rev-parse develop"))
+        assert list(git.spoonfeed_log_hashes(develop_hash, total_count=100)) == expected_log_hashes("develop")
+        assert stream_git_spy.call_count == stream_git_spy_call_count + 1
+
+    def test_spoonfeed_log_hashes_from_many_threads(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit_n_times(20)
+        new_branch("develop")
+        commit_n_times(10)
+        check_out("master")
+        commit_n_times(5)
+        new_branch("feature")
+        commit_n_times(10)
+        branches = ["master~10", "develop", "feature", "develop~3", "master", "feature~1"]
+
+        git = Git()
+        git.enable_in_process_ancestry()
+
+        def log_hashes_and_merge_base(branch: str) -> Tuple[List[str], Optional[FullCommitHash]]:
+            branch_hash = FullCommitHash.of(popen(f"git rev-parse {branch}"))
+            return list(git.spoonfeed_log_hashes(branch_hash, total_count=100)), \
+                git.get_merge_base(AnyRevision.of(branch), AnyRevision.of("develop"))
+
+        with ThreadPoolExecutor(max_workers=len(branches)) as executor:
+            results = list(executor.map(log_hashes_and_merge_base, branches * 5))
+        for branch, (log_hashes, merge_base) in zip(branches * 5, results):
+            assert log_hashes == popen(f"git rev-list {branch}").splitlines(), branch
+            assert merge_base == popen(f"git merge-base {branch} develop"), branch
+
+    def test_spoonfeeding_log_hashes_of_many(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit("master commit 0")
+        commit("master commit 1")
+        new_branch("develop")
+        commit("develop commit 0")
+        check_out("master")
+        commit("master commit 2")
+        new_branch("feature")
+        execute("git merge --no-ff --no-edit develop")
+        commit("feature commit")
+        check_out("develop")
+        commit("develop commit 1")
+        new_orphan_branch("unrelated")
+        commit("unrelated commit")
+
+        git = Git()
+        branches = ["feature", "develop", "master~1", "unrelated", "master"]
+        branch_hashes = [FullCommitHash.of(popen(f"git rev-parse {branch}")) for branch in branches]
+        with git.spoonfeeding_log_hashes_of_many(branch_hashes, total_count=100) as log_hashes_of_many:
+            # The order of consumption shouldn't matter.
+            log_hashes_by_branch = {branch: list(log_hashes) for branch, log_hashes in reversed(list(zip(branches, log_hashes_of_many)))}
+        for branch in branches:
+            assert log_hashes_by_branch[branch] == popen(f"git rev-list {branch}").splitlines(), branch
+
+        with git.spoonfeeding_log_hashes_of_many(branch_hashes[:1], total_count=3) as log_hashes_of_many:
+            assert [list(log_hashes) for log_hashes in log_hashes_of_many] == [popen("git rev-list --max-count=3 feature").splitlines()]
+
+    def test_spoonfeeding_log_hashes_of_many_with_stale_branch(self, mocker: MockerFixture) -> None:
+        create_repo()
+        new_branch("master")
+        commit("master commit")
+        new_branch("stale")
+        commit("stale commit 0")
+        commit("stale commit 1")
+        wait_to_bump_commit_timestamp()
+        check_out("master")
+        commit_n_times(10)
+        new_branch("feature")
+        commit("feature commit")
+
+        git = Git()
+        stream_git_spy = mocker.spy(git, "_stream_git")
+        branches = ["feature", "stale", "master"]
+        branch_hashes = [FullCommitHash.of(popen(f"git rev-parse {branch}")) for branch in branches]
+        with git.spoonfeeding_log_hashes_of_many(branch_hashes, total_count=5) as log_hashes_of_many:
+            log_hashes = [list(hashes) for hashes in log_hashes_of_many]
+        assert log_hashes == [popen(f"git rev-list --max-count=5 {branch}").splitlines() for branch in branches]
+        # The history of `stale` only comes up in the joint stream past the 10 newer commits of `master`, so it's listed separately.
+        assert stream_git_spy.call_count == 2
+        assert stream_git_spy.call_args.args == ("rev-list", "--parents", branch_hashes[1], "--")
+
+    def test_get_commits_between_many(self, mocker: MockerFixture) -> None:
+        create_repo()
+        # All commits are created within the same second, so that the order of `git log` is determined solely by how it breaks ties.
+        with fixed_author_and_committer_date_in_past():
+            new_branch("root")
+            commit("root commit")
+            new_branch("develop")
+            commit_n_times(3)
+            new_branch("feature")
+            commit("feature commit")
+            new_branch("merged-in")
+            commit("merged-in commit")
+            commit("merged-in second commit")
+            check_out("feature")
+            commit("feature second commit")
+            execute("git merge --no-ff --no-edit merged-in")
+            commit("feature third commit")
+            check_out("root")
+            commit("root second commit")
+            new_orphan_branch("orphan")
+            commit("orphan commit")
+
+        ranges = [(AnyRevision.of(earliest), AnyRevision.of(latest)) for earliest, latest in [
+            ("root", "develop"),
+            ("develop", "feature"),
+            ("develop~2", "feature"),
+            ("merged-in", "feature"),
+            ("feature", "develop"),
+            ("feature", "feature"),
+            ("develop", "root"),
+        ]]
+        git = Git()
+        expected = [git.get_commits_between(earliest, latest) for earliest, latest in ranges]
+        # Just filtering the output of a joint `git log` wouldn't do, since ties are broken differently in a walk from all the revisions.
+        joint_log = popen(f"git log --format=%H {' '.join(sorted({revision for revisions in ranges for revision in revisions}))}").split()
+        range_hashes = [[entry.hash for entry in range_entries] for range_entries in expected]
+        assert any([FullCommitHash.of(h) for h in reversed(joint_log) if h in hashes] != hashes for hashes in range_hashes)
+        popen_git_spy = mocker.spy(git, "_popen_git")
+        assert git.get_commits_between_many(ranges) == expected
+        git_commands = [c.args[0] for c in popen_git_spy.call_args_list]
+        assert git_commands.count("merge-base") == 1
+        assert git_commands.count("log") == 1
+
+        # Unrelated histories and too long histories are listed range by range.
+        popen_git_spy.reset_mock()
+        ranges_with_orphan = ranges + [(AnyRevision.of("root"), AnyRevision.of("orphan"))]
+        assert git.get_commits_between_many(ranges_with_orphan) == expected + [git.get_commits_between(*ranges_with_orphan[-1])]
+        self.patch_symbol(mocker, 'git_machete.git.MAX_COMMITS_FOR_BATCHED_COMMIT_LISTING', 3)
+        assert git.get_commits_between_many(ranges) == expected
+
     def test_merge_base_cache_loading_and_saving(self) -> None:
         """Test merge-base cache with various edge cases."""
         create_repo()
@@ -313,7 +801,14 @@ class TestGitOperations(BaseTest):
         master_hash2 = FullCommitHash.of(get_current_commit_hash())
 
         git = Git()
-        cache_path = os.path.join(git.get_main_worktree_git_dir(), "machete-merge-base-cache")
+        cache_path = os.path.join(git.get_main_worktree_git_dir(), "machete-merge-base-cache-v2")
+        legacy_cache_path = os.path.join(git.get_main_worktree_git_dir(), "machete-merge-base-cache")
+
+        def write_legacy_cache(content: str) -> None:
+            # Legacy text file is only imported as long as there's no cache file in the current format yet.
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            write_to_file(legacy_cache_path, content)
 
         # Test 1: Cache file doesn't exist - should work normally
         assert not os.path.exists(cache_path)
@@ -321,15 +816,16 @@ class TestGitOperations(BaseTest):
         assert merge_base1 is not None
         # Cache should now exist and contain the entry
         assert os.path.exists(cache_path)
-        cache_content = read_file(cache_path)
-        assert master_hash.full_name() in cache_content or feature_hash.full_name() in cache_content
-        assert merge_base1.full_name() in cache_content
+        with open(cache_path, "rb") as f:
+            assert f.read().startswith(b"git-machete merge-base cache v2\n")
+        assert Git().get_merge_base(master_hash, feature_hash) == merge_base1
+        assert not os.path.exists(legacy_cache_path)
 
         # Test 2: Cache with valid entries (using fake hashes that will be loaded into cache)
         valid_hash1 = "a" * 40
         valid_hash2 = "b" * 40
         valid_merge_base = "c" * 40
-        write_to_file(cache_path, f"{valid_hash1} {valid_hash2} {valid_merge_base}\n")
+        write_legacy_cache(f"{valid_hash1} {valid_hash2} {valid_merge_base}\n")
         git = Git()  # New instance to test cache loading
         # Access cache by calling get_merge_base (which triggers cache load)
         git.get_merge_base(master_hash, feature_hash)
@@ -346,7 +842,7 @@ class TestGitOperations(BaseTest):
         # Test 3: Cache with valid entry missing 3rd field (no merge-base - rare case)
         orphan_hash1 = "d" * 40
         orphan_hash2 = "e" * 40
-        write_to_file(cache_path, f"{orphan_hash1} {orphan_hash2}\n")
+        write_legacy_cache(f"{orphan_hash1} {orphan_hash2}\n")
         git = Git()
         git.get_merge_base(master_hash, feature_hash)  # Trigger cache load
         assert git._merge_base_cached is not None
@@ -374,7 +870,7 @@ class TestGitOperations(BaseTest):
         ]
         valid_entry = f"{valid_hash1} {valid_hash2} {valid_merge_base}"
         cache_content_with_invalid = "\n".join(invalid_entries) + "\n" + valid_entry + "\n"
-        write_to_file(cache_path, cache_content_with_invalid)
+        write_legacy_cache(cache_content_with_invalid)
         git = Git()
         git.get_merge_base(master_hash, feature_hash)  # Trigger cache load
         # Should still have the valid entry loaded
@@ -388,7 +884,7 @@ class TestGitOperations(BaseTest):
         # Invalid entries should be ignored (not cause errors)
 
         # Test 5: Cache with empty lines and whitespace
-        write_to_file(cache_path, f"\n  \n\t\n{valid_hash1} {valid_hash2} {valid_merge_base}\n\n")
+        write_legacy_cache(f"\n  \n\t\n{valid_hash1} {valid_hash2} {valid_merge_base}\n\n")
         git = Git()
         git.get_merge_base(master_hash, feature_hash)  # Trigger cache load
         assert git._merge_base_cached is not None
@@ -403,7 +899,7 @@ class TestGitOperations(BaseTest):
         hash_larger = "f" * 40
         hash_smaller = "a" * 40
         merge_base_normalized = "0" * 40
-        write_to_file(cache_path, f"{hash_larger} {hash_smaller} {merge_base_normalized}\n")
+        write_legacy_cache(f"{hash_larger} {hash_smaller} {merge_base_normalized}\n")
         git = Git()
         git.get_merge_base(master_hash, feature_hash)  # Trigger cache load
         assert git._merge_base_cached is not None
@@ -429,18 +925,19 @@ class TestGitOperations(BaseTest):
         assert os.path.exists(cache_path)
         new_size = os.path.getsize(cache_path)
         assert new_size > initial_size
-        # Verify the new entry is in the file with normalized order (smaller <= larger)
-        cache_content_after = read_file(cache_path)
-        # The entry should be written as "smaller_hash larger_hash merge_base"
-        # (not "larger_hash smaller_hash merge_base")
-        assert f"{smaller_hash.full_name()} {larger_hash.full_name()}" in cache_content_after
-        # Verify it's NOT written in reverse order
-        assert f"{larger_hash.full_name()} {smaller_hash.full_name()}" not in cache_content_after
+        # Verify the new entry is in the file with normalized order (smaller <= larger),
+        # next to the entries converted from the legacy text format
+        git = Git()
+        git.get_merge_base(master_hash, feature_hash)  # Trigger cache load
+        assert git._merge_base_cached is not None
+        assert (smaller_hash, larger_hash) in git._merge_base_cached
+        assert (larger_hash, smaller_hash) not in git._merge_base_cached
+        assert (hash_smaller_norm, hash_larger_norm) in git._merge_base_cached
 
         # Test 8: Cache is used when entry exists (no git merge-base call needed)
         # We'll test this by ensuring the cached value is returned
         # First, write a cache entry for real commits
-        write_to_file(cache_path, f"{master_hash.full_name()} {feature_hash.full_name()} {merge_base1.full_name()}\n")
+        write_legacy_cache(f"{master_hash.full_name()} {feature_hash.full_name()} {merge_base1.full_name()}\n")
         git2 = Git()
         # Load cache and get merge-base - should use cached value
         cached_merge_base = git2.get_merge_base(master_hash, feature_hash)
@@ -453,3 +950,114 @@ class TestGitOperations(BaseTest):
         assert git2._merge_base_cached is not None  # Help mypy understand it's not None
         cached_result = git2._merge_base_cached.get((hash1_norm, hash2_norm))
         assert cached_result == merge_base1
+
+        # Test 9: Binary content in the legacy file is ignored line by line
+        os.remove(cache_path)
+        legacy_entry = f"{master_hash.full_name()} {feature_hash.full_name()} {merge_base1.full_name()}\n"
+        legacy_content = b"\xff\xfe\x00garbage\n" + legacy_entry.encode()
+        with open(legacy_cache_path, "wb") as legacy_cache_file:
+            legacy_cache_file.write(legacy_content)
+        git3 = Git()
+        assert git3.get_merge_base(master_hash, feature_hash) == merge_base1
+        assert git3._merge_base_cached is not None
+        assert len(git3._merge_base_cached) == 1
+
+        # Test 10: Legacy file is never written to, so that older git-machete can keep reading it...
+        git3.get_merge_base(larger_hash, smaller_hash)
+        with open(legacy_cache_path, "rb") as f:
+            assert f.read() == legacy_content
+        # ... and once the current cache file exists, it's no longer imported.
+        write_to_file(legacy_cache_path, f"{valid_hash1} {valid_hash2} {valid_merge_base}\n")
+        git = Git()
+        git.get_merge_base(master_hash, feature_hash)
+        assert git._merge_base_cached is not None
+        assert (valid1_norm, valid2_norm) not in git._merge_base_cached
+        assert len(git._merge_base_cached) == 2
+
+        # Test 11: Current cache file with an unexpected header is discarded rather than appended to
+        write_to_file(cache_path, "garbage\n")
+        git = Git()
+        git.get_merge_base(master_hash, feature_hash)
+        assert git._merge_base_cached == {(hash1_norm, hash2_norm): merge_base1}
+        assert os.path.getsize(cache_path) == len(b"git-machete merge-base cache v2\n") + 60
+
+    def test_merge_base_cache_compaction(self, mocker: MockerFixture) -> None:
+        self.patch_symbol(mocker, 'git_machete.git.MAX_MERGE_BASE_CACHE_ENTRIES', 4)
+        create_repo()
+        new_branch("master")
+        commit("master first commit")
+        hashes = [get_current_commit_hash()]
+        for i in range(3):
+            commit(f"master commit {i}")
+            hashes.append(get_current_commit_hash())
+
+        git = Git()
+        cache_path = os.path.join(git.get_main_worktree_git_dir(), "machete-merge-base-cache-v2")
+        legacy_cache_path = os.path.join(git.get_main_worktree_git_dir(), "machete-merge-base-cache")
+        unreachable_entries = [f"{'a' * 40} {'b' * 40} {'c' * 40}", f"{'d' * 40} {'e' * 40}"]
+        reachable_entries = [f"{hashes[0]} {hashes[i]} {hashes[0]}" for i in range(1, 4)]
+        write_to_file(legacy_cache_path, "\n".join(unreachable_entries + reachable_entries) + "\n")
+
+        # Legacy format is converted as-is...
+        git = Git()
+        assert git.get_merge_base(FullCommitHash.of(hashes[0]), FullCommitHash.of(hashes[1])) == hashes[0]
+        assert git._merge_base_cached is not None
+        assert len(git._merge_base_cached) == 5
+        # ... and a torn trailing record (as if another process was still appending) is ignored.
+        with open(cache_path, "ab") as f:
+            f.write(b"\x01" * 10)
+
+        # Over the limit: unreachable entries are evicted first, then the oldest ones.
+        git = Git()
+        assert git.get_merge_base(FullCommitHash.of(hashes[0]), FullCommitHash.of(hashes[3])) == hashes[0]
+        assert git._merge_base_cached is not None
+        assert sorted(git._merge_base_cached) == sorted((min(hashes[0], hashes[i]), max(hashes[0], hashes[i])) for i in (2, 3))
+        assert os.path.getsize(cache_path) == len(b"git-machete merge-base cache v2\n") + 2 * 60
+
+    def test_merge_base_cache_append_after_torn_record(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit("master first commit")
+        hashes = [FullCommitHash.of(get_current_commit_hash())]
+        for i in range(2):
+            commit(f"master commit {i}")
+            hashes.append(FullCommitHash.of(get_current_commit_hash()))
+
+        git = Git()
+        cache_path = os.path.join(git.get_main_worktree_git_dir(), "machete-merge-base-cache-v2")
+        assert git.get_merge_base(hashes[0], hashes[1]) == hashes[0]
+        # As if the process was killed in the middle of an append.
+        with open(cache_path, "ab") as f:
+            f.write(b"\x01" * 10)
+
+        git = Git()
+        assert git.get_merge_base(hashes[0], hashes[2]) == hashes[0]
+        assert os.path.getsize(cache_path) == len(b"git-machete merge-base cache v2\n") + 2 * 60
+        git = Git()
+        git.get_merge_base(hashes[0], hashes[1])
+        assert git._merge_base_cached == {(min(hashes[0], hashes[i]), max(hashes[0], hashes[i])): hashes[0] for i in (1, 2)}
+
+    def test_patch_id_cache(self) -> None:
+        create_repo()
+        new_branch("master")
+        commit("master first commit")
+        new_branch("feature")
+        commit("feature commit")
+        check_out("master")
+        commit("extra commit")
+        execute("git merge --squash feature")
+        execute("git commit -m squashed")
+        commit("another master commit")
+
+        git = Git()
+        cache_path = os.path.join(git.get_main_worktree_git_dir(), "machete-patch-id-cache")
+        assert git.is_equivalent_patch_reachable(equivalent_to=AnyRevision("feature"), reachable_from=AnyRevision("master")) is True
+        # Patch-ids of all 3 commits of master since the merge-base with feature have been computed and persisted.
+        assert os.path.getsize(cache_path) == len(b"git-machete patch-id cache v1\n") + 3 * 40
+
+        # Pretend that none of the commits has a patch-id: if the cache is consulted, the squash merge can no longer be detected.
+        master_commit_hashes = popen("git rev-list master~3..master").splitlines()
+        with open(cache_path, "wb") as f:
+            f.write(b"git-machete patch-id cache v1\n" + b"".join(bytes.fromhex(h) + bytes(20) for h in master_commit_hashes))
+        git = Git()
+        assert git.is_equivalent_patch_reachable(equivalent_to=AnyRevision("feature"), reachable_from=AnyRevision("master")) is False
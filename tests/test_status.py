@@ -1,11 +1,22 @@
 # flake8: noqa: E501
+import json
+import os
 import sys
 import textwrap
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
 
 import pytest
 from pytest_mock import MockerFixture
 
+from git_machete.client.state import ManagedBranchName
+from git_machete.client.status import StatusBranch, StatusData, StatusFlags, StatusMacheteClient, StatusOngoingOperation, SyncToParentStatus
+from git_machete.config import SquashMergeDetection
+from git_machete.git import Git, LocalBranchShortName, SyncToRemoteStatus
 from git_machete.utils.paths import AbsPath
+from git_machete.utils.record_file import exclusive_lock
 from git_machete.utils.terminal import FullTerminalAnsiOutputCodes
 from tests.base_test import BaseTest
 from tests.cli_runner import assert_failure, assert_success, launch_command, rewrite_branch_layout_file
@@ -13,7 +24,7 @@ from tests.git_repository import (add_file_and_commit, add_remote, check_out, co
                                   delete_branch, delete_remote_branch, new_branch, new_orphan_branch, push, reset_to, set_git_config_key,
                                   unset_git_config_key)
 from tests.mockers import fixed_author_and_committer_date_in_past, mock_input_returning, mock_input_returning_y, overridden_environment
-from tests.shell import execute, execute_ignoring_exit_code, popen, remove_directory, set_file_executable, write_to_file
+from tests.shell import execute, execute_ignoring_exit_code, popen, read_file, remove_directory, set_file_executable, write_to_file
 
 
 class TestStatus(BaseTest):
@@ -256,6 +267,548 @@ class TestStatus(BaseTest):
             """
         )
 
+    def test_status_branch_hook_cache(self) -> None:
+        create_repo()
+        new_branch('master')
+        commit()
+        new_branch('develop')
+        commit()
+
+        body: str = \
+            """
+            master
+              develop
+            """
+        rewrite_branch_layout_file(body)
+
+        write_to_file(".git/hooks/machete-status-branch", "#!/bin/sh\necho $1 >> .git/hook-runs\nprintf 'CI of\\t%s\\n' $1")
+        set_file_executable(".git/hooks/machete-status-branch")
+        set_git_config_key("machete.status.hookCacheTtl", "3600")
+        set_git_config_key("machete.status.workers", "2")
+        expected_status_output = \
+            """
+            master  CI of\tmaster
+            |
+            o-develop *  CI of\tdevelop
+            """
+        assert_success(["status"], expected_status_output)
+        assert sorted(read_file(".git/hook-runs").splitlines()) == ["develop", "master"]
+
+        assert_success(["status"], expected_status_output)
+        assert sorted(read_file(".git/hook-runs").splitlines()) == ["develop", "master"]
+
+        commit()
+        assert_success(["status"], expected_status_output)
+        assert sorted(read_file(".git/hook-runs").splitlines()) == ["develop", "develop", "master"]
+
+        # Modification of the hook invalidates all the cached outputs.
+        hook_mtime = os.stat(".git/hooks/machete-status-branch").st_mtime
+        os.utime(".git/hooks/machete-status-branch", (hook_mtime + 10, hook_mtime + 10))
+        assert_success(["status"], expected_status_output)
+        assert sorted(read_file(".git/hook-runs").splitlines()) == ["develop", "develop", "develop", "master", "master"]
+
+        set_git_config_key("machete.status.hookCacheTtl", "0")
+        assert_success(["status"], expected_status_output)
+        assert len(read_file(".git/hook-runs").splitlines()) == 7
+
+        set_git_config_key("machete.status.hookCacheTtl", "soon")
+        assert_failure(["status"], "Invalid value for machete.status.hookCacheTtl git config key: soon. Valid values are non-negative integers")
+
+        # Carriage returns in the output survive a round trip through the cache.
+        write_to_file(".git/hooks/machete-status-branch", "#!/bin/sh\nprintf 'CI of\\r%s\\n' $1")
+        set_git_config_key("machete.status.hookCacheTtl", "3600")
+        expected_status_output = launch_command("status")
+        assert "CI of\rdevelop" in expected_status_output
+        assert launch_command("status") == expected_status_output
+
+    def test_status_branch_hooks_run_concurrently(self) -> None:
+        create_repo()
+        new_branch('master')
+        commit()
+        new_branch('develop')
+        commit()
+
+        body: str = \
+            """
+            master
+              develop
+            """
+        rewrite_branch_layout_file(body)
+
+        # By default, the hook is run for one branch at a time, so no run ever finds another one in progress.
+        write_to_file(".git/hooks/machete-status-branch", textwrap.dedent("""\
+            #!/bin/sh
+            mkdir .git/hook-running 2>/dev/null || { echo overlapping; exit 0; }
+            sleep 0.2
+            rmdir .git/hook-running
+            echo alone
+        """))
+        set_file_executable(".git/hooks/machete-status-branch")
+        assert_success(
+            ["status"],
+            """
+            master  alone
+            |
+            o-develop *  alone
+            """
+        )
+
+        # Each run of the hook waits (for up to 5 seconds) for the run for the other branch to start.
+        write_to_file(".git/hooks/machete-status-branch", textwrap.dedent("""\
+            #!/bin/sh
+            touch .git/hook-started-$1
+            for _ in 1 2 3 4 5 6 7 8 9 10; do
+                [ -f .git/hook-started-master ] && [ -f .git/hook-started-develop ] && echo concurrent && exit 0
+                sleep 0.5
+            done
+            echo sequential
+        """))
+        set_git_config_key("machete.status.hookWorkers", "2")
+        # Hooks are run concurrently once opted into, even though sync statuses aren't.
+        assert_success(
+            ["status"],
+            """
+            master  concurrent
+            |
+            o-develop *  concurrent
+            """
+        )
+
+        set_git_config_key("machete.status.hookWorkers", "0")
+        assert_failure(["status"], "Invalid value for machete.status.hookWorkers git config key: 0. Valid values are positive integers")
+
+    def test_status_snapshot_cache(self) -> None:
+        create_repo()
+        new_branch('master')
+        commit()
+        new_branch('develop')
+        commit("develop commit")
+
+        body: str = \
+            """
+            master
+              develop
+            """
+        rewrite_branch_layout_file(body)
+        set_git_config_key("machete.status.snapshotCache", "true")
+        assert_success(
+            ["status", "--list-commits"],
+            """
+            master
+            |
+            | develop commit
+            o-develop *
+            """
+        )
+
+        # An edge and a commit that don't match the actual history make it clear that the snapshot got reused.
+        snapshot = read_file(".git/machete-status-snapshot")
+        assert "\tIN_SYNC\t" in snapshot and "\tdevelop commit\n" in snapshot
+        write_to_file(".git/machete-status-snapshot",
+                      snapshot.replace("\tIN_SYNC\t", "\tOUT_OF_SYNC\t").replace("\tdevelop commit\n", "\tsnapshot commit\n"))
+        assert_success(
+            ["status", "--list-commits"],
+            """
+            master
+            |
+            | snapshot commit
+            x-develop *
+            """
+        )
+
+        # Any other flags, or any change to the branches, their reflogs or git config makes the snapshot stale.
+        assert_success(
+            ["status"],
+            """
+            master
+            |
+            o-develop *
+            """
+        )
+        assert_success(
+            ["status", "--list-commits"],
+            """
+            master
+            |
+            | develop commit
+            o-develop *
+            """
+        )
+        check_out("master")
+        commit()
+        assert_success(
+            ["status", "--list-commits"],
+            """
+            master *
+            |
+            | develop commit
+            x-develop
+            """
+        )
+
+    def test_status_prompt(self, mocker: MockerFixture) -> None:
+        create_repo_with_remote()
+        new_branch('master')
+        commit()
+        push()
+        new_branch('develop')
+        commit()
+        push()
+        commit()
+        new_branch('feature')
+        commit()
+
+        body: str = \
+            """
+            master
+              develop
+            """
+        rewrite_branch_layout_file(body)
+
+        # Unmanaged branches (and detached HEAD) don't get any prompt.
+        assert_success(["status", "--prompt"], "")
+        check_out('develop')
+        assert_success(["status", "--prompt"], "o-develop (ahead of origin)\n")
+
+        # An output that doesn't match the actual state of the repository makes it clear that the cache got reused.
+        prompt_cache = read_file(".git/machete-status-prompt-cache")
+        write_to_file(".git/machete-status-prompt-cache", prompt_cache.replace("ahead of", "behind"))
+        assert_success(["status", "--prompt"], "o-develop (behind origin)\n")
+
+        # Once the time is up, the most recent output is taken instead - as long as there is any.
+        is_released = threading.Event()
+        self.patch_symbol(mocker, "git_machete.client.status.StatusMacheteClient._compute_status_prompt",
+                          lambda *args, **kwargs: is_released.wait())
+        spawned_detached = []
+        self.patch_symbol(mocker, "git_machete.client.status.StatusMacheteClient._spawn_detached_status_prompt",
+                          lambda *args: spawned_detached.append(args))
+        set_git_config_key("machete.status.promptTimeout", "0.01")
+        commit()
+        assert_success(["status", "--prompt"], "o-develop (behind origin) (outdated)\n")
+        os.remove(".git/machete-status-prompt-cache")
+        assert_success(["status", "--prompt"], "develop (unknown)\n")
+        # Each time, the computation is left for a detached process to finish - unless there's one in flight already.
+        assert len(spawned_detached) == 2
+        with exclusive_lock(".git/machete-status-prompt-cache.lock", blocking=False) as is_locked:
+            assert is_locked
+            assert_success(["status", "--prompt"], "develop (unknown)\n")
+        assert len(spawned_detached) == 2
+        is_released.set()
+
+        assert_failure(["status", "--prompt", "--watch"], "Option --prompt cannot be specified together with --watch.")
+
+    def test_status_json(self) -> None:
+        create_repo_with_remote()
+        new_branch('master')
+        commit()
+        push()
+        new_branch('develop')
+        commit("develop commit")
+        push()
+        commit("unpushed commit")
+
+        body: str = \
+            """
+            master
+              develop  PR #1 rebase=no
+            """
+        rewrite_branch_layout_file(body)
+        write_to_file(".git/hooks/machete-status-branch", "#!/bin/sh\necho \"<$1>\"")
+        set_file_executable(".git/hooks/machete-status-branch")
+
+        status = json.loads(launch_command("status", "--format=json", "--list-commits"))
+        assert status["roots"] == ["master"]
+        assert status["ongoing_operation"]["currently_checked_out_branch"] == "develop"
+        assert status["timing"]["git_processes"] > 0
+        master, develop = status["branches"]
+        assert [master["name"], master["parent"], master["children"]] == ["master", None, ["develop"]]
+        assert [master["sync_to_parent_status"], master["sync_to_remote_status"], master["remote"]] == [None, "in_sync_with_remote", "origin"]
+        assert [develop["sync_to_parent_status"], develop["sync_to_remote_status"], develop["remote"]] == ["in_sync", "ahead_of_remote", "origin"]
+        assert [c["subject"] for c in develop["commits"]] == ["develop commit", "unpushed commit"]
+        assert develop["annotation"] == "PR #1 rebase=no"
+        assert develop["hook_output"] == "<develop>"
+        for branch in (master, develop):
+            assert branch["timing"]["sync_statuses"]["seconds"] >= 0
+            assert branch["timing"]["hook"]["git_processes"] == 0
+        # The work shared by all branches isn't attributed to whichever branch happens to be evaluated first.
+        assert list(status["timing"]["shared"]) == ["squash_merge_detection", "fork_points", "list_commits"]
+        assert status["timing"]["shared"]["fork_points"]["git_processes"] > 0
+
+        # Commits are only listed on request; a snapshot carries no timings of branches, since nothing gets evaluated.
+        set_git_config_key("machete.status.snapshotCache", "true")
+        launch_command("status", "--format=json")
+        status = json.loads(launch_command("status", "--format=json"))
+        assert [branch["commits"] for branch in status["branches"]] == [None, None]
+        assert [branch["timing"]["sync_statuses"] for branch in status["branches"]] == [None, None]
+        assert status["timing"]["shared"] == {}
+        assert status["branches"][1]["sync_to_remote_status"] == "ahead_of_remote"
+
+        assert_failure(["status", "--format=xml"], "Invalid value for --format flag: xml. Valid values are text, json")
+        assert_failure(["status", "--format=json", "--watch"], "Option --format cannot be specified together with --watch.")
+
+    def test_format_status_output_with_thousands_of_branches(self) -> None:
+        # Deep enough to exceed the recursion limit, and wide enough to have thousands of siblings.
+        deep = [ManagedBranchName(f"deep-{depth}") for depth in range(1500)]
+        wide = [ManagedBranchName(f"wide-{index}") for index in range(8500)]
+        children_of = {branch: [child] for branch, child in zip(deep, deep[1:])}
+        children_of[deep[0]] += wide
+        parent_of = {child: parent for parent, children in children_of.items() for child in children}
+        data = StatusData(
+            flags=StatusFlags(maybe_space_before_branch_name="", opt_list_commits=False, opt_list_commits_with_hashes=False,
+                              opt_squash_merge_detection=SquashMergeDetection.NONE),
+            branches={branch: StatusBranch(
+                parent=parent_of.get(branch), children=children_of.get(branch, []), sync_to_parent_status=SyncToParentStatus.IN_SYNC,
+                commits=[], sync_to_remote_status=SyncToRemoteStatus.NO_REMOTES, remote=None, hook_output="", annotation=None,
+                worktree_label=None, sync_timing=None, hook_timing=None) for branch in deep + wide},
+            branches_in_display_order=deep + wide,
+            roots=[deep[0]],
+            ongoing_operation=StatusOngoingOperation(
+                currently_bisected_branch=None, currently_rebased_branch=None, currently_checked_out_branch=None, is_am_in_progress=False,
+                is_cherry_pick_in_progress=False, is_merge_in_progress=False, is_revert_in_progress=False),
+            shared_sync_timing_by_phase={},
+        )
+
+        output = StatusMacheteClient.format_status_output(data)
+        lines = output.result.splitlines()
+        assert len(lines) == 2 * (len(deep) + len(wide)) - 1
+        assert lines[output.line_for_branch[deep[1]]] == "  <green><ifansi>├─<else>o-</ifansi></green><b>deep-1</b>"
+        assert lines[output.line_for_branch[deep[-1]]] == \
+            "  <green><vbar/> </green>" + "  " * 1497 + "<green><ifansi>└─<else>o-</ifansi></green><b>deep-1499</b>"
+        assert lines[output.line_for_branch[wide[-1]]] == "  <green><ifansi>└─<else>o-</ifansi></green><b>wide-8499</b>"
+
+        # Only the next siblings along the path to the branch being rendered are kept (rather than a copy of them for each branch),
+        # so the memory needed to walk even a single deep chain of branches doesn't grow quadratically with its depth.
+        chain = [ManagedBranchName(f"chain-{depth}") for depth in range(8000)]
+        chain_children_of: Dict[LocalBranchShortName, List[ManagedBranchName]] = {branch: [child] for branch, child in zip(chain, chain[1:])}
+        chain_parent_of = {child: branch for branch, child in zip(chain, chain[1:])}
+        tracemalloc.start()
+        try:
+            depths = [len(next_sibling_of_ancestor) for _, next_sibling_of_ancestor in StatusMacheteClient._iterate_next_sibling_of_ancestor(
+                chain, parent_of=chain_parent_of.get, children_of=lambda branch: chain_children_of.get(branch, []))]
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert depths == list(range(len(chain)))
+        assert peak_memory < 4 * 1024 * 1024
+
+    def test_status_streaming(self, mocker: MockerFixture) -> None:
+        create_repo()
+        new_branch('master')
+        commit()
+        new_branch('develop')
+        commit()
+        new_branch('feature')
+        commit()
+        check_out('master')
+        new_branch('hotfix')
+        commit()
+
+        body: str = \
+            """
+            master
+              develop
+                feature
+              hotfix
+            """
+        rewrite_branch_layout_file(body)
+
+        events: List[str] = []
+        get_combined_remote_sync_status = Git.get_combined_remote_sync_status
+        format_status_lines_of_branch = StatusMacheteClient._format_status_lines_of_branch
+
+        def evaluate(git: Git, branch: LocalBranchShortName) -> Tuple[SyncToRemoteStatus, Optional[str]]:
+            events.append(f"evaluate {branch}")
+            return get_combined_remote_sync_status(git, branch)
+
+        def format_lines(data: StatusData, branch: LocalBranchShortName, *args: Any, **kwargs: Any) -> str:
+            events.append(f"print {branch}")
+            return format_status_lines_of_branch(data, branch, *args, **kwargs)
+        mocker.patch.object(Git, "get_combined_remote_sync_status", autospec=True, side_effect=evaluate)
+        mocker.patch.object(StatusMacheteClient, "_format_status_lines_of_branch", side_effect=format_lines)
+
+        assert_success(
+            ["status"],
+            """
+            master
+            |
+            o-develop
+            | |
+            | o-feature
+            |
+            o-hotfix *
+            """
+        )
+        # Each branch is printed as soon as it's evaluated, along with the next siblings of its ancestors
+        # (which determine the color of the vertical bars in front of it).
+        assert events == ["evaluate master", "print master", "evaluate develop", "evaluate hotfix", "print develop",
+                          "evaluate feature", "print feature", "print hotfix"]
+
+    def test_status_prompt_detached(self, mocker: MockerFixture) -> None:
+        create_repo_with_remote()
+        new_branch('master')
+        commit()
+        push()
+        new_branch('develop')
+        commit()
+        push()
+        commit()
+
+        body: str = \
+            """
+            master
+              develop
+            """
+        rewrite_branch_layout_file(body)
+
+        # The detached process only fills the cache, without printing anything - and only if no other one is doing that already.
+        with overridden_environment(GIT_MACHETE_STATUS_PROMPT_DETACHED="1"):
+            with exclusive_lock(".git/machete-status-prompt-cache.lock", blocking=False):
+                assert_success(["status", "--prompt"], "")
+            assert not os.path.exists(".git/machete-status-prompt-cache")
+            assert_success(["status", "--prompt"], "")
+        assert [line.split("\t")[0] for line in read_file(".git/machete-status-prompt-cache").splitlines()[1:]] == ["develop"]
+
+        # Whatever the detached process has stored is then printed without computing anything.
+        self.patch_symbol(mocker, "git_machete.client.status.StatusMacheteClient._compute_status_prompt",
+                          lambda *args, **kwargs: "computed anew")
+        assert_success(["status", "--prompt"], "o-develop (ahead of origin)\n")
+        commit()
+        assert_success(["status", "--prompt"], "computed anew\n")
+
+    def test_status_watch(self, mocker: MockerFixture) -> None:
+        create_repo()
+        new_branch('master')
+        commit()
+        new_branch('develop')
+        commit()
+        check_out('master')
+        new_branch('feature')
+        commit()
+
+        body: str = \
+            """
+            master
+              develop
+              feature
+            """
+        rewrite_branch_layout_file(body)
+
+        polls = 0
+
+        def wait_for_next_poll(self: Any) -> None:  # noqa: U100
+            nonlocal polls
+            polls += 1
+            if polls == 1:
+                check_out('develop')
+                commit()
+            elif polls == 2:
+                check_out('feature')
+                commit()
+            elif polls == 4:
+                raise KeyboardInterrupt
+        self.patch_symbol(mocker, "git_machete.client.status.StatusMacheteClient._wait_for_next_status_watch_poll", wait_for_next_poll)
+        compute_spy = mocker.spy(StatusMacheteClient, "_StatusMacheteClient__compute_branch_sync_statuses")
+
+        # Outside of a terminal, each redraw is just printed after the previous one; the third poll doesn't see any change.
+        assert_success(
+            ["status", "--watch"],
+            """
+            master
+            |
+            o-develop
+            |
+            o-feature *
+
+            master
+            |
+            o-develop *
+            |
+            o-feature
+
+            master
+            |
+            o-develop
+            |
+            o-feature *
+            """
+        )
+        # Only the initial evaluation covers all branches; then, only the branches whose tip has changed are re-evaluated.
+        assert [call.args[2] for call in compute_spy.call_args_list] == [['master', 'develop', 'feature'], ['develop'], ['feature']]
+
+    def test_status_watch_fork_point_change(self, mocker: MockerFixture) -> None:
+        create_repo()
+        new_branch('master')
+        commit()
+        new_branch('other')
+        commit()
+        new_branch('feature')
+        commit()
+
+        body: str = \
+            """
+            master
+              feature
+            """
+        rewrite_branch_layout_file(body)
+
+        polls = 0
+
+        def wait_for_next_poll(self: Any) -> None:  # noqa: U100
+            nonlocal polls
+            polls += 1
+            if polls == 1:
+                # Neither tip changes, but without the reflog of `other`, the fork point of `feature` is no longer inferred from it.
+                execute("git reflog expire --expire=all refs/heads/other")
+            elif polls == 2:
+                raise KeyboardInterrupt
+        self.patch_symbol(mocker, "git_machete.client.status.StatusMacheteClient._wait_for_next_status_watch_poll", wait_for_next_poll)
+        compute_spy = mocker.spy(StatusMacheteClient, "_StatusMacheteClient__compute_branch_sync_statuses")
+
+        assert_success(
+            ["status", "--watch"],
+            """
+            master
+            |
+            ?-feature *
+
+            master
+            |
+            o-feature *
+            """
+        )
+        assert [call.args[2] for call in compute_spy.call_args_list] == [['master', 'feature'], ['feature']]
+
+    def test_status_branch_hook_timeout(self) -> None:
+        create_repo()
+        new_branch('master')
+        commit()
+        new_branch('develop')
+        commit()
+
+        body: str = \
+            """
+            master
+              develop
+            """
+        rewrite_branch_layout_file(body)
+
+        write_to_file(".git/hooks/machete-status-branch", "#!/bin/sh\n[ $1 = develop ] && sleep 10\necho OK")
+        set_file_executable(".git/hooks/machete-status-branch")
+        set_git_config_key("machete.status.hookTimeout", "0.5")
+        start = time.time()
+        assert_success(
+            ["status"],
+            """
+            master  OK
+            |
+            o-develop *
+            """
+        )
+        assert time.time() - start < 10
+
+        set_git_config_key("machete.status.hookTimeout", "0")
+        assert_failure(["status"], "Invalid value for machete.status.hookTimeout git config key: 0. Valid values are positive numbers")
+
     def test_extra_space_before_branch_name(self) -> None:
         create_repo_with_remote()
         new_branch('master')
@@ -512,6 +1065,65 @@ class TestStatus(BaseTest):
         assert_failure(["status", "--squash-merge-detection=none", "--squash-merge-detection=invalid"],
                        "Invalid value for --squash-merge-detection flag: invalid. Valid values are none, simple, exact")
 
+    def test_status_with_workers(self) -> None:
+        with fixed_author_and_committer_date_in_past():
+            create_repo_with_remote()
+            new_branch("master")
+            commit("master commit")
+            push()
+            new_branch("develop")
+            commit("develop commit")
+            push()
+            commit("develop commit 2")
+            new_branch("feature-1")
+            commit("feature-1 commit")
+            check_out("master")
+            new_branch("feature-2")
+            commit("feature-2 commit")
+            push()
+            check_out("master")
+            execute("git merge --squash feature-2")
+            execute("git commit -m 'squashed feature-2'")
+            check_out("develop")
+            commit("develop commit 3")
+            new_branch("feature-3")
+            commit("feature-3 commit")
+
+        body: str = \
+            """
+            master
+                develop
+                    feature-1
+                    feature-3
+                feature-2
+            """
+        rewrite_branch_layout_file(body)
+
+        expected_status_output = (
+            """
+              master (ahead of origin)
+              |
+              x-develop (ahead of origin)
+              | |
+              | x-feature-1 (untracked)
+              | |
+              | o-feature-3 * (untracked)
+              |
+              m-feature-2
+            """
+        )
+        assert_success(['status'], expected_status_output)
+        expected_status_with_commits_output = launch_command('status', '-l')
+
+        # Let's make sure that the fork points are inferred in the worker threads rather than taken from the cache.
+        execute("rm -f .git/machete-fork-point-cache .git/machete-merge-base-cache-v2")
+        set_git_config_key('machete.status.workers', '4')
+        assert_success(['status'], expected_status_output)
+        assert launch_command('status', '-l') == expected_status_with_commits_output
+
+        set_git_config_key('machete.status.workers', '0')
+        assert_failure(['status'], "Invalid value for machete.status.workers git config key: 0. Valid values are positive integers")
+
     def test_status_inferring_counterpart_for_fetching_of_branch(self, mocker: MockerFixture) -> None:
         E = FullTerminalAnsiOutputCodes
         self.patch_symbol(mocker, "git_machete.utils.terminal.is_terminal_fully_fledged", lambda: True)
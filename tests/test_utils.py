@@ -1,16 +1,20 @@
+import itertools
 import os
 import re
 import sys
 import tempfile
+from contextlib import closing
 
 import pytest
 from pytest_mock import MockerFixture
 
 from git_machete.utils import debug_log
+from git_machete.utils.cmd import StreamedCmd, popen_cmd_pipeline
 from git_machete.utils.date import get_current_date
 from git_machete.utils.debug_log import debug, hex_repr
 from git_machete.utils.markup import _fmt
 from git_machete.utils.paths import AbsPath, strip_longest_common_path_prefix
+from git_machete.utils.reflog_file import ReflogFileEntry, ReflogFileState, read_reflog_appended_since, read_reflog_newest_first
 from git_machete.utils.terminal import BasicTerminalAnsiOutputCodes, FullTerminalAnsiOutputCodes
 from tests.base_test import BaseTest
 
@@ -60,6 +64,88 @@ class TestUtils(BaseTest):
     def test_hex_repr(self) -> None:
         assert hex_repr("Hello, world!") == "48:65:6c:6c:6f:2c:20:77:6f:72:6c:64:21"
 
+    def test_popen_cmd_pipeline(self) -> None:
+        upper_case = [sys.executable, "-c", "import sys; sys.stdout.write(sys.stdin.read().upper())"]
+        count_lines = [sys.executable, "-c", "import sys; print(len(sys.stdin.readlines()))"]
+        failing = [sys.executable, "-c", "import sys; sys.stderr.write('oops'); sys.exit(3)"]
+
+        assert popen_cmd_pipeline(upper_case, count_lines, input="a\nb\nc\n") == (0, "3" + os.linesep, "")
+        result = popen_cmd_pipeline(failing, count_lines)
+        assert result.exit_code == 3
+        assert result.stdout.strip() == "0"
+        assert result.stderr == "oops"
+
+    def test_streamed_cmd(self) -> None:
+        endless = StreamedCmd(sys.executable, "-c", "import itertools\nfor i in itertools.count(): print(i, flush=True)")
+        with closing(endless.lines()) as lines:
+            assert list(itertools.islice(lines, 3)) == ["0", "1", "2"]
+        # Killed rather than run to completion.
+        assert endless.exit_code is None
+
+        failing = StreamedCmd(sys.executable, "-c", "import sys; print('a'); sys.stderr.write('oops'); sys.exit(3)")
+        assert list(failing.lines()) == ["a"]
+        assert failing.exit_code == 3
+        assert failing.stderr == "oops"
+
+    def test_read_reflog_newest_first(self) -> None:
+        path = os.path.join(tempfile.mkdtemp(), "reflog")
+        assert list(read_reflog_newest_first(path)) == []
+
+        hashes = [format(i + 1, "040x") for i in range(5000)]
+        with open(path, "wb") as f:
+            # Long enough to span several blocks read from the end; the last line lacks the trailing newline.
+            f.write("\n".join(f"{old} {new} Test Ęser <test@example.com> {1700000000 + i} +0200\tcommit: zażółć {i}"
+                              for i, (old, new) in enumerate(zip(["0" * 40] + hashes, hashes))).encode("utf-8"))
+            f.write(f"\n{hashes[-1]} {'0' * 40} Test <test@example.com> 1800000000 +0000\tBranch: deleted\n".encode("utf-8"))
+        entries = list(read_reflog_newest_first(path))
+        assert len(entries) == 5000
+        assert entries[0] == ReflogFileEntry(hash=hashes[-1], timestamp=1700004999, subject="commit: zażółć 4999")
+        assert entries == [ReflogFileEntry(hash=hashes[i], timestamp=1700000000 + i, subject=f"commit: zażółć {i}")
+                           for i in reversed(range(5000))]
+
+        # Committer identity (as well as the message) isn't necessarily UTF-8, depending on how `user.name` was set.
+        with open(path, "wb") as f:
+            f.write(f"{'0' * 40} {hashes[0]} Jos\xe9 <j@example.com> 1700000000 +0000\tcommit: caf\xe9\n".encode("latin-1"))
+        assert list(read_reflog_newest_first(path)) == [ReflogFileEntry(hash=hashes[0], timestamp=1700000000, subject="commit: caf\ufffd")]
+
+    def test_read_reflog_appended_since(self) -> None:
+        path = os.path.join(tempfile.mkdtemp(), "reflog")
+        empty_state = ReflogFileState(size=0, first_line_digest="", last_line_digest="")
+        assert read_reflog_appended_since(path, None) == ([], empty_state, False)
+        assert read_reflog_appended_since(path, empty_state) == ([], empty_state, True)
+
+        def line(i: int) -> bytes:
+            return f"{i:040x} {i + 1:040x} Test <test@example.com> {1700000000 + i} +0200\tcommit: {i}\n".encode("utf-8")
+
+        def entry(i: int) -> ReflogFileEntry:
+            return ReflogFileEntry(hash=format(i + 1, "040x"), timestamp=1700000000 + i, subject=f"commit: {i}")
+
+        with open(path, "wb") as f:
+            f.write(line(0) + line(1) + line(2)[:10])
+        entries, state, is_appended = read_reflog_appended_since(path, None)
+        # The trailing line is still being written.
+        assert (entries, state.size, is_appended) == ([entry(1), entry(0)], len(line(0) + line(1)), False)
+
+        with open(path, "ab") as f:
+            f.write(line(2)[10:] + line(3))
+        entries, new_state, is_appended = read_reflog_appended_since(path, state)
+        assert (entries, new_state.size, is_appended) == ([entry(3), entry(2)], len(line(0) + line(1) + line(2) + line(3)), True)
+        assert read_reflog_appended_since(path, new_state) == ([], new_state, True)
+
+        # Expiring the reflog rewrites the file, which requires reading it all over again.
+        with open(path, "wb") as f:
+            f.write(line(2) + line(3) + line(4) + line(5))
+        entries, new_state, is_appended = read_reflog_appended_since(path, new_state)
+        assert (entries, is_appended) == ([entry(5), entry(4), entry(3), entry(2)], False)
+
+        # So does deleting the newest entry (`git reflog delete <ref>@{0}`) followed by an append at least as long,
+        # even though the first line is the same and the file hasn't shrunk.
+        with open(path, "wb") as f:
+            f.write(line(2) + line(3) + line(4) + line(16))
+        assert os.path.getsize(path) >= new_state.size
+        entries, _, is_appended = read_reflog_appended_since(path, new_state)
+        assert (entries, is_appended) == ([entry(16), entry(4), entry(3), entry(2)], False)
+
     def test_abs_path_general(self) -> None:
         """Test that abs_path returns an absolute path with forward slashes."""
         # Create a temporary directory to ensure we're working with real paths